@@ -3,6 +3,13 @@ from .utils import *
 __all__ = [
     'argmax_or_min',
     'argmax_or_min_tuple',
+    'LazyArgmax',
+    'MemmapPicklable',
+    'iter_trials',
+    'iter_trial_batches',
     'parse_trials_from_bytes',
     'trials_to_dataframe',
+    'RESULT_DTYPE',
+    'load_columnar_results',
+    'columnar_results_to_dataframe',
 ]
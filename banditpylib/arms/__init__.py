@@ -2,10 +2,12 @@ from .utils import *
 from .bernoulli_arm import *
 from .gaussian_arm import *
 from .pseudo_arm import *
+from .pseudo_arm_bank import *
 
 __all__ = [
     'Arm',
     'PseudoArm',
+    'PseudoArmBank',
     'StochasticArm',
     'BernoulliArm',
     'GaussianArm',
@@ -68,5 +68,5 @@ class PseudoArm(Arm):
       rewards: empirical rewards
     """
     self.__total_pulls += len(rewards)
-    self.__total_rewards += sum(rewards)
-    self.__sum_of_square_reward += sum(rewards**2)
+    self.__total_rewards += np.sum(rewards)
+    self.__sum_of_square_reward += np.sum(rewards**2)
@@ -0,0 +1,94 @@
+from typing import Union
+
+import numpy as np
+
+
+class PseudoArmBank:
+  """Bank of pseudo arms
+
+  This class is used to store empirical information of a number of arms. The
+  information of all the arms is kept in NumPy arrays so that empirical
+  statistics can be computed for all the arms at once.
+
+  :param int arm_num: number of arms
+  """
+  def __init__(self, arm_num: int):
+    if arm_num < 1:
+      raise ValueError('Number of arms is expected at least 1. Got %d.' %
+                       arm_num)
+    self.__arm_num = arm_num
+    self.reset()
+
+  @property
+  def arm_num(self) -> int:
+    """Number of arms"""
+    return self.__arm_num
+
+  @property
+  def total_pulls(self) -> np.ndarray:
+    """Total number of pulls of each arm"""
+    return self.__total_pulls
+
+  @property
+  def total_rewards(self) -> np.ndarray:
+    """Total rewards obtained by each arm so far"""
+    return self.__total_rewards
+
+  @property
+  def sum_of_squares(self) -> np.ndarray:
+    """Sum of squared rewards obtained by each arm so far"""
+    return self.__sum_of_squares
+
+  @property
+  def em_mean(self) -> np.ndarray:
+    """Empirical mean of rewards of each arm"""
+    if np.any(self.__total_pulls == 0):
+      raise Exception('Number of pulls is 0. No empirical mean.')
+    return self.__total_rewards / self.__total_pulls
+
+  @property
+  def em_std(self) -> np.ndarray:
+    """Empirical standard deviation of rewards of each arm"""
+    if np.any(self.__total_pulls == 0):
+      raise Exception('Number of pulls is 0. No empirical standard deviation.')
+    return np.sqrt(self.em_var)
+
+  @property
+  def em_var(self) -> np.ndarray:
+    """Empirical variance of rewards of each arm"""
+    if np.any(self.__total_pulls == 0):
+      raise Exception('Number of pulls is 0. No empirical variance.')
+    em_mean = self.__total_rewards / self.__total_pulls
+    # Rounding errors may make the variance slightly negative
+    return np.maximum(self.__sum_of_squares / self.__total_pulls - em_mean**2,
+                      0)
+
+  def reset(self):
+    """Clear information"""
+    self.__total_pulls = np.zeros(self.__arm_num, dtype=int)
+    self.__total_rewards = np.zeros(self.__arm_num)
+    self.__sum_of_squares = np.zeros(self.__arm_num)
+
+  def update(self, arm_ids: Union[int, np.ndarray], rewards: np.ndarray):
+    """Update information
+
+    Args:
+      arm_ids: arm which obtains all the rewards, or arms of the same length as
+        `rewards` such that `rewards[i]` is obtained by arm `arm_ids[i]`
+      rewards: empirical rewards
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    if np.ndim(arm_ids) == 0:
+      self.__total_pulls[arm_ids] += len(rewards)
+      self.__total_rewards[arm_ids] += np.sum(rewards)
+      self.__sum_of_squares[arm_ids] += np.sum(rewards**2)
+      return
+
+    arm_ids = np.asarray(arm_ids)
+    if len(arm_ids) != len(rewards):
+      raise ValueError('Number of arms is expected %d. Got %d.' %
+                       (len(rewards), len(arm_ids)))
+    # Unbuffered additions so that repeated arms are all counted
+    np.add.at(self.__total_pulls, arm_ids, 1)
+    np.add.at(self.__total_rewards, arm_ids, rewards)
+    np.add.at(self.__sum_of_squares, arm_ids, rewards**2)
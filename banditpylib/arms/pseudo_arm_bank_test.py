@@ -0,0 +1,33 @@
+import numpy as np
+
+from .pseudo_arm import PseudoArm
+from .pseudo_arm_bank import PseudoArmBank
+
+
+class TestPseudoArmBank:
+  """Test pseudo-arm bank"""
+  def test_batched_update(self):
+    arm_num = 3
+    bank = PseudoArmBank(arm_num)
+    pseudo_arms = [PseudoArm() for _ in range(arm_num)]
+
+    bank.update(0, np.array([1.0, 0.0, 1.0]))
+    pseudo_arms[0].update(np.array([1.0, 0.0, 1.0]))
+    arm_ids = np.array([1, 2, 1, 1, 2])
+    rewards = np.array([0.5, 0.2, 0.1, 0.3, 0.9])
+    bank.update(arm_ids, rewards)
+    for arm_id in range(1, arm_num):
+      pseudo_arms[arm_id].update(rewards[arm_ids == arm_id])
+
+    assert list(bank.total_pulls) == [3, 3, 2]
+    np.testing.assert_allclose(bank.em_mean,
+                               [arm.em_mean for arm in pseudo_arms])
+    np.testing.assert_allclose(bank.em_var,
+                               [arm.em_var for arm in pseudo_arms],
+                               atol=1e-12)
+    np.testing.assert_allclose(bank.em_std,
+                               [arm.em_std for arm in pseudo_arms],
+                               atol=1e-6)
+
+    bank.reset()
+    assert np.sum(bank.total_pulls) == 0
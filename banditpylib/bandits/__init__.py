@@ -8,8 +8,12 @@ from .contextual_bandit import *
 from .contextual_bandit_utils import *
 
 __all__ = [
-    'Bandit', 'MultiArmedBandit', 'LinearBandit', 'Reward', 'MeanReward',
-    'CvarReward', 'search_best_assortment', 'local_search_best_assortment',
-    'MNLBandit', 'ThresholdingBandit', 'ContextualBandit', 'ContextGenerator',
-    'RandomContextGenerator'
+    'Bandit', 'PlainBandit', 'EpisodicBandit', 'MultiArmedBandit',
+    'LinearBandit', 'Reward', 'MeanReward', 'CvarReward',
+    'search_best_assortment', 'AssortmentCache',
+    'parametric_search_best_assortment', 'iter_assortments',
+    'sample_assortment', 'incidence_matrix', 'local_search_best_assortment',
+    'multi_start_local_search_best_assortment', 'MNLBandit',
+    'ThresholdingBandit', 'ContextualBandit', 'ContextGenerator',
+    'RandomContextGenerator', 'LoggedContextGenerator'
 ]
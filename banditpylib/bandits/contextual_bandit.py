@@ -1,3 +1,7 @@
+from typing import Optional
+
+import numpy as np
+
 from banditpylib.data_pb2 import Context, Actions, Feedback, ArmPull, \
     ArmFeedback
 from banditpylib.learners import Goal, MaximizeTotalRewards
@@ -15,11 +19,27 @@ class ContextualBandit(Bandit):
   learner's action :math:`a_t`, the reward :math:`r_{a_t}^t` will be revealed to
   the learner. The batched version can be defined in a similar way.
 
+  Contexts are generated in blocks and consumed one by one.
+
   :param ContextGenerator context_generator: context generator
+  :param Optional[int] block_size: number of contexts generated at once. The
+    default value is 1024 if the context generator overrides
+    :func:`ContextGenerator.contexts` and 1 otherwise, so that contexts are not
+    generated ahead of time by generators producing them one by one.
   """
-  def __init__(self, context_generator: ContextGenerator):
+  def __init__(self,
+               context_generator: ContextGenerator,
+               block_size: Optional[int] = None):
+    if block_size is None:
+      block_size = 1 if type(
+          context_generator).contexts is ContextGenerator.contexts else 1024
+    if block_size < 1:
+      raise ValueError('Block size is expected at least 1. Got %d.' %
+                       block_size)
     self.__context_generator = context_generator
     self.__arm_num = self.__context_generator.arm_num
+    self.__block_size = block_size
+    self.__clear_block()
     # Maximum rewards the learner can obtain
     self.__regret = 0.0
 
@@ -27,22 +47,37 @@ class ContextualBandit(Bandit):
   def name(self) -> str:
     return 'contextual_bandit'
 
+  def __clear_block(self):
+    """Drop the contexts generated"""
+    # Contexts, rewards and maximum rewards of the current block
+    self.__contexts = np.zeros((0, self.__context_generator.dimension))
+    self.__rewards = np.zeros((0, self.__arm_num))
+    self.__max_rewards = np.zeros(0)
+    # Index of the current context in the block
+    self.__position = -1
+
+  def __remaining_contexts(self) -> int:
+    """Generate a new block if there are no contexts after the current one
+
+    Returns:
+      number of contexts after the current one in the block
+    """
+    if self.__position + 1 >= len(self.__rewards):
+      (self.__contexts,
+       self.__rewards) = self.__context_generator.contexts(self.__block_size)
+      self.__max_rewards = np.max(self.__rewards, axis=1)
+      self.__position = -1
+    return len(self.__rewards) - self.__position - 1
+
   @property
   def context(self) -> Context:
-    self.__context_and_rewards = self.__context_generator.context()
+    self.__remaining_contexts()
+    self.__position += 1
     context = Context()
-    context.sequential_context.value.extend(self.__context_and_rewards[0])
+    context.sequential_context.value.extend(
+        self.__contexts[self.__position].tolist())
     return context
 
-  def __update_regret(self, arm_id: int):
-    """Update the regret
-
-    Args:
-      arm_id: arm pulled
-    """
-    rewards = self.__context_and_rewards[1]
-    self.__regret += max(rewards) - rewards[arm_id]
-
   def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
     """Pull one arm
 
@@ -63,11 +98,20 @@ class ContextualBandit(Bandit):
     if pulls < 1:
       return arm_feedback
 
-    self.__update_regret(arm_id)
-    for _ in range(pulls - 1):
-      self.__context_and_rewards = self.__context_generator.context()
-      self.__update_regret(arm_id)
-      arm_feedback.rewards.append(self.__context_and_rewards[1][arm_id])
+    # The first pull is under the current context and each of the following
+    # pulls is under a new context
+    start = self.__position
+    while True:
+      end = self.__position + 1
+      rewards = self.__rewards[start:end, arm_id]
+      self.__regret += float(np.sum(self.__max_rewards[start:end] - rewards))
+      arm_feedback.rewards.extend(rewards.tolist())
+      pulls -= len(rewards)
+      if pulls == 0:
+        break
+      remaining_contexts = self.__remaining_contexts()
+      start = self.__position + 1
+      self.__position += min(pulls, remaining_contexts)
 
     arm_feedback.arm.id = arm_id
     return arm_feedback
@@ -83,6 +127,7 @@ class ContextualBandit(Bandit):
 
   def reset(self):
     self.__context_generator.reset()
+    self.__clear_block()
     self.__regret = 0.0
 
   @property
@@ -1,9 +1,15 @@
+from typing import Tuple
+
 import google.protobuf.text_format as text_format
 
+import numpy as np
+import pytest
+
 from banditpylib.data_pb2 import Actions
 from banditpylib.learners import MaximizeTotalRewards
 from .contextual_bandit import ContextualBandit
-from .contextual_bandit_utils import RandomContextGenerator
+from .contextual_bandit_utils import ContextGenerator, \
+    RandomContextGenerator
 
 
 class TestContextualBandit:
@@ -28,3 +34,99 @@ class TestContextualBandit:
       """, Actions()))
 
     assert contextual_bandit.regret(MaximizeTotalRewards()) <= 20
+
+  def test_regret(self):
+    rewards = np.array([[0.1, 0.9], [0.8, 0.2], [0.5, 0.6], [0.3, 0.4],
+                        [1.0, 0.0]])
+
+    class CyclicContextGenerator(ContextGenerator):
+      """Context generator cycling through given rewards"""
+      def __init__(self):
+        super().__init__(arm_num=2, dimension=1)
+        self.__time = 0
+
+      @property
+      def name(self) -> str:
+        return 'cyclic_context_generator'
+
+      def reset(self):
+        self.__time = 0
+
+      def context(self) -> Tuple[np.ndarray, np.ndarray]:
+        index = self.__time % len(rewards)
+        self.__time += 1
+        return (np.array([index]), rewards[index])
+
+    contextual_bandit = ContextualBandit(CyclicContextGenerator(),
+                                         block_size=2)
+    contextual_bandit.reset()
+    assert list(contextual_bandit.context.sequential_context.value) == [0]
+    actions = Actions()
+    arm_pull = actions.arm_pulls.add()
+    arm_pull.arm.id = 0
+    arm_pull.times = 4
+    feedback = contextual_bandit.feed(actions)
+    np.testing.assert_allclose(feedback.arm_feedbacks[0].rewards, rewards[:4,
+                                                                          0])
+    assert contextual_bandit.regret(
+        MaximizeTotalRewards()) == pytest.approx(0.8 + 0.1 + 0.1)
+    assert list(contextual_bandit.context.sequential_context.value) == [4]
+
+  def test_block_size(self):
+    class CountingContextGenerator(ContextGenerator):
+      """Context generator counting the contexts generated"""
+      def __init__(self):
+        super().__init__(arm_num=2, dimension=1)
+        self.calls = 0
+
+      @property
+      def name(self) -> str:
+        return 'counting_context_generator'
+
+      def reset(self):
+        self.calls = 0
+
+      def context(self) -> Tuple[np.ndarray, np.ndarray]:
+        self.calls += 1
+        return (np.array([self.calls]), np.array([0.0, 1.0]))
+
+    # Contexts are generated one by one by default unless the generator
+    # produces them in batches
+    for (block_size, calls) in [(None, 1), (3, 3)]:
+      context_generator = CountingContextGenerator()
+      contextual_bandit = ContextualBandit(context_generator,
+                                           block_size=block_size)
+      contextual_bandit.reset()
+      assert list(contextual_bandit.context.sequential_context.value) == [1]
+      assert context_generator.calls == calls
+
+  def test_single_pull(self):
+    class EchoContextGenerator(ContextGenerator):
+      """Context generator whose rewards equal the context"""
+      def __init__(self):
+        super().__init__(arm_num=2, dimension=1)
+
+      @property
+      def name(self) -> str:
+        return 'echo_context_generator'
+
+      def reset(self):
+        pass
+
+      def context(self) -> Tuple[np.ndarray, np.ndarray]:
+        value = np.random.random()
+        return (np.array([value]), np.array([value, value]))
+
+    contextual_bandit = ContextualBandit(EchoContextGenerator())
+    contextual_bandit.reset()
+    for _ in range(5):
+      context = contextual_bandit.context
+      actions = Actions()
+      arm_pull = actions.arm_pulls.add()
+      arm_pull.arm.id = 1
+      arm_pull.times = 1
+      feedback = contextual_bandit.feed(actions)
+      # The reward of the pull under the current context is revealed
+      assert len(feedback.arm_feedbacks) == 1
+      assert list(feedback.arm_feedbacks[0].rewards) == pytest.approx(
+          list(context.sequential_context.value))
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 
-from typing import Tuple
+from typing import Tuple, Union
 
 import numpy as np
 
+from banditpylib.utils import MemmapPicklable
+
 
 class ContextGenerator(ABC):
   """Abstract context generator class
@@ -44,6 +46,27 @@ class ContextGenerator(ABC):
       the context and the rewards corresponding to different actions
     """
 
+  def contexts(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """A block of contexts
+
+    Generators able to produce contexts in batches are expected to override this
+    method. They may return fewer but at least one contexts, e.g., to avoid
+    copying data. Note that :class:`banditpylib.bandits.ContextualBandit`
+    generates contexts ahead of time in blocks via this method only if it is
+    overridden, unless a block size is given.
+
+    Args:
+      size: maximum number of contexts
+
+    Returns:
+      contexts stacked in an array of shape (contexts, dimension) and the
+      rewards corresponding to different actions stacked in an array of shape
+      (contexts, arms)
+    """
+    (contexts, rewards) = zip(*[self.context() for _ in range(size)])
+    return (np.array(contexts, dtype=float).reshape(size, self.dimension),
+            np.array(rewards, dtype=float).reshape(size, self.arm_num))
+
 
 class RandomContextGenerator(ContextGenerator):
   """Random context generator
@@ -65,3 +88,109 @@ class RandomContextGenerator(ContextGenerator):
 
   def context(self) -> Tuple[np.ndarray, np.ndarray]:
     return (np.random.random(self.dimension), np.random.random(self.arm_num))
+
+  def contexts(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    return (np.random.random(
+        (size, self.dimension)), np.random.random((size, self.arm_num)))
+
+
+class LoggedContextGenerator(ContextGenerator, MemmapPicklable):
+  """Logged context generator
+
+  Replay contexts and rewards of all the actions logged in arrays or `.npy`
+  files, which are memory-mapped so that only the rows being replayed are
+  loaded into memory.
+
+  When the generator is reset, e.g., at the start of each trial, a starting row
+  is randomly selected and the rows are replayed from it in order, wrapping
+  around at the end. If `shuffle` is `True`, the rows are divided into chunks
+  of `chunk_size` rows instead. The chunks are replayed in a random order and
+  the rows of each chunk in a random order as well. Trials are reproducible
+  since the random numbers are drawn from the random seed of the trial.
+
+  :param Union[np.ndarray, str] contexts: contexts stacked in an array of shape
+    (rows, dimension) or name of the `.npy` file storing them
+  :param Union[np.ndarray, str] rewards: rewards of all the actions stacked in
+    an array of shape (rows, arms) or name of the `.npy` file storing them
+  :param bool shuffle: whether to shuffle the rows
+  :param int chunk_size: number of rows in each chunk. It bounds the number of
+    rows loaded into memory at once when the rows are shuffled.
+
+  .. note::
+    Without shuffling, blocks of contexts are slices of the logs and no data is
+    copied.
+  """
+  def __init__(self,
+               contexts: Union[np.ndarray, str],
+               rewards: Union[np.ndarray, str],
+               shuffle: bool = False,
+               chunk_size: int = 65536):
+    self.__contexts: np.ndarray = np.load(
+        contexts, mmap_mode='r') if isinstance(contexts, str) else contexts
+    self.__rewards: np.ndarray = np.load(rewards, mmap_mode='r') if isinstance(
+        rewards, str) else rewards
+    if self.__contexts.ndim != 2 or self.__rewards.ndim != 2:
+      raise ValueError('Contexts and rewards are expected 2-dimensional. '
+                       'Got %d and %d.' %
+                       (self.__contexts.ndim, self.__rewards.ndim))
+    if len(self.__contexts) != len(self.__rewards) or len(self.__rewards) < 1:
+      raise ValueError('Numbers of contexts and rewards are expected the same '
+                       'and positive. Got %d and %d.' %
+                       (len(self.__contexts), len(self.__rewards)))
+    if chunk_size < 1:
+      raise ValueError('Chunk size is expected at least 1. Got %d.' %
+                       chunk_size)
+    super().__init__(arm_num=self.__rewards.shape[1],
+                     dimension=self.__contexts.shape[1])
+    self.__shuffle = shuffle
+    self.__chunk_size = chunk_size
+    self.reset()
+
+  @property
+  def name(self) -> str:
+    return 'logged_context_generator'
+
+  @property
+  def rows(self) -> int:
+    """Number of rows logged"""
+    return len(self.__rewards)
+
+  def reset(self):
+    if self.__shuffle:
+      self.__chunk_order = np.random.permutation(-(-self.rows //
+                                                   self.__chunk_size))
+      self.__chunk_index = -1
+      self.__load_chunk()
+    else:
+      # Index of the next row to replay
+      self.__row = np.random.randint(self.rows)
+
+  def __load_chunk(self):
+    """Load the next chunk and shuffle its rows"""
+    self.__chunk_index = (self.__chunk_index + 1) % len(self.__chunk_order)
+    start = self.__chunk_order[self.__chunk_index] * self.__chunk_size
+    permutation = np.random.permutation(
+        min(self.__chunk_size, self.rows - start))
+    self.__chunk_contexts = np.asarray(
+        self.__contexts[start:start + len(permutation)])[permutation]
+    self.__chunk_rewards = np.asarray(
+        self.__rewards[start:start + len(permutation)])[permutation]
+    # Index of the next row to replay in the chunk
+    self.__row = 0
+
+  def context(self) -> Tuple[np.ndarray, np.ndarray]:
+    (contexts, rewards) = self.contexts(1)
+    return (contexts[0], rewards[0])
+
+  def contexts(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    if self.__shuffle:
+      if self.__row == len(self.__chunk_rewards):
+        self.__load_chunk()
+      (contexts, rewards) = (self.__chunk_contexts, self.__chunk_rewards)
+    else:
+      (contexts, rewards) = (self.__contexts, self.__rewards)
+    start = self.__row
+    self.__row = min(start + size, len(rewards))
+    if not self.__shuffle and self.__row == len(rewards):
+      self.__row = 0
+    return (contexts[start:start + size], rewards[start:start + size])
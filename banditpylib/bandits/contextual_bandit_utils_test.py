@@ -0,0 +1,67 @@
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from .contextual_bandit_utils import LoggedContextGenerator
+
+
+class TestLoggedContextGenerator:
+  """Test logged context generator"""
+  def test_replay(self):
+    contexts = np.arange(10, dtype=float).reshape(10, 1)
+    rewards = np.random.random((10, 3))
+    context_generator = LoggedContextGenerator(contexts, rewards)
+    assert context_generator.dimension == 1
+    assert context_generator.arm_num == 3
+    context_generator.reset()
+    blocks = [context_generator.contexts(4) for _ in range(4)]
+    # Rows are sliced without being copied
+    assert np.shares_memory(blocks[0][0], contexts)
+    replayed_rows = np.concatenate(
+        [block_contexts[:, 0] for (block_contexts, _) in blocks]).astype(int)
+    # Rows are replayed in order wrapping around at the end
+    assert len(replayed_rows) >= 10
+    np.testing.assert_array_equal(
+        replayed_rows, (replayed_rows[0] + np.arange(len(replayed_rows))) % 10)
+    np.testing.assert_allclose(
+        np.concatenate([block_rewards for (_, block_rewards) in blocks]),
+        rewards[replayed_rows])
+
+  def test_shuffle(self):
+    contexts = np.arange(10, dtype=float).reshape(10, 1)
+    rewards = np.random.random((10, 2))
+    context_generator = LoggedContextGenerator(contexts,
+                                               rewards,
+                                               shuffle=True,
+                                               chunk_size=4)
+    np.random.seed(0)
+    context_generator.reset()
+    replayed_contexts = [context_generator.context()[0][0] for _ in range(10)]
+    # Each row is replayed once
+    assert sorted(replayed_contexts) == list(range(10))
+    np.random.seed(0)
+    context_generator.reset()
+    # Replay is reproducible
+    assert replayed_contexts == [
+        context_generator.context()[0][0] for _ in range(10)
+    ]
+
+  def test_memmap_logs(self):
+    contexts = np.random.random((6, 2))
+    rewards = np.random.random((6, 3))
+    with tempfile.TemporaryDirectory() as directory:
+      contexts_file = os.path.join(directory, 'contexts.npy')
+      rewards_file = os.path.join(directory, 'rewards.npy')
+      np.save(contexts_file, contexts)
+      np.save(rewards_file, rewards)
+      context_generator = LoggedContextGenerator(contexts_file, rewards_file)
+      # Logs are mapped again instead of copied
+      copied_generator = pickle.loads(pickle.dumps(context_generator))
+      copied_generator.reset()
+      (block_contexts, block_rewards) = copied_generator.contexts(6)
+      assert isinstance(block_contexts, np.memmap)
+      row = int(np.argmin(np.abs(contexts[:, 0] - block_contexts[0, 0])))
+      np.testing.assert_allclose(block_rewards, rewards[row:])
+      del context_generator, copied_generator, block_contexts, block_rewards
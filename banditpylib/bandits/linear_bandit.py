@@ -1,15 +1,16 @@
-from typing import List
+from typing import List, Union
 
 import numpy as np
 
-from banditpylib.arms import GaussianArm
+from banditpylib.utils import MemmapPicklable
 from banditpylib.data_pb2 import Context, Actions, Feedback, ArmPull, \
     ArmFeedback
-from banditpylib.learners import Goal, IdentifyBestArm, MaximizeTotalRewards
-from .utils import Bandit
+from banditpylib.learners import Goal, IdentifyBestArm, MaximizeTotalRewards, \
+    PlainActions, PlainFeedback
+from .utils import Bandit, PlainBandit
 
 
-class LinearBandit(Bandit):
+class LinearBandit(Bandit, PlainBandit, MemmapPicklable):
   r"""Finite-armed linear bandit
 
   Arms are indexed from 0 by default. Each pull of arm :math:`i` will generate
@@ -18,21 +19,35 @@ class LinearBandit(Bandit):
   :math:`\theta` is the unknown parameter and :math:`\epsilon` is a zero-mean
   noise.
 
-  :param List[np.ndarray] features: feature vectors of the arms
+  :param Union[List[np.ndarray], np.ndarray] features: feature vectors of the
+    arms in a list or stacked in an array of shape (arms, dimension)
   :param np.ndarray theta: unknown parameter theta
   :param float std: standard variance of noise
+
+  .. note::
+    An array of features is used without being copied. A read-only
+    `np.memmap`, e.g., loaded by `np.load(filename, mmap_mode='r')`, is mapped
+    again instead of copied when the bandit environment is copied or sent to
+    other processes.
   """
   def __init__(self,
-               features: List[np.ndarray],
+               features: Union[List[np.ndarray], np.ndarray],
                theta: np.ndarray,
                std: float = 1.0):
     if len(features) < 2:
       raise ValueError('The number of arms is expected at least 2. Got %d.' %
                        len(features))
-    for (i, feature) in enumerate(features):
-      if feature.shape != theta.shape:
-        raise ValueError('Dimension of arm %d\'s feature vector is expected '
-                         'the same as theta\'s. Got %d.' % (i, len(feature)))
+    if isinstance(features, np.ndarray):
+      if features.ndim != 2 or features.shape[1] != len(theta):
+        raise ValueError(
+            'Dimension of feature vectors is expected the same as '
+            'theta\'s. Got %s.' % (features.shape[1:], ))
+    else:
+      for (i, feature) in enumerate(features):
+        if feature.shape != theta.shape:
+          raise ValueError('Dimension of arm %d\'s feature vector is expected '
+                           'the same as theta\'s. Got %d.' % (i, len(feature)))
+      features = np.array(features)
     self.__features = features
     self.__theta = theta
     self.__arm_num = len(features)
@@ -42,13 +57,10 @@ class LinearBandit(Bandit):
           'Standard deviation of noise is expected greater than 0. Got %.2f' %
           std)
     self.__std = std
-    # Each arm in linear bandit can be seen as a Gaussian arm
-    self.__arms = [GaussianArm(np.dot(feature, self.__theta), self.__std) \
-                   for feature in self.__features]
-    self.__best_arm_id = max([(arm_id, arm.mean)
-                              for (arm_id, arm) in enumerate(self.__arms)],
-                             key=lambda x: x[1])[0]
-    self.__best_arm = self.__arms[self.__best_arm_id]
+    # Means of rewards of all the arms
+    self.__means = np.asarray(self.__features @ self.__theta, dtype=float)
+    self.__best_arm_id = int(np.argmax(self.__means))
+    self.__best_mean = self.__means[self.__best_arm_id]
 
   @property
   def name(self) -> str:
@@ -58,42 +70,78 @@ class LinearBandit(Bandit):
   def context(self) -> Context:
     return Context()
 
-  def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
+  def __pull(self, arm_id: int, pulls: int) -> np.ndarray:
     """Pull one arm
 
     Args:
-      arm_pull: arm id and its pulls
+      arm_id: arm to pull
+      pulls: number of times to pull
 
     Returns:
-      arm_feedback: arm id and its rewards
+      empirical rewards
     """
-    arm_id = arm_pull.arm.id
-    pulls = arm_pull.times
+    return self.pull_batch(np.full(pulls, arm_id))
 
-    if arm_id not in range(self.__arm_num):
-      raise ValueError('Arm id is expected in the range [0, %d). Got %d.' %
-                       (self.__arm_num, arm_id))
+  def pull_batch(self, arm_ids: np.ndarray) -> np.ndarray:
+    """Pull a batch of arms
 
-    arm_feedback = ArmFeedback()
+    Noise of all the pulls is drawn at once.
 
-    # Empirical rewards when `arm_id` is pulled for `pulls` times
-    em_rewards = self.__arms[arm_id].pull(pulls)
+    Args:
+      arm_ids: arms to pull. An arm can appear multiple times.
 
-    self.__regret += (self.__best_arm.mean * pulls - em_rewards)
+    Returns:
+      empirical rewards of the pulls
+    """
+    arm_ids = np.asarray(arm_ids, dtype=int)
+    invalid_arm_ids = arm_ids[(arm_ids < 0) | (arm_ids >= self.__arm_num)]
+    if len(invalid_arm_ids) > 0:
+      raise ValueError('Arm id is expected in the range [0, %d). Got %d.' %
+                       (self.__arm_num, invalid_arm_ids[0]))
+    em_rewards = self.__means[arm_ids] + np.random.normal(
+        0, self.__std, len(arm_ids))
 
-    arm_feedback.arm.id = arm_id
-    arm_feedback.rewards.extend(list(em_rewards))  # type: ignore
+    self.__regret += (self.__best_mean * len(arm_ids) - np.sum(em_rewards))
+    return em_rewards
 
+  def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
+    """Pull one arm
+
+    Args:
+      arm_pull: arm id and its pulls
+
+    Returns:
+      arm_feedback: arm id and its rewards
+    """
+    arm_feedback = ArmFeedback()
+    arm_feedback.arm.id = arm_pull.arm.id
+    arm_feedback.rewards.extend(
+        list(self.__pull(arm_pull.arm.id, arm_pull.times)))
     return arm_feedback
 
   def feed(self, actions: Actions) -> Feedback:
     feedback = Feedback()
-    for arm_pull in actions.arm_pulls:
-      if arm_pull.times > 0:
-        arm_feedback = self._take_action(arm_pull=arm_pull)
-        feedback.arm_feedbacks.append(arm_feedback)
+    for (arm_id, em_rewards) in self.plain_feed([
+        (arm_pull.arm.id, arm_pull.times) for arm_pull in actions.arm_pulls
+    ]):
+      arm_feedback = feedback.arm_feedbacks.add()
+      arm_feedback.arm.id = arm_id
+      arm_feedback.rewards.extend(em_rewards.tolist())
     return feedback
 
+  def plain_feed(self, actions: PlainActions) -> PlainFeedback:
+    actions = [(arm_id, pulls) for (arm_id, pulls) in actions if pulls > 0]
+    if not actions:
+      return []
+    # Pull all the arms at once
+    em_rewards = self.pull_batch(
+        np.repeat([arm_id for (arm_id, _) in actions],
+                  [pulls for (_, pulls) in actions]))
+    return list(
+        zip([arm_id for (arm_id, _) in actions],
+            np.split(em_rewards,
+                     np.cumsum([pulls for (_, pulls) in actions])[:-1])))
+
   def reset(self):
     self.__regret = 0.0
 
@@ -103,10 +151,10 @@ class LinearBandit(Bandit):
     return self.__arm_num
 
   @property
-  def features(self) -> List[np.ndarray]:
+  def features(self) -> np.ndarray:
     """
     Returns:
-      feature vectors
+      feature vectors stacked in an array of shape (arms, dimension)
     """
     return self.__features
 
@@ -1,4 +1,9 @@
+import os
+import pickle
+import tempfile
+
 import numpy as np
+import pytest
 
 from banditpylib.learners import IdentifyBestArm
 from .linear_bandit import LinearBandit
@@ -12,3 +17,31 @@ class TestLinearBandit:
     linear_bandit = LinearBandit(features, theta)
     linear_bandit.reset()
     assert linear_bandit.regret(IdentifyBestArm(best_arm=0)) == 1
+
+  def test_pull_batch(self):
+    features = np.array([[0, 1], [1, 0]])
+    theta = np.array([1, 0])
+    linear_bandit = LinearBandit(features, theta, std=0.1)
+    linear_bandit.reset()
+    em_rewards = linear_bandit.pull_batch(np.array([1] * 2000 + [0] * 2000))
+    assert np.mean(em_rewards[:2000]) == pytest.approx(1, abs=0.02)
+    assert np.mean(em_rewards[2000:]) == pytest.approx(0, abs=0.02)
+
+    feedback = linear_bandit.plain_feed([(0, 3), (1, 0), (1, 2)])
+    assert [arm_id for (arm_id, _) in feedback] == [0, 1]
+    assert [len(rewards) for (_, rewards) in feedback] == [3, 2]
+
+  def test_memmap_features(self):
+    features = np.random.random((5, 3))
+    theta = np.random.random(3)
+    with tempfile.TemporaryDirectory() as directory:
+      filename = os.path.join(directory, 'features.npy')
+      np.save(filename, features)
+      linear_bandit = LinearBandit(np.load(filename, mmap_mode='r'), theta)
+      # Features are mapped again instead of copied
+      copied_bandit = pickle.loads(pickle.dumps(linear_bandit))
+      assert isinstance(copied_bandit.features, np.memmap)
+      np.testing.assert_allclose(copied_bandit.features, features)
+      copied_bandit.reset()
+      copied_bandit.pull_batch(np.arange(5))
+      del linear_bandit, copied_bandit
@@ -1,5 +1,7 @@
+from collections import OrderedDict
 import copy
-from typing import Set
+import hashlib
+from typing import Callable, Hashable, Iterable, Optional, Set, Tuple
 
 from absl import logging
 
@@ -8,11 +10,20 @@ import numpy as np
 from banditpylib.data_pb2 import Context, Actions, Feedback, ArmPull, \
     ArmFeedback
 from banditpylib.learners import Goal, MaximizeTotalRewards
-from .mnl_bandit_utils import Reward, MeanReward, search_best_assortment
-from .utils import Bandit
+from .mnl_bandit_utils import Reward, MeanReward, CvarReward, \
+    search_best_assortment
+from .utils import Bandit, EpisodicBandit
 
+# Maximum number of best assortments kept in the current process
+_BEST_ASSORTMENTS_SIZE = 16
+# Best assortments found by regret oracles in the current process, which are
+# shared by bandit environments with the same parameters. The least recently
+# used ones are evicted first.
+_BEST_ASSORTMENTS: 'OrderedDict[Hashable, Tuple[float, Set[int]]]' = \
+    OrderedDict()
 
-class MNLBandit(Bandit):
+
+class MNLBandit(Bandit, EpisodicBandit):
   r"""MNL bandit
 
   There are a total of :math:`N` products, where products are numbered from 1 by
@@ -47,6 +58,23 @@ class MNLBandit(Bandit):
     assortment to 0. This is useful when data is too large to compute the best
     assortment. When best reward is set to zero, the regret equals to the minus
     total revenue.
+  :param Optional[Callable] regret_oracle: function computing the best reward
+    and the best assortment given the reward and the cardinality constraint,
+    e.g.,
+    :func:`parametric_search_best_assortment` or a function returning an upper
+    bound of the best reward. It should be picklable when the game is played
+    with multiple processes. The default oracle is
+    :func:`search_best_assortment`.
+  :param Optional[float] best_reward: precomputed reward of the best assortment
+    e.g., loaded from disk. The regret oracle is not used if it is set.
+  :param int reward_cache_size: maximum number of assortments served whose
+    rewards are cached. The least recently served ones are evicted first.
+
+  .. note::
+    The best assortment is computed only when the regret of a non-empty game
+    is asked for the first time, or when the bandit environment is copied or
+    pickled, e.g., before it is sent to the worker processes, so that the
+    copies carry it and do not compute it again.
   """
   def __init__(
       self,
@@ -54,7 +82,11 @@ class MNLBandit(Bandit):
       revenues: np.ndarray,
       card_limit: int = np.inf,  # type: ignore
       reward: Reward = None,
-      zero_best_reward: bool = False):
+      zero_best_reward: bool = False,
+      regret_oracle: Optional[Callable[[Reward, int], Tuple[float,
+                                                            Set[int]]]] = None,
+      best_reward: Optional[float] = None,
+      reward_cache_size: int = 65536):
     if len(preference_params) != len(revenues):
       raise ValueError(
           'Number of preference parameters %d is expected equal to number of '
@@ -76,6 +108,14 @@ class MNLBandit(Bandit):
 
     self.__preference_params = preference_params
     self.__revenues = revenues
+    self.__preference_array = np.asarray(preference_params, dtype=float)
+    self.__revenue_array = np.asarray(revenues, dtype=float)
+    if reward_cache_size < 1:
+      raise ValueError('Reward cache size is expected at least 1. Got %d.' %
+                       reward_cache_size)
+    self.__reward_cache_size = reward_cache_size
+    # Rewards of assortments served keyed by their sorted product ids
+    self.__assortment_rewards: 'OrderedDict[bytes, float]' = OrderedDict()
     # Product 0 is reserved for non-purchase
     self.__product_num = len(self.__preference_params) - 1
     if self.__product_num == 0:
@@ -90,24 +130,123 @@ class MNLBandit(Bandit):
     self.__reward.set_preference_params(self.__preference_params)
     self.__reward.set_revenues(self.__revenues)
 
-    self.__best_assort: Set[int]
-
+    self.__regret_oracle = (search_best_assortment
+                            if regret_oracle is None else regret_oracle)
+    # Best reward and best assortment, which are computed lazily
+    self.__best: Optional[Tuple[float, Set[int]]] = None
     if zero_best_reward:
-      self.__best_reward, self.__best_assort = 0.0, set()
+      self.__best = (0.0, set())
       logging.warning(
           'Best reward is set to zero. Now the regret equals to the'
           ' minus total revenue.')
-    else:
-      # Compute the best assortment
-      self.__best_reward, self.__best_assort = search_best_assortment(
-          reward=self.__reward, card_limit=self.__card_limit)
-      logging.info('Assortment %s has best reward %.2f.',
-                   sorted(list(self.__best_assort)), self.__best_reward)
+    elif best_reward is not None:
+      self.__best = (best_reward, set())
 
   @property
   def name(self) -> str:
     return 'mnl_bandit'
 
+  def __best_reward_and_assortment(self) -> Tuple[float, Set[int]]:
+    """
+    Returns:
+      best reward and best assortment
+    """
+    if self.__best is None:
+      # Digest of the parameters instead of the parameters themselves is kept
+      digest = hashlib.sha256(self.__preference_array.tobytes() +
+                              self.__revenue_array.tobytes()).digest()
+      key = (type(self.__reward).__name__, self.__reward.alpha if isinstance(
+          self.__reward, CvarReward) else None, self.__card_limit,
+             len(self.__preference_array), digest, self.__regret_oracle)
+      if key in _BEST_ASSORTMENTS:
+        _BEST_ASSORTMENTS.move_to_end(key)
+      else:
+        # Compute the best assortment
+        _BEST_ASSORTMENTS[key] = self.__regret_oracle(self.__reward,
+                                                      self.__card_limit)
+        logging.info('Assortment %s has best reward %.2f.',
+                     sorted(list(_BEST_ASSORTMENTS[key][1])),
+                     _BEST_ASSORTMENTS[key][0])
+        if len(_BEST_ASSORTMENTS) > _BEST_ASSORTMENTS_SIZE:
+          _BEST_ASSORTMENTS.popitem(last=False)
+      self.__best = _BEST_ASSORTMENTS[key]
+    return self.__best
+
+  def __getstate__(self):
+    # Copies carry the best assortment so that it is computed only once
+    self.__best_reward_and_assortment()
+    return self.__dict__.copy()
+
+  @property
+  def best_reward(self) -> float:
+    """Reward of the best assortment"""
+    return self.__best_reward_and_assortment()[0]
+
+  def __products(self, assortment: Iterable[int]) -> np.ndarray:
+    """Validate an assortment
+
+    Args:
+      assortment: assortment to serve
+
+    Returns:
+      sorted product ids of the assortment
+    """
+    products = np.unique(np.array(list(assortment), dtype=int))
+    if len(products) == 0:
+      raise Exception('Empty assortment!')
+    out_of_range = products[(products < 1) | (products > self.__product_num)]
+    if len(out_of_range) > 0:
+      raise Exception('Product id %d is out of range [1, %d]!' %
+                      (out_of_range[0], self.__product_num))
+    if len(products) > self.__card_limit:
+      raise Exception('Assortment %s has products more than cardinality'
+                      ' constraint %d!' %
+                      (products.tolist(), self.__card_limit))
+    return products
+
+  def __sample_choices(self,
+                       products: np.ndarray,
+                       customers: int,
+                       purchase_only: bool = False) -> np.ndarray:
+    """Sample choices of customers by inverse transform
+
+    Args:
+      products: sorted product ids of the assortment served
+      customers: number of customers
+      purchase_only: whether the customers are known to purchase a product
+
+    Returns:
+      choices of the customers
+    """
+    choices = np.concatenate([[0], products])
+    params = self.__preference_array[choices]
+    if purchase_only:
+      choices, params = choices[1:], params[1:]
+    accumulate_params = np.cumsum(params)
+    samples = np.minimum(
+        np.searchsorted(accumulate_params,
+                        np.random.random(customers) * accumulate_params[-1],
+                        side='right'),
+        len(choices) - 1)
+    return choices[samples]
+
+  def __update_regret(self, products: np.ndarray, times: int):
+    """
+    Args:
+      products: sorted product ids of the assortment served
+      times: number of serving times
+    """
+    key = products.tobytes()
+    if key in self.__assortment_rewards:
+      self.__assortment_rewards.move_to_end(key)
+    else:
+      self.__assortment_rewards[key] = self.__reward.calc(
+          set(products.tolist()))
+      if len(self.__assortment_rewards) > self.__reward_cache_size:
+        self.__assortment_rewards.popitem(last=False)
+    self.__total_pulls += times
+    self.__total_reward += self.__assortment_rewards[key] * times
+
   def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
     """Serve one assortment
 
@@ -117,45 +256,55 @@ class MNLBandit(Bandit):
     Returns:
       feedbacks of the customer
     """
-    assortment = set(arm_pull.arm.set.id)
-    times = arm_pull.times
-
-    if not assortment:
-      raise Exception('Empty assortment!')
-    for product_id in assortment:
-      if product_id < 1 or product_id > self.__product_num:
-        raise Exception('Product id %d is out of range [1, %d]!' %
-                        (product_id, self.__product_num))
-    if len(assortment) > self.__card_limit:
-      raise Exception('Assortment %s has products more than cardinality'
-                      ' constraint %d!' %
-                      (sorted(list(assortment)), self.__card_limit))
-
-    preference_params_sum = sum(
-        [self.__preference_params[product_id] for product_id in assortment]) +\
-        self.__preference_params[0]
-    sorted_assort = sorted(list(assortment))
-    sample_prob = [self.__preference_params[0] / preference_params_sum] + \
-        [self.__preference_params[product] / preference_params_sum
-         for product in sorted_assort]
-    sample_results = np.random.choice(len(sample_prob), times, p=sample_prob)
-    choices = [
-        0 if (sample == 0) else sorted_assort[sample - 1]
-        for sample in sample_results
-    ]
+    products = self.__products(arm_pull.arm.set.id)
+    choices = self.__sample_choices(products, arm_pull.times)
 
     arm_feedback = ArmFeedback()
-    arm_feedback.arm.set.id.extend(list(assortment))
-    arm_feedback.rewards.extend(
-        np.array([self.__revenues[choice] for choice in choices]))
-    arm_feedback.customer_feedbacks.extend(choices)
-
-    # Update regret
-    self.__regret += (self.__best_reward -
-                      self.__reward.calc(assortment)) * times
+    arm_feedback.arm.set.id.extend(products.tolist())
+    arm_feedback.rewards.extend(self.__revenue_array[choices].tolist())
+    arm_feedback.customer_feedbacks.extend(choices.tolist())
 
+    self.__update_regret(products, arm_pull.times)
     return arm_feedback
 
+  def serve_episode(
+      self,
+      assortment: Iterable[int],
+      max_customers: int = np.inf  # type: ignore
+  ) -> np.ndarray:
+    """Serve one assortment until a customer purchases nothing
+
+    The number of customers in the episode follows a geometric distribution
+    and the products purchased are sampled at once, which has the same
+    statistics as serving the assortment customer by customer.
+
+    Args:
+      assortment: assortment to serve
+      max_customers: maximum number of customers to serve
+
+    Returns:
+      choices of the customers. The last one is 0 unless the episode is cut
+      off by `max_customers`.
+    """
+    if max_customers < 1:
+      raise ValueError('Maximum number of customers is expected at least 1. '
+                       'Got %d.' % max_customers)
+    products = self.__products(assortment)
+    # Probability that a customer purchases nothing
+    non_purchase_prob = self.__preference_array[0] / (
+        self.__preference_array[0] + np.sum(self.__preference_array[products]))
+    customers = np.random.geometric(non_purchase_prob)
+    if customers <= max_customers:
+      choices = np.append(
+          self.__sample_choices(products, customers - 1, purchase_only=True),
+          0)
+    else:
+      customers = int(max_customers)
+      choices = self.__sample_choices(products, customers, purchase_only=True)
+
+    self.__update_regret(products, customers)
+    return choices
+
   def feed(self, actions: Actions) -> Feedback:
     feedback = Feedback()
     for arm_pull in actions.arm_pulls:
@@ -165,7 +314,10 @@ class MNLBandit(Bandit):
     return feedback
 
   def reset(self):
-    self.__regret = 0.0
+    # Total number of times assortments are served
+    self.__total_pulls = 0
+    # Total expected reward of assortments served
+    self.__total_reward = 0.0
 
   @property
   def context(self) -> Context:
@@ -188,5 +340,7 @@ class MNLBandit(Bandit):
 
   def regret(self, goal: Goal) -> float:
     if isinstance(goal, MaximizeTotalRewards):
-      return self.__regret
+      if self.__total_pulls == 0:
+        return 0.0
+      return self.best_reward * self.__total_pulls - self.__total_reward
     raise Exception('Goal %s is not supported!' % goal.name)
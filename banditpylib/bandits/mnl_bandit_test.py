@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import numpy as np
 import pytest
 
@@ -5,9 +8,20 @@ import google.protobuf.text_format as text_format
 
 from banditpylib.data_pb2 import Actions
 from banditpylib.learners import MaximizeTotalRewards
-from .mnl_bandit import MNLBandit
+from .mnl_bandit import MNLBandit, _BEST_ASSORTMENTS, _BEST_ASSORTMENTS_SIZE
 from .mnl_bandit_utils import search, search_best_assortment, MeanReward, \
-    CvarReward, local_search_best_assortment
+    CvarReward, local_search_best_assortment, \
+    parametric_search_best_assortment, iter_assortments, sample_assortment, \
+    incidence_matrix, multi_start_local_search_best_assortment, \
+    AssortmentCache
+
+
+@pytest.fixture(name='best_assortments')
+def fixture_best_assortments():
+  """Best assortments found in the current process, which are cleared after
+  the test"""
+  yield _BEST_ASSORTMENTS
+  _BEST_ASSORTMENTS.clear()
 
 
 class TestMNLBandit:
@@ -29,6 +43,30 @@ class TestMNLBandit:
            card_limit=1)
     assert results == [{1}, {2}, {3}]
 
+  def test_iter_assortments(self):
+    results = [
+        assortment.tolist()
+        for assortment in iter_assortments(product_num=3, card_limit=2)
+    ]
+    assert results == [[1], [2], [3], [1, 2], [1, 3], [2, 3]]
+    assert len(list(iter_assortments(product_num=10))) == 2**10 - 1
+
+  def test_sample_assortment(self):
+    counts = dict()
+    for _ in range(6000):
+      assortment = sample_assortment(product_num=4, card_limit=2)
+      assert assortment.issubset({1, 2, 3, 4})
+      assert 1 <= len(assortment) <= 2
+      key = tuple(sorted(assortment))
+      counts[key] = counts.get(key, 0) + 1
+    # 10 assortments are sampled uniformly
+    assert len(counts) == 10
+    assert all(count > 450 for count in counts.values())
+    # Numbers of assortments exceeding the range of floats are supported
+    assortment = sample_assortment(product_num=2000, card_limit=1500)
+    assert assortment.issubset(set(range(1, 2001)))
+    assert 1 <= len(assortment) <= 1500
+
   def test_search_best_assortment(self):
     reward = MeanReward()
     reward.set_preference_params(np.array([1, 1, 1, 1, 1]))
@@ -44,6 +82,48 @@ class TestMNLBandit:
     assert best_assortment == {1, 2, 3, 4}
     assert best_revenue == pytest.approx(0.41, 1e-2)
 
+  def test_parametric_search_best_assortment(self):
+    for _ in range(20):
+      reward = MeanReward()
+      reward.set_preference_params(np.concatenate([[1], np.random.random(8)]))
+      reward.set_revenues(np.concatenate([[0], np.random.random(8)]))
+      assortments = []
+      search(assortments=assortments,
+             product_num=8,
+             next_product_id=1,
+             assortment=set(),
+             card_limit=3)
+      best_revenue = max(
+          [reward.calc(assortment) for assortment in assortments])
+      revenue, assortment = parametric_search_best_assortment(reward=reward,
+                                                              card_limit=3)
+      assert len(assortment) <= 3
+      assert revenue == pytest.approx(best_revenue, 1e-8)
+
+  def test_assortment_cache(self):
+    cache = AssortmentCache(max_size=2)
+    reward = MeanReward()
+    reward.set_revenues(np.array([0, 0.45, 0.8, 0.9, 1.0]))
+    reward.set_preference_params(np.array([1, 1, 1, 1, 1]))
+    assert cache.search(reward=reward, card_limit=2)[1] == {3, 4}
+    assert cache.hits == 0
+    # Previous optimum is still optimal
+    reward.set_preference_params(np.array([1, 0.9, 1, 1, 1]))
+    assert cache.search(reward=reward, card_limit=2)[1] == {3, 4}
+    assert cache.hits == 1
+
+    reward = CvarReward(0.7)
+    reward.set_revenues(np.array([0, 0.7, 0.8, 0.9, 1.0]))
+    reward.set_preference_params(np.array([1, 0.7, 0.8, 0.5, 0.2]))
+    best_revenue, best_assortment = cache.search(reward=reward)
+    assert best_assortment == {1, 2, 3, 4}
+    assert cache.hits == 1
+    # Preference parameters are the same after rounding
+    reward.set_preference_params(np.array([1, 0.7001, 0.8, 0.5, 0.2]))
+    assert cache.search(reward=reward)[1] == best_assortment
+    assert cache.hits == 2
+    assert cache.search(reward=reward)[0] != best_revenue
+
   def test_local_search_best_assortment(self):
     reward = MeanReward()
     reward.set_preference_params(
@@ -68,6 +148,56 @@ class TestMNLBandit:
     # assortment.
     assert best_assortment == local_best_assortment
 
+  def test_local_search_local_optimality(self):
+    for reward in [MeanReward(), CvarReward(0.5)]:
+      reward.set_preference_params(np.concatenate([[1], np.random.random(10)]))
+      reward.set_revenues(np.concatenate([[0], np.random.random(10)]))
+      local_best_reward, local_best_assortment = local_search_best_assortment(
+          reward=reward, random_neighbors=50, card_limit=4)
+      assert 1 <= len(local_best_assortment) <= 4
+      assert local_best_reward == pytest.approx(
+          reward.calc(local_best_assortment), 1e-8)
+      if isinstance(reward, MeanReward):
+        # No assortment differing in one product is better
+        for assortment in iter_assortments(product_num=10, card_limit=4):
+          if len(set(assortment.tolist()) ^ local_best_assortment) <= 2:
+            assert reward.calc(set(
+                assortment.tolist())) <= local_best_reward + 1e-8
+
+  def test_multi_start_local_search_best_assortment(self):
+    reward = CvarReward(0.5)
+    reward.set_preference_params(np.concatenate([[1], np.random.random(10)]))
+    reward.set_revenues(np.concatenate([[0], np.random.random(10)]))
+    init_assortment = {1, 2}
+    init_reward = reward.calc(init_assortment)
+    for threads in [1, 4]:
+      best_reward, best_assortment = multi_start_local_search_best_assortment(
+          reward=reward,
+          random_neighbors=10,
+          card_limit=3,
+          restarts=4,
+          init_assortment=init_assortment,
+          threads=threads)
+      assert 1 <= len(best_assortment) <= 3
+      assert best_reward == pytest.approx(reward.calc(best_assortment), 1e-8)
+      assert best_reward >= init_reward - 1e-8
+
+    # Only the first start runs when time is up
+    reward = MeanReward()
+    reward.set_preference_params(np.concatenate([[1], np.random.random(10)]))
+    reward.set_revenues(np.concatenate([[0], np.random.random(10)]))
+    assert multi_start_local_search_best_assortment(
+        reward=reward,
+        random_neighbors=10,
+        card_limit=3,
+        restarts=4,
+        init_assortment=init_assortment,
+        time_limit=-1) == local_search_best_assortment(
+            reward=reward,
+            random_neighbors=10,
+            card_limit=3,
+            init_assortment=init_assortment)
+
   def test_cvar_calculation(self):
     reward = CvarReward(alpha=0.5)
     reward.set_preference_params(np.array([1, 1, 1, 1]))
@@ -86,6 +216,20 @@ class TestMNLBandit:
     # Upper bound of cvar is 1
     assert cvar_alpha == 0.75
 
+  def test_calc_batch(self):
+    preference_params = np.array([1, 0.3, 0.9, 0.5, 0.2, 0.7])
+    # Revenues with ties
+    revenues = np.array([0, 0.5, 0.2, 0.5, 1.0, 0.8])
+    assortments = list(iter_assortments(product_num=5))
+    matrix = incidence_matrix(assortments, 5)
+    for reward in [MeanReward(), CvarReward(0.3), CvarReward(0.7)]:
+      reward.set_preference_params(preference_params)
+      reward.set_revenues(revenues)
+      expected_rewards = [
+          reward.calc(set(assortment.tolist())) for assortment in assortments
+      ]
+      np.testing.assert_allclose(reward.calc_batch(matrix), expected_rewards)
+
   def test_regret(self):
     preference_params = np.array(
         [1.0, 1.0, 1.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.5, 0.5])
@@ -127,3 +271,127 @@ class TestMNLBandit:
         times: 5
       }
       """, Actions())).arm_feedbacks[0].customer_feedbacks) == {0}
+
+  def test_choice_frequency(self):
+    preference_params = np.array([1.0, 0.5, 0.0, 0.25])
+    revenues = np.array([0, 1, 1, 1])
+    bandit = MNLBandit(preference_params, revenues)
+    bandit.reset()
+    actions = text_format.Parse(
+        """
+      arm_pulls {
+        arm {
+          set {
+            id: 3
+            id: 2
+            id: 1
+          }
+        }
+        times: 7000
+      }
+      """, Actions())
+    choices = np.array(
+        bandit.feed(actions).arm_feedbacks[0].customer_feedbacks)
+    # Product 2 is never chosen
+    assert np.sum(choices == 2) == 0
+    np.testing.assert_allclose(
+        [np.mean(choices == product) for product in [0, 1, 3]],
+        [4 / 7, 2 / 7, 1 / 7],
+        atol=0.03)
+    # Regret is computed from the cached reward of the assortment
+    regret = bandit.regret(MaximizeTotalRewards())
+    bandit.feed(actions)
+    assert bandit.regret(MaximizeTotalRewards()) == pytest.approx(2 * regret)
+
+  def test_reward_cache(self):
+    preference_params = np.array([1.0, 0.5, 0.8, 0.2])
+    revenues = np.array([0, 0.9, 0.3, 1.0])
+    bandit = MNLBandit(preference_params, revenues, reward_cache_size=2)
+    bandit.reset()
+    for assortment in [{1}, {2}, {1}, {3}]:
+      bandit.serve_episode(assortment)
+    # The least recently served assortment is evicted
+    # pylint: disable=protected-access
+    assert list(bandit._MNLBandit__assortment_rewards) == [
+        np.array([1]).tobytes(),
+        np.array([3]).tobytes()
+    ]
+
+  def test_lazy_best_reward(self, best_assortments):
+    preference_params = np.array([1.0, 0.5, 0.8, 0.2, 0.9])
+    revenues = np.array([0, 0.9, 0.3, 1.0, 0.5])
+    calls = []
+
+    def oracle(reward, card_limit):
+      calls.append(card_limit)
+      return parametric_search_best_assortment(reward, card_limit)
+
+    bandit = MNLBandit(preference_params,
+                       revenues,
+                       card_limit=2,
+                       regret_oracle=oracle)
+    bandit.reset()
+    # The best assortment is neither computed on construction nor when no
+    # assortment is served
+    assert bandit.regret(MaximizeTotalRewards()) == 0.0
+    assert not calls
+    # The best assortment is computed before copying and carried by the copy
+    copied_bandit = copy.deepcopy(bandit)
+    assert calls == [2]
+    best_assortments.clear()
+    reward = MeanReward()
+    reward.set_preference_params(preference_params)
+    reward.set_revenues(revenues)
+    best_reward, _ = search_best_assortment(reward=reward, card_limit=2)
+    assert copied_bandit.best_reward == pytest.approx(best_reward)
+    assert pickle.loads(
+        pickle.dumps(
+            MNLBandit(preference_params, revenues,
+                      card_limit=2))).best_reward == pytest.approx(best_reward)
+    assert calls == [2]
+    # Bandit environments with the same parameters share the best assortment
+    bandit = MNLBandit(preference_params,
+                       revenues,
+                       card_limit=2,
+                       regret_oracle=oracle)
+    assert bandit.best_reward == pytest.approx(best_reward)
+    assert calls == [2, 2]
+    bandit = MNLBandit(preference_params,
+                       revenues,
+                       card_limit=2,
+                       regret_oracle=oracle)
+    assert bandit.best_reward == pytest.approx(best_reward)
+    assert calls == [2, 2]
+    # Only a limited number of best assortments are kept
+    for card_limit in range(1, _BEST_ASSORTMENTS_SIZE + 2):
+      assert MNLBandit(np.ones(card_limit + 1),
+                       np.arange(card_limit + 1),
+                       regret_oracle=oracle).best_reward > 0
+    assert len(best_assortments) == _BEST_ASSORTMENTS_SIZE
+
+    # Precomputed best reward
+    calls.clear()
+    bandit = MNLBandit(preference_params,
+                       revenues,
+                       card_limit=2,
+                       regret_oracle=oracle,
+                       best_reward=1.0)
+    assert bandit.best_reward == 1.0
+    assert not calls
+
+  def test_serve_episode(self):
+    preference_params = np.array([1.0, 0.5, 0.0, 0.25])
+    revenues = np.array([0, 1, 1, 1])
+    bandit = MNLBandit(preference_params, revenues)
+    bandit.reset()
+    lengths = []
+    for _ in range(3000):
+      choices = bandit.serve_episode({1, 2, 3})
+      assert choices[-1] == 0
+      assert np.all(choices[:-1] != 0)
+      assert np.all(choices != 2)
+      lengths.append(len(choices))
+    # Number of customers in an episode is geometric with mean 1.75
+    assert np.mean(lengths) == pytest.approx(1.75, abs=0.1)
+    # Episode is cut off
+    assert len(bandit.serve_episode({1, 3}, max_customers=1)) == 1
@@ -1,6 +1,13 @@
+import itertools
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 from abc import abstractmethod
 
-from typing import List, Tuple, Set, Optional
+from typing import Hashable, Iterable, Iterator, List, Tuple, Sequence, \
+    Set, Optional
 
 from absl import logging
 
@@ -38,6 +45,92 @@ def search(
          restricted_products)
 
 
+def iter_assortments(
+    product_num: int,
+    card_limit: int = np.inf  # type: ignore
+) -> Iterator[np.ndarray]:
+  """Enumerate all assortments satisfying cardinality limit
+
+  Assortments are generated lazily in the order of increasing cardinality and
+  lexicographically within the same cardinality.
+
+  Args:
+    product_num: total number of products
+    card_limit: cardinality limit
+
+  Returns:
+    sorted product ids of the assortments (empty assortment is ignored)
+  """
+  for card in range(1, int(min(card_limit, product_num)) + 1):
+    for assortment in itertools.combinations(range(1, product_num + 1), card):
+      yield np.array(assortment)
+
+
+def sample_assortment(
+    product_num: int,
+    card_limit: int = np.inf  # type: ignore
+) -> Set[int]:
+  """Sample an assortment satisfying cardinality limit uniformly at random
+
+  The cardinality is sampled first in proportion to the number of assortments
+  having it and then the products are sampled without replacement using
+  Floyd's algorithm. Memory used does not grow with the number of assortments.
+
+  Args:
+    product_num: total number of products
+    card_limit: cardinality limit
+
+  Returns:
+    assortment sampled (empty assortment is ignored)
+  """
+  if product_num < 1:
+    raise ValueError('Number of products is expected at least 1. Got %d.' %
+                     product_num)
+  if card_limit < 1:
+    raise ValueError('Cardinality limit is expected at least 1. Got %d.' %
+                     card_limit)
+  max_card = int(min(card_limit, product_num))
+  # Numbers of assortments of each cardinality from 1 to `max_card`, i.e.,
+  # binomial coefficients computed by c_k = c_{k - 1} * (n - k + 1) / k
+  counts = [product_num]
+  for card in range(2, max_card + 1):
+    counts.append(counts[-1] * (product_num - card + 1) // card)
+  total = sum(counts)
+
+  # Sample the cardinality by inverse transform
+  prob = np.random.random()
+  card = 1
+  accumulate_prob = counts[0] / total
+  while card < max_card and accumulate_prob < prob:
+    card += 1
+    accumulate_prob += counts[card - 1] / total
+
+  # Sample the products by Floyd's algorithm
+  assortment: Set[int] = set()
+  for upper in range(product_num - card + 1, product_num + 1):
+    product = int(np.random.randint(1, upper + 1))
+    assortment.add(upper if product in assortment else product)
+  return assortment
+
+
+def incidence_matrix(assortments: Sequence[Iterable[int]],
+                     product_num: int) -> np.ndarray:
+  """Transform assortments to incidence matrix
+
+  Args:
+    assortments: assortments to transform
+    product_num: total number of products
+
+  Returns:
+    0/1 matrix of shape (assortments, products + 1) whose entry (i, j) is 1 if
+    and only if product j is in the i-th assortment. Column 0 is always 0.
+  """
+  matrix = np.zeros((len(assortments), product_num + 1))
+  for (row, assortment) in enumerate(assortments):
+    matrix[row, list(assortment)] = 1
+  return matrix
+
+
 class Reward:
   """General reward class"""
   def __init__(self):
@@ -59,6 +152,21 @@ class Reward:
       reward of the assortment
     """
 
+  def calc_batch(self, assortments: np.ndarray) -> np.ndarray:
+    """
+    Args:
+      assortments: 0/1 incidence matrix of shape (assortments, products + 1)
+        whose rows are assortments to calculate. Column 0 is ignored since
+        product 0 is always included.
+
+    Returns:
+      rewards of the assortments
+    """
+    return np.array([
+        self.calc(set((np.flatnonzero(row[1:]) + 1).tolist()))
+        for row in assortments
+    ])
+
   @property
   def preference_params(self) -> np.ndarray:
     """preference parameters (product 0 is included)"""
@@ -106,6 +214,13 @@ class MeanReward(Reward):
         self.revenues[product] for product in assortment
     ])
 
+  def calc_batch(self, assortments: np.ndarray) -> np.ndarray:
+    preference_params = np.asarray(self.preference_params, dtype=float)
+    # Preference parameters of the products served in each assortment
+    served_params = assortments[:, 1:] * preference_params[1:]
+    return (served_params @ np.asarray(self.revenues[1:], dtype=float)) / (
+        served_params.sum(axis=1) + preference_params[0])
+
 
 class CvarReward(Reward):
   """CVaR reward
@@ -163,6 +278,86 @@ class CvarReward(Reward):
     cvar_alpha /= self.__alpha
     return cvar_alpha
 
+  def calc_batch(self, assortments: np.ndarray) -> np.ndarray:
+    preference_params = np.asarray(self.preference_params, dtype=float)
+    revenues = np.asarray(self.revenues, dtype=float)
+    # The minimum revenue should be 0, which is the revenue of non-purchase
+    if revenues[0] != 0 or np.min(revenues) < 0:
+      raise Exception('CVaR calculation error!')
+    # Sort according to revenue of product and keep non-purchase first
+    order = np.argsort(revenues, kind='stable')
+    order = np.concatenate([[0], order[order != 0]])
+    served_params = np.asarray(assortments, dtype=float)[:, order]
+    served_params[:, 0] = 1
+    served_params *= preference_params[order]
+    accumulate_probs = np.cumsum(served_params, axis=1) / np.sum(
+        served_params, axis=1, keepdims=True)
+    # Probability mass of each revenue within the lowest alpha percentile
+    tail_probs = np.diff(np.minimum(accumulate_probs, self.__alpha),
+                         axis=1,
+                         prepend=0)
+    return tail_probs @ revenues[order] / self.__alpha
+
+
+def parametric_search_best_assortment(
+    reward: MeanReward,
+    card_limit: int = np.inf  # type: ignore
+) -> Tuple[float, Set[int]]:
+  r"""Search assortment with the maximum mean reward in polynomial time
+
+  The mean reward :math:`R(S)` is at least :math:`\lambda` if and only if
+  :math:`\sum_{i \in S} v_i (r_i - \lambda) \geq \lambda v_0`. For a fixed
+  :math:`\lambda`, the left-hand side is maximized under the cardinality
+  constraint by the products with the largest positive :math:`v_i (r_i -
+  \lambda)`. Starting from :math:`\lambda = 0`, the assortment maximizing the
+  left-hand side is found and :math:`\lambda` is updated to its mean reward
+  until :math:`\lambda` stops increasing, which yields the best assortment
+  after finitely many iterations (Dinkelbach's method). Each iteration takes
+  :math:`O(N)` time.
+
+  Args:
+    reward: mean reward definition
+    card_limit: cardinality constraint
+
+  Returns:
+    assortment with the maximum reward
+  """
+  if card_limit < 1:
+    raise ValueError('Cardinality limit is expected at least 1. Got %d.' %
+                     card_limit)
+  preference_params = np.asarray(reward.preference_params, dtype=float)[1:]
+  revenues = np.asarray(reward.revenues, dtype=float)[1:]
+  product_num = len(revenues)
+  card_limit = min(card_limit, product_num)
+
+  def calc(products: np.ndarray) -> float:
+    return float(
+        np.dot(preference_params[products], revenues[products]) /
+        (np.sum(preference_params[products]) + reward.preference_params[0]))
+
+  # Assortment serving the product with the maximum revenue alone
+  best_products = np.array([np.argmax(revenues * (preference_params > 0))])
+  best_reward = calc(best_products)
+  threshold = 0.0
+  while True:
+    scores = preference_params * (revenues - threshold)
+    products = np.flatnonzero(scores > 0)
+    if len(products) > card_limit:
+      products = products[np.argpartition(-scores[products],
+                                          card_limit - 1)[:card_limit]]
+    if len(products) == 0:
+      break
+    new_reward = calc(products)
+    if new_reward > best_reward:
+      best_products, best_reward = products, new_reward
+    # Stop when the threshold can not be improved anymore
+    if new_reward <= threshold + 1e-12 * max(1.0, abs(threshold)):
+      break
+    threshold = new_reward
+
+  best_assortment = set((best_products + 1).tolist())
+  return (reward.calc(best_assortment), best_assortment)
+
 
 def search_best_assortment(
     reward: Reward,
@@ -178,7 +373,6 @@ def search_best_assortment(
     assortment with the maximum reward
   """
   product_num = len(reward.revenues) - 1
-  restricted_products = None
 
   if isinstance(reward, MeanReward):
     # a fast method to find the best assortment when the reward is MeanReward
@@ -193,26 +387,217 @@ def search_best_assortment(
       next_ind -= 1
     if len(best_assortment) <= card_limit:
       return (reward.calc(best_assortment), best_assortment)
-    else:
-      restricted_products = best_assortment
-
-  assortments: List[Set[int]] = []
-  search(
-      assortments=assortments,
-      product_num=product_num,
-      next_product_id=1,
-      assortment=set(),
-      card_limit=card_limit,  # type: ignore
-      restricted_products=restricted_products)
-  # Sort assortments according to reward value
-  sorted_assort = sorted([(reward.calc(assortment), assortment)
-                          for assortment in assortments],
-                         key=lambda x: x[0])
+    return parametric_search_best_assortment(reward=reward,
+                                             card_limit=card_limit)
+
+  # Assortments with the maximum reward found so far
+  best_reward = -np.inf
+  best_assortments: List[Set[int]] = []
+  assortment_iter = iter_assortments(product_num=product_num,
+                                     card_limit=card_limit)
+  while True:
+    # Score assortments batch by batch
+    batch = list(itertools.islice(assortment_iter, 4096))
+    if not batch:
+      break
+    rewards = reward.calc_batch(incidence_matrix(batch, product_num))
+    max_reward = float(np.max(rewards))
+    if max_reward < best_reward:
+      continue
+    if max_reward > best_reward:
+      best_reward, best_assortments = max_reward, []
+    best_assortments.extend([
+        set(batch[ind].tolist())
+        for ind in np.flatnonzero(rewards == max_reward)
+    ])
   # Randomly select one assortment with the maximum reward
-  ind = len(sorted_assort) - 1
-  while (ind > 0 and sorted_assort[ind - 1][0] == sorted_assort[ind][0]):
-    ind -= 1
-  return sorted_assort[np.random.randint(ind, len(sorted_assort))]
+  return (best_reward,
+          best_assortments[int(np.random.randint(0, len(best_assortments)))])
+
+
+def _mean_reward_local_search(reward: MeanReward, in_assortment: np.ndarray,
+                              card_limit: int) -> Tuple[float, Set[int]]:
+  """Local search assortment with the maximum mean reward
+
+  The sum of the preference parameters and the revenue-weighted sum of the
+  current assortment are maintained so that the reward of a neighbor differing
+  in one product is computed in constant time. All the neighbors are evaluated
+  at once.
+
+  Args:
+    reward: mean reward definition
+    in_assortment: 0/1 indicator of products in the initial assortment
+    card_limit: cardinality constraint
+
+  Returns:
+    local best assortment with its reward
+  """
+  preference_params = np.asarray(reward.preference_params, dtype=float)
+  weights = preference_params * np.asarray(reward.revenues, dtype=float)
+  in_assortment = np.array(in_assortment, dtype=bool)
+
+  preference_params_sum = preference_params[0] + np.sum(
+      preference_params[in_assortment])
+  weighted_sum = np.sum(weights[in_assortment])
+  best_reward = weighted_sum / preference_params_sum
+
+  while True:
+    products = np.flatnonzero(in_assortment)
+    remaining_products = np.flatnonzero(~in_assortment[1:]) + 1
+
+    # Best neighbor in the form of (reward, product to remove, product to add)
+    # where product 0 means no product
+    neighbors = []
+    if len(products) > 1:
+      # Remove one product
+      rewards = (weighted_sum - weights[products]) / (
+          preference_params_sum - preference_params[products])
+      ind = int(np.argmax(rewards))
+      neighbors.append((rewards[ind], products[ind], 0))
+    if len(remaining_products) > 0 and len(products) < card_limit:
+      # Add one product
+      rewards = (weighted_sum + weights[remaining_products]) / (
+          preference_params_sum + preference_params[remaining_products])
+      ind = int(np.argmax(rewards))
+      neighbors.append((rewards[ind], 0, remaining_products[ind]))
+    if len(remaining_products) > 0:
+      # Replace one product
+      rewards = (weighted_sum - weights[products][:, np.newaxis] +
+                 weights[remaining_products]) / (
+                     preference_params_sum -
+                     preference_params[products][:, np.newaxis] +
+                     preference_params[remaining_products])
+      (row, column) = divmod(int(np.argmax(rewards)), rewards.shape[1])
+      neighbors.append(
+          (rewards[row, column], products[row], remaining_products[column]))
+
+    if not neighbors:
+      break
+    local_best_reward, product_to_remove, product_to_add = max(
+        neighbors, key=lambda x: x[0])
+    # Tolerate rounding errors of the maintained sums
+    if local_best_reward <= best_reward + 1e-12:
+      break
+
+    best_reward = local_best_reward
+    if product_to_remove:
+      in_assortment[product_to_remove] = False
+      preference_params_sum -= preference_params[product_to_remove]
+      weighted_sum -= weights[product_to_remove]
+    if product_to_add:
+      in_assortment[product_to_add] = True
+      preference_params_sum += preference_params[product_to_add]
+      weighted_sum += weights[product_to_add]
+
+  best_assortment = set(np.flatnonzero(in_assortment).tolist())
+  return (reward.calc(best_assortment), best_assortment)
+
+
+class AssortmentCache:
+  """Memoized search of the assortment with the maximum reward
+
+  Results of :func:`search_best_assortment` are kept in a least recently used
+  cache keyed on the type of the reward, the preference parameters rounded to
+  `decimals` decimal places, the revenues and the cardinality constraint. Hence
+  an assortment found for preference parameters close enough to the current
+  ones may be returned.
+
+  Before looking up the cache, the assortment returned last time is checked
+  for optimality under the current preference parameters when the reward is
+  :class:`MeanReward`, which takes :math:`O(N)` time.
+
+  :param int max_size: maximum number of assortments cached
+  :param int decimals: number of decimal places the preference parameters are
+    rounded to
+  """
+  def __init__(self, max_size: int = 1024, decimals: int = 3):
+    if max_size < 1:
+      raise ValueError('Maximum cache size is expected at least 1. Got %d.' %
+                       max_size)
+    self.__max_size = max_size
+    self.__decimals = decimals
+    self.__cache: OrderedDict = OrderedDict()
+    self.__last_assortment: Optional[Set[int]] = None
+    self.__hits = 0
+
+  @property
+  def hits(self) -> int:
+    """Number of searches skipped so far"""
+    return self.__hits
+
+  def __key(self, reward: Reward, card_limit: int) -> Hashable:
+    """
+    Args:
+      reward: reward definition
+      card_limit: cardinality constraint
+
+    Returns:
+      cache key of the search
+    """
+    return (type(reward).__name__,
+            reward.alpha if isinstance(reward, CvarReward) else None,
+            card_limit,
+            np.round(np.asarray(reward.preference_params, dtype=float),
+                     self.__decimals).tobytes(),
+            np.asarray(reward.revenues, dtype=float).tobytes())
+
+  def __is_optimal(self, reward: Reward, card_limit: int,
+                   assortment: Set[int]) -> bool:
+    """
+    Args:
+      reward: reward definition
+      card_limit: cardinality constraint
+      assortment: assortment to check
+
+    Returns:
+      whether the assortment is known to have the maximum reward
+    """
+    if not isinstance(reward, MeanReward) or len(assortment) > card_limit:
+      return False
+    # No assortment has mean reward greater than the threshold if and only if
+    # the maximum of the sum of v_i * (r_i - threshold) is at most
+    # v_0 * threshold.
+    threshold = reward.calc(assortment)
+    preference_params = np.asarray(reward.preference_params, dtype=float)
+    scores = preference_params[1:] * (
+        np.asarray(reward.revenues[1:], dtype=float) - threshold)
+    scores = scores[scores > 0]
+    if len(scores) > card_limit:
+      scores = np.partition(scores, len(scores) - card_limit)[-card_limit:]
+    return np.sum(scores) <= preference_params[0] * threshold + 1e-12
+
+  def search(
+      self,
+      reward: Reward,
+      card_limit: int = np.inf  # type: ignore
+  ) -> Tuple[float, Set[int]]:
+    """Search assortment with the maximum reward
+
+    Args:
+      reward: reward definition
+      card_limit: cardinality constraint
+
+    Returns:
+      assortment with the maximum reward
+    """
+    if self.__last_assortment is not None and self.__is_optimal(
+        reward, card_limit, self.__last_assortment):
+      self.__hits += 1
+      return (reward.calc(self.__last_assortment), set(self.__last_assortment))
+
+    key = self.__key(reward, card_limit)
+    if key in self.__cache:
+      self.__hits += 1
+      self.__cache.move_to_end(key)
+      assortment = self.__cache[key]
+    else:
+      _, assortment = search_best_assortment(reward=reward,
+                                             card_limit=card_limit)
+      self.__cache[key] = assortment
+      if len(self.__cache) > self.__max_size:
+        self.__cache.popitem(last=False)
+    self.__last_assortment = assortment
+    return (reward.calc(assortment), set(assortment))
 
 
 def local_search_best_assortment(
@@ -222,12 +607,14 @@ def local_search_best_assortment(
     init_assortment: Set[int] = None) -> Tuple[float, Set[int]]:
   """Local search assortment with the maximum reward
 
+  Neighbors of an assortment are the assortments obtained by adding, removing
+  or replacing one product. When the reward is :class:`MeanReward`, all the
+  neighbors are evaluated incrementally and `random_neighbors` is ignored.
+  Otherwise, `random_neighbors` neighbors are sampled and evaluated at once.
+
   .. warning::
     This method does not guarantee to output the best assortment.
 
-  .. todo::
-    Implement this function with `cppyy`.
-
   Args:
     reward: reward definition
     random_neighbors: number of random neighbors to look up
@@ -243,64 +630,125 @@ def local_search_best_assortment(
 
   product_num = len(reward.revenues) - 1
 
-  # All available products
-  all_products = set(range(1, product_num + 1))
+  # 0/1 indicator of products in the current assortment
+  in_assortment = np.zeros(product_num + 1, dtype=bool)
   if init_assortment is None:
     # Randomly generate an assortment initially
-    best_assortment = set(
-        np.random.choice(list(all_products), card_limit, replace=False))
-    best_reward = reward.calc(best_assortment)
+    in_assortment[np.random.choice(np.arange(1, product_num + 1),
+                                   card_limit,
+                                   replace=False)] = True
   else:
-    best_assortment = set(init_assortment)
-    best_reward = reward.calc(best_assortment)
-  remaining_products = all_products - best_assortment
+    in_assortment[list(init_assortment)] = True
+
+  if isinstance(reward, MeanReward):
+    return _mean_reward_local_search(reward=reward,
+                                     in_assortment=in_assortment,
+                                     card_limit=card_limit)
 
+  best_reward = float(reward.calc_batch(in_assortment[np.newaxis])[0])
+  rows = np.arange(random_neighbors)
   while True:
+    products = np.flatnonzero(in_assortment)
+    remaining_products = np.flatnonzero(~in_assortment[1:]) + 1
+
     available_operations = []
     if len(remaining_products) > 0:
       available_operations.append('replace')
-    if len(best_assortment) > 1:
+    if len(products) > 1:
       available_operations.append('remove')
-    if len(remaining_products) > 0 and len(best_assortment) < card_limit:
+    if len(remaining_products) > 0 and len(products) < card_limit:
       available_operations.append('add')
+    if not available_operations:
+      break
 
-    local_best_assortment = set()
-    local_best_reward = 0.0
-    for _ in range(random_neighbors):
-      # pylint: disable=no-member
-      operation = np.random.choice(available_operations)
-
-      if operation == 'replace':
-        # Replace one product
-        product_to_remove = np.random.choice(list(best_assortment))
-        product_to_add = np.random.choice(list(remaining_products))
-        new_assortment = set(best_assortment)
-        new_assortment.remove(product_to_remove)
-        new_assortment.add(product_to_add)
-        new_reward = reward.calc(new_assortment)
-      elif operation == 'remove':
-        # Remove one product
-        product_to_remove = np.random.choice(list(best_assortment))
-        new_assortment = set(best_assortment)
-        new_assortment.remove(product_to_remove)
-        new_reward = reward.calc(new_assortment)
-      else:
-        # operation = 'add'
-        # Add one product
-        product_to_add = np.random.choice(list(remaining_products))
-        new_assortment = set(best_assortment)
-        new_assortment.add(product_to_add)
-        new_reward = reward.calc(new_assortment)
-
-      if new_reward > local_best_reward:
-        local_best_assortment = new_assortment
-        local_best_reward = new_reward
-
-    if local_best_reward > best_reward:
-      best_assortment = local_best_assortment
-      best_reward = local_best_reward
-      remaining_products = all_products - best_assortment
+    # Sample all the neighbors at once
+    operations = np.random.choice(available_operations, random_neighbors)
+    neighbors = np.tile(in_assortment, (random_neighbors, 1))
+    removals = rows[operations != 'add']
+    neighbors[removals, np.random.choice(products, len(removals))] = False
+    additions = rows[operations != 'remove']
+    neighbors[additions,
+              np.random.choice(remaining_products, len(additions))] = True
+
+    new_rewards = reward.calc_batch(neighbors)
+    ind = int(np.argmax(new_rewards))
+    if new_rewards[ind] > best_reward:
+      in_assortment = neighbors[ind]
+      best_reward = float(new_rewards[ind])
     else:
       break
 
-  return (best_reward, best_assortment)
+  return (best_reward, set(np.flatnonzero(in_assortment).tolist()))
+
+
+def multi_start_local_search_best_assortment(
+    reward: Reward,
+    random_neighbors: int,
+    card_limit: int,
+    restarts: int = 8,
+    init_assortment: Set[int] = None,
+    time_limit: float = np.inf,
+    threads: int = 1) -> Tuple[float, Set[int]]:
+  """Local search assortment with the maximum reward from multiple starts
+
+  Local search is started from `init_assortment` (if it is given) and from
+  randomly generated assortments. The best of the local best assortments is
+  returned. Restarts not started before `time_limit` expires are skipped while
+  the first one always runs.
+
+  .. warning::
+    This method does not guarantee to output the best assortment.
+
+  .. note::
+    When `threads` is greater than 1 and the reward is not
+    :class:`MeanReward`, the random neighbors looked up by different restarts
+    are drawn from the shared random number generator in a nondeterministic
+    order.
+
+  Args:
+    reward: reward definition
+    random_neighbors: number of random neighbors to look up
+    card_limit: cardinality constraint
+    restarts: number of starts
+    init_assortment: initial assortment of the first start
+    time_limit: wall-clock time budget in seconds
+    threads: number of threads running local search simultaneously
+
+  Returns:
+    local best assortment with its reward
+  """
+  if restarts < 1:
+    raise ValueError('Number of restarts is expected at least 1. Got %d.' %
+                     restarts)
+  if threads < 1:
+    raise ValueError('Number of threads is expected at least 1. Got %d.' %
+                     threads)
+  product_num = len(reward.revenues) - 1
+  deadline = time.time() + time_limit
+
+  # Generate all the initial assortments beforehand for reproducibility
+  init_assortments = [] if init_assortment is None else [set(init_assortment)]
+  while len(init_assortments) < restarts:
+    init_assortments.append(
+        set(
+            np.random.choice(np.arange(1, product_num + 1),
+                             min(card_limit, product_num),
+                             replace=False).tolist()))
+
+  def local_search(start: int) -> Optional[Tuple[float, Set[int]]]:
+    if start > 0 and time.time() > deadline:
+      return None
+    return local_search_best_assortment(
+        reward=reward,
+        random_neighbors=random_neighbors,
+        card_limit=card_limit,
+        init_assortment=init_assortments[start])
+
+  if threads == 1:
+    results = [local_search(start) for start in range(restarts)]
+  else:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+      results = list(executor.map(local_search, range(restarts)))
+  # Select the first of the best results
+  return max([result for result in results if result is not None],
+             key=lambda x: x[0])
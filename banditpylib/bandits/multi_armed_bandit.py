@@ -1,13 +1,16 @@
 from typing import List
 
+import numpy as np
+
 from banditpylib.arms import StochasticArm
 from banditpylib.data_pb2 import Context, Actions, Feedback, ArmPull, \
     ArmFeedback
-from banditpylib.learners import Goal, IdentifyBestArm, MaximizeTotalRewards
-from .utils import Bandit
+from banditpylib.learners import Goal, IdentifyBestArm, MaximizeTotalRewards, \
+    PlainActions, PlainFeedback
+from .utils import Bandit, PlainBandit
 
 
-class MultiArmedBandit(Bandit):
+class MultiArmedBandit(Bandit, PlainBandit):
   r"""Multi-armed bandit
 
   Arms are indexed from 0 by default. Each pull of arm :math:`i` will generate
@@ -36,34 +39,41 @@ class MultiArmedBandit(Bandit):
   def context(self) -> Context:
     return Context()
 
-  def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
+  def __pull(self, arm_id: int, pulls: int) -> np.ndarray:
     """Pull one arm
 
     Args:
-      arm_pull: arm id and its pulls
+      arm_id: arm to pull
+      pulls: number of times to pull
 
     Returns:
-      arm_feedback: arm id and its empirical rewards
+      empirical rewards
     """
-    arm_id = arm_pull.arm.id
-    pulls = arm_pull.times
-
     if arm_id not in range(self.__arm_num):
       raise ValueError('Arm id is expected in the range [0, %d). Got %d.' %
                        (self.__arm_num, arm_id))
 
-    arm_feedback = ArmFeedback()
-
     # Empirical rewards when `arm_id is pulled for `pulls` times
     em_rewards = self.__arms[arm_id].pull(pulls=pulls)
 
     self.__regret += (
-        self.__best_arm.mean * pulls - sum(em_rewards)  # type: ignore
+        self.__best_arm.mean * pulls - np.sum(em_rewards)  # type: ignore
     )
+    return em_rewards  # type: ignore
 
-    arm_feedback.arm.id = arm_id
-    arm_feedback.rewards.extend(list(em_rewards))  # type: ignore
+  def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
+    """Pull one arm
 
+    Args:
+      arm_pull: arm id and its pulls
+
+    Returns:
+      arm_feedback: arm id and its empirical rewards
+    """
+    arm_feedback = ArmFeedback()
+    arm_feedback.arm.id = arm_pull.arm.id
+    arm_feedback.rewards.extend(
+        list(self.__pull(arm_pull.arm.id, arm_pull.times)))
     return arm_feedback
 
   def feed(self, actions: Actions) -> Feedback:
@@ -74,9 +84,56 @@ class MultiArmedBandit(Bandit):
         feedback.arm_feedbacks.append(arm_feedback)
     return feedback
 
+  def plain_feed(self, actions: PlainActions) -> PlainFeedback:
+    return [(arm_id, self.__pull(arm_id, pulls)) for (arm_id, pulls) in actions
+            if pulls > 0]
+
   def reset(self):
     self.__regret = 0.0
 
+  def vectorized_reset(self, trials: int):
+    """Reset the bandit environment for independent trials simulated at once
+
+    Args:
+      trials: number of trials
+
+    .. warning::
+      This function should be called before the start of the vectorized game.
+    """
+    self.__vectorized_regret = np.zeros(trials)
+
+  def vectorized_feed(self, arm_ids: np.ndarray) -> np.ndarray:
+    """Pull one arm in each of the independent trials
+
+    Args:
+      arm_ids: arm pulled in each trial
+
+    Returns:
+      empirical reward obtained in each trial
+    """
+    if len(arm_ids) != len(self.__vectorized_regret):
+      raise ValueError('Number of arms pulled is expected %d. Got %d.' %
+                       (len(self.__vectorized_regret), len(arm_ids)))
+    if arm_ids.min() < 0 or arm_ids.max() >= self.__arm_num:
+      raise ValueError('Arm id is expected in the range [0, %d). Got %d.' %
+                       (self.__arm_num,
+                        arm_ids.min() if arm_ids.min() < 0 else arm_ids.max()))
+
+    em_rewards = np.zeros(len(arm_ids))
+    # Pull each arm once for all the trials which select it
+    for arm_id in np.unique(arm_ids):
+      pulled = arm_ids == arm_id
+      em_rewards[pulled] = self.__arms[arm_id].pull(pulls=int(np.sum(pulled)))
+
+    self.__vectorized_regret += self.__best_arm.mean - em_rewards
+    return em_rewards
+
+  @property
+  def vectorized_regret(self) -> np.ndarray:
+    """Regret of the learner in each of the independent trials when the goal is
+    to maximize the total rewards"""
+    return self.__vectorized_regret
+
   @property
   def arm_num(self) -> int:
     """Total number of arms"""
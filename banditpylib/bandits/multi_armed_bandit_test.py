@@ -1,5 +1,7 @@
 import google.protobuf.text_format as text_format
 
+import numpy as np
+
 from banditpylib.arms import BernoulliArm
 from banditpylib.data_pb2 import Arm, Actions
 from banditpylib.learners import MaximizeTotalRewards, IdentifyBestArm
@@ -28,3 +30,25 @@ class TestOrdinaryBandit:
     arm = Arm()
     arm.id = 1
     assert ordinary_bandit.regret(IdentifyBestArm(best_arm=arm)) == 0
+
+  def test_plain_run(self):
+    means = [0, 1]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = MultiArmedBandit(arms)
+    ordinary_bandit.reset()
+    # Pull arm 0 for 100 times and skip arm 1
+    feedback = ordinary_bandit.plain_feed([(0, 100), (1, 0)])
+    assert len(feedback) == 1
+    assert feedback[0][0] == 0
+    assert len(feedback[0][1]) == 100
+    assert ordinary_bandit.regret(MaximizeTotalRewards()) == 100
+
+  def test_vectorized_run(self):
+    means = [0, 1]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = MultiArmedBandit(arms)
+    ordinary_bandit.vectorized_reset(3)
+    # Pull arm 0 in the first two trials and arm 1 in the last trial
+    em_rewards = ordinary_bandit.vectorized_feed(np.array([0, 0, 1]))
+    assert list(em_rewards) == [0, 0, 1]
+    assert list(ordinary_bandit.vectorized_regret) == [1, 1, 0]
@@ -1,14 +1,16 @@
 from typing import List
 
+import numpy as np
+
 from banditpylib.arms import StochasticArm
 from banditpylib.data_pb2 import Context, Actions, Feedback, ArmPull, \
     ArmFeedback
 from banditpylib.learners import Goal, MaximizeCorrectAnswers, \
-    MakeAllAnswersCorrect
-from .utils import Bandit
+    MakeAllAnswersCorrect, PlainActions, PlainFeedback
+from .utils import Bandit, PlainBandit
 
 
-class ThresholdingBandit(Bandit):
+class ThresholdingBandit(Bandit, PlainBandit):
   r"""Thresholding bandit environment
 
   Arms are indexed from 0 by default. Each time the learner pulls arm :math:`i`,
@@ -61,32 +63,39 @@ class ThresholdingBandit(Bandit):
     """Total number of arms"""
     return self.__arm_num
 
-  def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
+  def __pull(self, arm_id: int, pulls: int) -> np.ndarray:
     """Pull one arm
 
     Args:
-      arm_pull: arm and its pulls
+      arm_id: arm to pull
+      pulls: number of times to pull
 
     Returns:
-      arm_feedback: arm and its feedback
+      empirical rewards
     """
-    arm_id = arm_pull.arm.id
-    pulls = arm_pull.times
-
     if arm_id not in range(self.__arm_num):
       raise Exception('Arm id %d is out of range [0, %d)!' % \
           (arm_id, self.__arm_num))
 
-    arm_feedback = ArmFeedback()
-    if pulls < 1:
-      return arm_feedback
-
     # Empirical rewards when `arm_id` is pulled for `pulls` times
-    em_rewards = self.__arms[arm_id].pull(pulls=pulls)
+    return self.__arms[arm_id].pull(pulls=pulls)  # type: ignore
+
+  def _take_action(self, arm_pull: ArmPull) -> ArmFeedback:
+    """Pull one arm
 
-    arm_feedback.arm.id = arm_id
-    arm_feedback.rewards.extend(list(em_rewards))  # type: ignore
+    Args:
+      arm_pull: arm and its pulls
+
+    Returns:
+      arm_feedback: arm and its feedback
+    """
+    arm_feedback = ArmFeedback()
+    if arm_pull.times < 1:
+      return arm_feedback
 
+    arm_feedback.arm.id = arm_pull.arm.id
+    arm_feedback.rewards.extend(
+        list(self.__pull(arm_pull.arm.id, arm_pull.times)))
     return arm_feedback
 
   def feed(self, actions: Actions) -> Feedback:
@@ -97,6 +106,10 @@ class ThresholdingBandit(Bandit):
         feedback.arm_feedbacks.append(arm_feedback)
     return feedback
 
+  def plain_feed(self, actions: PlainActions) -> PlainFeedback:
+    return [(arm_id, self.__pull(arm_id, pulls)) for (arm_id, pulls) in actions
+            if pulls > 0]
+
   @property
   def context(self) -> Context:
     return Context()
@@ -106,15 +119,15 @@ class ThresholdingBandit(Bandit):
       # Aggregate regret which is equal to the number of wrong answers
       agg_regret = 0
       for arm_id in range(self.__arm_num):
-        agg_regret += (goal.answers[arm_id] !=
-                       self.__correct_answers[arm_id]) * self.__weights[arm_id]
+        agg_regret += (goal.answers[arm_id] != self.__correct_answers[arm_id]
+                       ) * self.__weights[arm_id]
       return agg_regret
     elif isinstance(goal, MakeAllAnswersCorrect):
       # Simple regret which is 1 when there is at least one wrong answer and 0
       # otherwise
       for arm_id in range(self.__arm_num):
-        if (goal.answers[arm_id] !=
-            self.__correct_answers[arm_id]) and self.__weights[arm_id] == 1:
+        if (goal.answers[arm_id]
+            != self.__correct_answers[arm_id]) and self.__weights[arm_id] == 1:
           return 1
       return 0
     raise Exception('Goal %s is not supported.' % goal.name)
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
+
+import numpy as np
 
 from banditpylib.data_pb2 import Context, Actions, Feedback
-from banditpylib.learners import Goal
+from banditpylib.learners import Goal, PlainActions, PlainFeedback
 
 
 class Bandit(ABC):
@@ -43,3 +46,46 @@ class Bandit(ABC):
     Returns:
       regret of the learner
     """
+
+
+class PlainBandit(ABC):
+  """Abstract class for bandit environments able to interact with the learner
+  without protobuf messages
+
+  This is expected to be implemented only by bandit environments whose context
+  carries no information. See :class:`banditpylib.learners.PlainLearner`.
+  """
+  @abstractmethod
+  def plain_feed(self, actions: PlainActions) -> PlainFeedback:
+    """
+    Args:
+      actions: arms to pull and their numbers of pulls
+
+    Returns:
+      arms pulled and their empirical rewards. Arms with no pulls are skipped.
+    """
+
+
+class EpisodicBandit(ABC):
+  """Abstract class for bandit environments able to serve an assortment to
+  customers episode by episode
+
+  An episode serves the same assortment until a customer purchases nothing. See
+  :class:`banditpylib.learners.EpisodicLearner`.
+  """
+  @abstractmethod
+  def serve_episode(
+      self,
+      assortment: Iterable[int],
+      max_customers: int = np.inf  # type: ignore
+  ) -> np.ndarray:
+    """Serve one assortment until a customer purchases nothing
+
+    Args:
+      assortment: assortment to serve
+      max_customers: maximum number of customers to serve
+
+    Returns:
+      choices of the customers. The last one is 0 unless the episode is cut
+      off by `max_customers`.
+    """
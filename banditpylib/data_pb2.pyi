@@ -208,8 +208,14 @@ class Trial(google.protobuf.message.Message):
     BANDIT_FIELD_NUMBER: builtins.int
     LEARNER_FIELD_NUMBER: builtins.int
     RESULTS_FIELD_NUMBER: builtins.int
+    SEED_FIELD_NUMBER: builtins.int
+    BLOCK_INDEX_FIELD_NUMBER: builtins.int
+    BLOCK_SIZE_FIELD_NUMBER: builtins.int
     bandit: typing.Text = ...
     learner: typing.Text = ...
+    seed: builtins.int = ...
+    block_index: builtins.int = ...
+    block_size: builtins.int = ...
 
     @property
     def results(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Result]: ...
@@ -219,6 +225,9 @@ class Trial(google.protobuf.message.Message):
         bandit : typing.Text = ...,
         learner : typing.Text = ...,
         results : typing.Optional[typing.Iterable[global___Result]] = ...,
+        seed : builtins.int = ...,
+        block_index : builtins.int = ...,
+        block_size : builtins.int = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"bandit",b"bandit",u"learner",b"learner",u"results",b"results"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"bandit",b"bandit",u"block_index",b"block_index",u"block_size",b"block_size",u"learner",b"learner",u"results",b"results",u"seed",b"seed"]) -> None: ...
 global___Trial = Trial
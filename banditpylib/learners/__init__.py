@@ -3,6 +3,7 @@ from .utils import *
 __all__ = [
     'Goal', 'IdentifyBestArm', 'MaximizeTotalRewards',
     'MaximizeCorrectAnswers', 'MakeAllAnswersCorrect', 'Learner',
-    'SinglePlayerLearner', 'CollaborativeLearner', 'CollaborativeAgent',
+    'SinglePlayerLearner', 'PlainLearner', 'PlainActions', 'PlainFeedback',
+    'EpisodicLearner', 'CollaborativeLearner', 'CollaborativeAgent',
     'CollaborativeMaster'
 ]
@@ -1,4 +1,5 @@
+from .feature_index import *
 from .linucb import *
 from .utils import *
 
-__all__ = ['LinearBanditLearner', 'LinUCB']
+__all__ = ['LinearBanditLearner', 'LinUCB', 'ClusteredFeatureIndex']
@@ -0,0 +1,37 @@
+import numpy as np
+
+from .feature_index import ClusteredFeatureIndex
+
+
+class TestClusteredFeatureIndex:
+  """Test clustered feature index"""
+  def test_argmax(self):
+    features = np.random.normal(size=(500, 4))
+    index = ClusteredFeatureIndex(features, clusters=20, max_probes=None)
+    assert index.arm_num == 500
+    assert index.clusters == 20
+    for _ in range(10):
+      theta = np.random.normal(size=(4, 1))
+      A = np.random.normal(size=(4, 4))
+      Vt_inv = np.linalg.inv(A @ A.T + np.eye(4))
+      root_beta = np.random.random() * 3
+      ucb = features @ theta.reshape(-1) + root_beta * np.sqrt(
+          np.einsum('ij,jk,ik->i', features, Vt_inv, features))
+      assert index.argmax(theta, Vt_inv, root_beta) == np.argmax(ucb)
+
+  def test_max_probes(self):
+    features = np.random.normal(size=(200, 3))
+    index = ClusteredFeatureIndex(features, clusters=10, max_probes=1)
+    theta = np.random.normal(size=3)
+    arm_id = index.argmax(theta, np.eye(3), 0.0)
+    # The arm found is the best one in the most promising cluster
+    # pylint: disable=protected-access
+    centers = index._ClusteredFeatureIndex__centers
+    radii = index._ClusteredFeatureIndex__radii
+    offsets = index._ClusteredFeatureIndex__offsets
+    upper_bounds = centers @ theta + radii * np.linalg.norm(theta)
+    upper_bounds[offsets[1:] == offsets[:-1]] = -np.inf
+    cluster = np.argmax(upper_bounds)
+    members = index._ClusteredFeatureIndex__arm_ids[
+        offsets[cluster]:offsets[cluster + 1]]
+    assert arm_id == members[np.argmax(features[members] @ theta)]
@@ -1,26 +1,46 @@
-from typing import Optional, List
+from typing import Dict, Optional, List, Union
 
 import numpy as np
 
-from banditpylib.data_pb2 import Context, Actions, Feedback
+from banditpylib.learners import PlainActions, PlainFeedback
+from banditpylib.utils import MemmapPicklable
+from .feature_index import ClusteredFeatureIndex
 from .utils import LinearBanditLearner
 
 
-class LinUCB(LinearBanditLearner):
+class LinUCB(LinearBanditLearner, MemmapPicklable):
   r"""Linear Upper Confidence Bound policy
 
   .. todo::
     Add algorithm description.
 
-  :param List[np.ndarray] features: feature vector of each arm in a list
+  :param Union[List[np.ndarray], np.ndarray] features: feature vector of each
+    arm in a list or stacked in an array of shape (arms, dimension). An array is
+    used without being copied and a read-only `np.memmap` is mapped again
+    instead of copied when the learner is copied or sent to other processes.
   :param float delta: delta
   :param float lambda_reg: lambda for regularization
+  :param int batch_size: number of arms pulled during each round. Arms in a
+    batch are selected one by one, pretending that the previously selected
+    ones have been pulled, i.e., their confidence intervals are shrunk while
+    the estimate of theta is not updated until the feedback arrives.
+  :param Optional[ClusteredFeatureIndex] feature_index: index built over the
+    same features to search the arm with the maximum optimistic estimate
+    instead of scanning all the arms, which is recommended when there are a
+    large number of arms, e.g., millions
+  :param int refresh_interval: number of updates after which the inverse of V
+    matrix and the widths of the confidence intervals are recomputed from
+    scratch. They are otherwise updated incrementally, which accumulates
+    rounding errors over long horizons.
   :param Optional[str] name: alias name
   """
   def __init__(self,
-               features: List[np.ndarray],
+               features: Union[List[np.ndarray], np.ndarray],
                delta: float,
                lambda_reg: float,
+               batch_size: int = 1,
+               feature_index: Optional[ClusteredFeatureIndex] = None,
+               refresh_interval: int = 4096,
                name: Optional[str] = None):
     super().__init__(arm_num=len(features), name=name)
     if delta <= 0 or delta >= 1:
@@ -30,15 +50,29 @@ class LinUCB(LinearBanditLearner):
       raise ValueError('lambda_reg is expected greater than 0. Got %.2f.' %
                        lambda_reg)
 
+    if batch_size < 1:
+      raise ValueError('Batch size is expected at least 1. Got %d.' %
+                       batch_size)
+
+    if refresh_interval < 1:
+      raise ValueError('Refresh interval is expected at least 1. Got %d.' %
+                       refresh_interval)
+
     self.__delta = delta
+    self.__refresh_interval = refresh_interval
+    self.__batch_size = batch_size
     self.__lambda_reg = lambda_reg
-    self.__d = len(features[0])  # d: length of each feature
-    self.__k = len(features)  # arm_nums
-
-    # feature_matrix: d x k matrix of features stacked
-    self.__feature_matrix = np.zeros((self.__d, self.__k))
-    for i, feature in enumerate(features):
-      self.__feature_matrix[:, i] = feature.reshape(-1)
+    # feature_matrix: k x d matrix of features stacked
+    self.__feature_matrix = features if isinstance(
+        features, np.ndarray) else np.array(
+            [feature.reshape(-1) for feature in features])
+    self.__d = self.__feature_matrix.shape[1]  # d: length of each feature
+    self.__k = self.__feature_matrix.shape[0]  # arm_nums
+
+    if feature_index is not None and feature_index.arm_num != self.__k:
+      raise ValueError('Number of arms in the index is expected %d. Got %d.' %
+                       (self.__k, feature_index.arm_num))
+    self.__feature_index = feature_index
 
   def _name(self) -> str:
     return 'linucb'
@@ -46,54 +80,126 @@ class LinUCB(LinearBanditLearner):
   def reset(self):
     self.__summation_AtXt = np.zeros(
         (self.__d, 1))  # summation_AtXt: accumulated sum of At * Xt, d x 1
-    self.__Vt = self.__lambda_reg * np.eye(
-        self.__d)  #Vt: V matrix at time t, d x d
+    # Vt: V matrix at time t, d x d
+    self.__Vt = np.eye(self.__d) * self.__lambda_reg
+    # Vt_inv: inverse of V matrix at time t, d x d
+    self.__Vt_inv = np.eye(self.__d) / self.__lambda_reg
     self.__theta_hat_t = np.random.normal(
         0, size=(self.__d,
                  1))  # theta_hat_t: the learners estimate of theta, d x 1
+    # widths: squared norm of each feature under Vt_inv, i.e., diagonal of
+    # feature_matrix @ Vt_inv @ feature_matrix.T, where Vt_inv is a multiple of
+    # identity matrix initially. They are not maintained when the index is
+    # used since updating them costs as much as scanning all the arms.
+    self.__widths = None if self.__feature_index is not None else np.einsum(
+        'ij,ij->i', self.__feature_matrix,
+        self.__feature_matrix) / self.__lambda_reg
 
     # Current time step
     self.__time = 1
 
-  def __LinUCB(self) -> np.ndarray:
-    """Optimistic estimate of arms' real means
-
+  def __root_beta(self) -> float:
+    """
     Returns:
-      optimistic estimate of arms' real means
+      coefficient of the widths of the confidence intervals
     """
-    root_beta_t = np.sqrt(
+    return np.sqrt(
         self.__lambda_reg) + np.sqrt(2 * np.log(1 / self.__delta) + self.__d *
                                      np.log(1 + (self.__time - 1) /
                                             (self.__lambda_reg * self.__d)))
-    ucb = self.__feature_matrix.T @ self.__theta_hat_t + root_beta_t *\
-        np.sqrt((self.__feature_matrix.T @ np.linalg.pinv(self.__Vt) @
-                 self.__feature_matrix).diagonal()).reshape(-1, 1)
-    return ucb
-
-  def actions(self, context: Context) -> Actions:
-    del context
 
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-
-    ucb = self.__LinUCB()
-    arm_pull.arm.id = int(np.argmax(ucb, axis=0))
+  def __LinUCB(self, widths: Optional[np.ndarray] = None) -> np.ndarray:
+    """Optimistic estimate of arms' real means
 
-    arm_pull.times = 1
-    return actions
+    Args:
+      widths: squared widths of the confidence intervals to use instead of the
+        current ones
 
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
+    Returns:
+      optimistic estimate of arms' real means
+    """
+    if widths is None:
+      widths = self.__widths
+    if widths is None:
+      widths = np.einsum('ij,jk,ik->i', self.__feature_matrix, self.__Vt_inv,
+                         self.__feature_matrix)
+    ucb = (self.__feature_matrix @ self.__theta_hat_t).reshape(-1) + \
+        self.__root_beta() * np.sqrt(np.maximum(widths, 0))
+    return ucb
 
-    pulled_arm_index = arm_feedback.arm.id
+  def __argmax(self, Vt_inv: np.ndarray, widths: Optional[np.ndarray]) -> int:
+    """
+    Args:
+      Vt_inv: inverse of V matrix
+      widths: squared widths of the confidence intervals
 
-    # Xt: reward observed at t
-    Xt = np.array(arm_feedback.rewards)
+    Returns:
+      arm with the maximum optimistic estimate
+    """
+    if self.__feature_index is not None:
+      return self.__feature_index.argmax(self.__theta_hat_t, Vt_inv,
+                                         self.__root_beta())
+    return int(np.argmax(self.__LinUCB(widths)))
+
+  def __add_feature(self, Vt_inv: np.ndarray, widths: Optional[np.ndarray],
+                    arm_id: int):
+    """Update the inverse of V matrix with Sherman-Morrison formula and the
+    squared widths in place after the feature of an arm is added
+
+    Args:
+      Vt_inv: inverse of V matrix
+      widths: squared widths of the confidence intervals which are not updated
+        if it is `None`
+      arm_id: arm whose feature is added
+    """
     # At: feature of arm played at t
-    At = self.__feature_matrix[:, pulled_arm_index].reshape(-1, 1)
-
-    self.__Vt += (At @ At.T)
-    self.__summation_AtXt += At * Xt
-    self.__theta_hat_t = np.linalg.pinv(self.__Vt) @ self.__summation_AtXt
-
-    self.__time += 1
+    At = np.asarray(self.__feature_matrix[arm_id], dtype=float).reshape(-1, 1)
+    Vt_inv_At = Vt_inv @ At
+    denominator = 1 + (At.T @ Vt_inv_At).item()
+    Vt_inv -= (Vt_inv_At @ Vt_inv_At.T) / denominator
+    if widths is None:
+      return
+    # The width of each arm decreases by the square of its inner product with
+    # Vt_inv_At
+    widths -= (self.__feature_matrix @ Vt_inv_At).reshape(-1)**2 / \
+        denominator
+
+  def __refresh(self):
+    """Recompute the inverse of V matrix and the squared widths from scratch
+    to discard the rounding errors of the incremental updates"""
+    Vt_inv = np.linalg.inv(self.__Vt)
+    self.__Vt_inv = (Vt_inv + Vt_inv.T) / 2
+    if self.__widths is not None:
+      self.__widths = np.einsum('ij,ij->i',
+                                self.__feature_matrix @ self.__Vt_inv,
+                                self.__feature_matrix)
+
+  def plain_actions(self) -> PlainActions:
+    if self.__batch_size == 1:
+      return [(self.__argmax(self.__Vt_inv, self.__widths), 1)]
+
+    # Pretend the selected arms are pulled to shrink their confidence intervals
+    # while the estimate of theta stays the same
+    Vt_inv = np.copy(self.__Vt_inv)
+    widths = None if self.__widths is None else np.copy(self.__widths)
+    pulls: Dict[int, int] = dict()
+    for _ in range(self.__batch_size):
+      arm_id = self.__argmax(Vt_inv, widths)
+      pulls[arm_id] = pulls.get(arm_id, 0) + 1
+      self.__add_feature(Vt_inv, widths, arm_id)
+    return list(pulls.items())
+
+  def plain_update(self, feedback: PlainFeedback):
+    for (arm_id, rewards) in feedback:
+      for reward in rewards:
+        # At: feature of arm played at t
+        At = np.asarray(self.__feature_matrix[arm_id],
+                        dtype=float).reshape(-1, 1)
+        self.__Vt += At @ At.T
+        self.__add_feature(self.__Vt_inv, self.__widths, arm_id)
+        # Xt: reward observed at t
+        self.__summation_AtXt += At * reward
+        self.__time += 1
+        if (self.__time - 1) % self.__refresh_interval == 0:
+          self.__refresh()
+    self.__theta_hat_t = self.__Vt_inv @ self.__summation_AtXt
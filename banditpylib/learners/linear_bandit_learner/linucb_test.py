@@ -3,8 +3,10 @@ from unittest.mock import MagicMock
 import google.protobuf.text_format as text_format
 
 import numpy as np
+import pytest
 
 from banditpylib.data_pb2 import Context, Actions, Feedback
+from .feature_index import ClusteredFeatureIndex
 from .linucb import LinUCB
 
 
@@ -48,3 +50,99 @@ class TestLinUCB:
               rewards: 0
             >
             """, Feedback()))
+
+  def test_incremental_update(self):
+    features = [np.random.random(3) for _ in range(6)]
+    delta, lambda_reg = 0.1, 0.5
+    learner = LinUCB(features, delta, lambda_reg)
+    learner.reset()
+
+    Vt = lambda_reg * np.eye(3)
+    summation_AtXt = np.zeros(3)
+    for time in range(1, 21):
+      arm_id = np.random.randint(6)
+      reward = np.random.random()
+      feedback = Feedback()
+      arm_feedback = feedback.arm_feedbacks.add()
+      arm_feedback.arm.id = arm_id
+      arm_feedback.rewards.append(reward)
+      learner.update(feedback)
+      Vt += np.outer(features[arm_id], features[arm_id])
+      summation_AtXt += features[arm_id] * reward
+
+    # Compute the optimistic estimates from scratch
+    feature_matrix = np.array(features).T
+    Vt_inv = np.linalg.inv(Vt)
+    root_beta_t = np.sqrt(lambda_reg) + np.sqrt(2 * np.log(1 / delta) +
+                                                3 * np.log(1 + time /
+                                                           (lambda_reg * 3)))
+    expected_ucb = feature_matrix.T @ Vt_inv @ summation_AtXt + \
+        root_beta_t * np.sqrt(
+            (feature_matrix.T @ Vt_inv @ feature_matrix).diagonal())
+    # pylint: disable=protected-access
+    np.testing.assert_allclose(learner._LinUCB__LinUCB(), expected_ucb)
+
+  def test_batch_run(self):
+    features = [np.array([1, 0]), np.array([0, 1]), np.array([1, 1])]
+    learner = LinUCB(features, 0.1, 1.0, batch_size=4)
+    learner.reset()
+    # Estimate of theta is 0 after zero rewards are observed
+    learner.plain_update([(2, np.zeros(1))])
+    actions = learner.plain_actions()
+    assert sum(pulls for (_, pulls) in actions) == 4
+    # Confidence intervals of selected arms shrink so that the batch is spread
+    assert len(actions) > 1
+    learner.plain_update([(arm_id, np.ones(pulls))
+                          for (arm_id, pulls) in actions])
+
+  def test_array_features(self):
+    features = np.random.random((6, 3))
+    list_learner = LinUCB(list(features), 0.1, 1.0)
+    array_learner = LinUCB(features, 0.1, 1.0)
+    for learner in [list_learner, array_learner]:
+      learner.reset()
+      learner.plain_update([(1, np.array([0.5])), (4, np.array([0.2, 0.3]))])
+    # pylint: disable=protected-access
+    np.testing.assert_allclose(list_learner._LinUCB__LinUCB(),
+                               array_learner._LinUCB__LinUCB())
+
+  def test_feature_index(self):
+    features = np.random.normal(size=(300, 3))
+    scan_learner = LinUCB(features, 0.1, 1.0, batch_size=3)
+    index_learner = LinUCB(features,
+                           0.1,
+                           1.0,
+                           batch_size=3,
+                           feature_index=ClusteredFeatureIndex(
+                               features, max_probes=None))
+    for learner in [scan_learner, index_learner]:
+      learner.reset()
+      learner.plain_update([(0, np.zeros(1))])
+    for _ in range(10):
+      actions = scan_learner.plain_actions()
+      assert index_learner.plain_actions() == actions
+      feedback = [(arm_id, np.random.random(pulls))
+                  for (arm_id, pulls) in actions]
+      scan_learner.plain_update(feedback)
+      index_learner.plain_update(feedback)
+
+  def test_refresh(self):
+    features = np.random.random((6, 3))
+    with pytest.raises(ValueError):
+      LinUCB(features, 0.1, 1.0, refresh_interval=0)
+    learner = LinUCB(features, 0.1, 1.0, refresh_interval=4)
+    learner.reset()
+    Vt = np.eye(3)
+    for _ in range(10):
+      arm_id = np.random.randint(6)
+      learner.plain_update([(arm_id, np.random.random(1))])
+      Vt += np.outer(features[arm_id], features[arm_id])
+    # pylint: disable=protected-access
+    Vt_inv = learner._LinUCB__Vt_inv
+    np.testing.assert_allclose(Vt_inv, np.linalg.inv(Vt))
+    np.testing.assert_allclose(learner._LinUCB__widths,
+                               (features @ Vt_inv @ features.T).diagonal())
+    # The inverse of V matrix is refreshed after the 12th update
+    learner.plain_update([(0, np.zeros(2))])
+    np.testing.assert_array_equal(learner._LinUCB__Vt_inv,
+                                  learner._LinUCB__Vt_inv.T)
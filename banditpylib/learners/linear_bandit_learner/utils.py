@@ -1,12 +1,20 @@
 from typing import Optional, Union, List
 
+import numpy as np
+
 from banditpylib.bandits import LinearBandit
-from banditpylib.learners import SinglePlayerLearner, MaximizeTotalRewards, Goal
+from banditpylib.data_pb2 import Context, Actions, Feedback
+from banditpylib.learners import SinglePlayerLearner, PlainLearner, \
+    MaximizeTotalRewards, Goal
 
 
-class LinearBanditLearner(SinglePlayerLearner):
+class LinearBanditLearner(SinglePlayerLearner, PlainLearner):
   """Abstract class for learners playing with linear bandit
 
+  Policies are defined by :func:`plain_actions` and :func:`plain_update`, and
+  :func:`actions` and :func:`update` only translate between protobuf messages
+  and plain tuples.
+
   :param int arm_num: number of arms
   :param Optional[str] name: alias name
   """
@@ -29,3 +37,17 @@ class LinearBanditLearner(SinglePlayerLearner):
   @property
   def goal(self) -> Goal:
     return MaximizeTotalRewards()
+
+  def actions(self, context: Context) -> Actions:
+    del context
+
+    actions = Actions()
+    for (arm_id, pulls) in self.plain_actions():
+      arm_pull = actions.arm_pulls.add()
+      arm_pull.arm.id = arm_id
+      arm_pull.times = pulls
+    return actions
+
+  def update(self, feedback: Feedback):
+    self.plain_update([(arm_feedback.arm.id, np.array(arm_feedback.rewards))
+                       for arm_feedback in feedback.arm_feedbacks])
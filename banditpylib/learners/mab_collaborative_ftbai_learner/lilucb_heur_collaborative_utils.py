@@ -5,8 +5,8 @@ import numpy as np
 
 from banditpylib.data_pb2 import Feedback, Actions, Context
 
-from banditpylib import argmax_or_min_tuple
-from banditpylib.arms import PseudoArm
+from banditpylib import argmax_or_min
+from banditpylib.arms import PseudoArmBank
 from banditpylib.learners.mab_fcbai_learner import MABFixedConfidenceBAILearner
 
 
@@ -41,7 +41,7 @@ class CentralizedLilUCBHeuristic(MABFixedConfidenceBAILearner):
   def reset(self):
     # create only as many local arms as num_assigned_arms
     # entire algo behaves as if there are just num_assigned_arms in the bandit
-    self.__pseudo_arms = [PseudoArm() for arm_id in self.__assigned_arms]
+    self.__pseudo_arms = PseudoArmBank(len(self.__assigned_arms))
     # Parameters suggested by the paper
     self.__beta = 0.5
     self.__a = 1 + 10 / len(self.__assigned_arms)
@@ -71,8 +71,9 @@ class CentralizedLilUCBHeuristic(MABFixedConfidenceBAILearner):
     Args:
       arm_id: index of the arm whose ucb has to be updated
     """
-    self.__ucb[arm_id] = self.__pseudo_arms[arm_id].em_mean +\
-      self.__confidence_radius(self.__pseudo_arms[arm_id].total_pulls)
+    total_pulls = self.__pseudo_arms.total_pulls[arm_id]
+    self.__ucb[arm_id] = self.__pseudo_arms.total_rewards[
+        arm_id] / total_pulls + self.__confidence_radius(total_pulls)
 
   def actions(self, context: Context = None) -> Actions:
     del context
@@ -89,10 +90,9 @@ class CentralizedLilUCBHeuristic(MABFixedConfidenceBAILearner):
     # self.__stage == 'main'
     actions = Actions()
 
-    for pseudo_arm in self.__pseudo_arms:
-      if pseudo_arm.total_pulls >= (
-          1 + self.__a * (self.__total_pulls - pseudo_arm.total_pulls)):
-        return actions
+    arm_pulls = self.__pseudo_arms.total_pulls
+    if np.any(arm_pulls >= 1 + self.__a * (self.__total_pulls - arm_pulls)):
+      return actions
 
     arm_pull = actions.arm_pulls.add()
 
@@ -107,8 +107,8 @@ class CentralizedLilUCBHeuristic(MABFixedConfidenceBAILearner):
       # reverse map from bandit index to local index
       pseudo_arm_index = np.where(
           self.__assigned_arms == arm_feedback.arm.id)[0][0]
-      self.__pseudo_arms[pseudo_arm_index].update(
-          np.array(arm_feedback.rewards))
+      self.__pseudo_arms.update(pseudo_arm_index,
+                                np.array(arm_feedback.rewards))
       self.__update_ucb(pseudo_arm_index)
       self.__total_pulls += len(arm_feedback.rewards)
 
@@ -118,10 +118,8 @@ class CentralizedLilUCBHeuristic(MABFixedConfidenceBAILearner):
   @property
   def best_arm(self) -> int:
     # map best arm local index to actual bandit index
-    return self.__assigned_arms[argmax_or_min_tuple([
-        (pseudo_arm.total_pulls, arm_id)
-        for (arm_id, pseudo_arm) in enumerate(self.__pseudo_arms)
-    ])]
+    return self.__assigned_arms[argmax_or_min(
+        self.__pseudo_arms.total_pulls.tolist())]
 
   def get_total_pulls(self) -> int:
     return self.__total_pulls
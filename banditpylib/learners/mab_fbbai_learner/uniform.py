@@ -3,7 +3,7 @@ from typing import Optional
 import numpy as np
 
 from banditpylib import argmax_or_min
-from banditpylib.arms import PseudoArm
+from banditpylib.arms import PseudoArmBank
 from banditpylib.data_pb2 import Context, Actions, Feedback
 from .utils import MABFixedBudgetBAILearner
 
@@ -25,7 +25,7 @@ class Uniform(MABFixedBudgetBAILearner):
     return 'uniform'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     self.__best_arm = None
     self.__stop = False
 
@@ -50,11 +50,10 @@ class Uniform(MABFixedBudgetBAILearner):
 
   def update(self, feedback: Feedback):
     for arm_feedback in feedback.arm_feedbacks:
-      self.__pseudo_arms[arm_feedback.arm.id].update(
-          np.array(arm_feedback.rewards))
+      self.__pseudo_arms.update(arm_feedback.arm.id,
+                                np.array(arm_feedback.rewards))
     if self.__stop:
-      self.__best_arm = argmax_or_min(
-          [arm.em_mean for arm in self.__pseudo_arms])
+      self.__best_arm = argmax_or_min(self.__pseudo_arms.em_mean.tolist())
 
   @property
   def best_arm(self) -> int:
@@ -3,8 +3,8 @@ from typing import Optional
 import math
 import numpy as np
 
-from banditpylib import argmax_or_min_tuple
-from banditpylib.arms import PseudoArm
+from banditpylib import argmax_or_min
+from banditpylib.arms import PseudoArmBank
 from banditpylib.data_pb2 import Context, Actions, Feedback
 from .utils import MABFixedConfidenceBAILearner
 
@@ -27,7 +27,7 @@ class LilUCBHeuristic(MABFixedConfidenceBAILearner):
     return 'lilUCB_heur'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     # Parameters suggested by the paper
     self.__beta = 0.5
     self.__a = 1 + 10 / self.arm_num
@@ -57,8 +57,9 @@ class LilUCBHeuristic(MABFixedConfidenceBAILearner):
     Args:
       arm_id: index of the arm whose ucb has to be updated
     """
-    self.__ucb[arm_id] = self.__pseudo_arms[arm_id].em_mean +\
-      self.__confidence_radius(self.__pseudo_arms[arm_id].total_pulls)
+    total_pulls = self.__pseudo_arms.total_pulls[arm_id]
+    self.__ucb[arm_id] = self.__pseudo_arms.total_rewards[
+        arm_id] / total_pulls + self.__confidence_radius(total_pulls)
 
   def actions(self, context: Context) -> Actions:
     if self.__stage == 'initialization':
@@ -72,10 +73,9 @@ class LilUCBHeuristic(MABFixedConfidenceBAILearner):
     # self.__stage == 'main'
     actions = Actions()
 
-    for pseudo_arm in self.__pseudo_arms:
-      if pseudo_arm.total_pulls >= (
-          1 + self.__a * (self.__total_pulls - pseudo_arm.total_pulls)):
-        return actions
+    arm_pulls = self.__pseudo_arms.total_pulls
+    if np.any(arm_pulls >= 1 + self.__a * (self.__total_pulls - arm_pulls)):
+      return actions
 
     arm_pull = actions.arm_pulls.add()
     arm_pull.arm.id = int(np.argmax(self.__ucb))
@@ -85,8 +85,8 @@ class LilUCBHeuristic(MABFixedConfidenceBAILearner):
 
   def update(self, feedback: Feedback):
     for arm_feedback in feedback.arm_feedbacks:
-      self.__pseudo_arms[arm_feedback.arm.id].update(
-          np.array(arm_feedback.rewards))
+      self.__pseudo_arms.update(arm_feedback.arm.id,
+                                np.array(arm_feedback.rewards))
       self.__update_ucb(arm_feedback.arm.id)
       self.__total_pulls += len(arm_feedback.rewards)
 
@@ -95,7 +95,4 @@ class LilUCBHeuristic(MABFixedConfidenceBAILearner):
 
   @property
   def best_arm(self) -> int:
-    return argmax_or_min_tuple([
-        (pseudo_arm.total_pulls, arm_id)
-        for (arm_id, pseudo_arm) in enumerate(self.__pseudo_arms)
-    ])
+    return argmax_or_min(self.__pseudo_arms.total_pulls.tolist())
@@ -26,6 +26,7 @@ from .explore_then_commit import *
 from .softmax import *
 
 __all__ = [
-    'MABLearner', 'EpsGreedy', 'UCB', 'ThompsonSampling', 'Uniform', 'UCBV',
-    'MOSS', 'EXP3', 'ExploreThenCommit', 'Softmax'
+    'MABLearner', 'VectorizedMABLearner', 'EpsGreedy', 'UCB',
+    'ThompsonSampling', 'Uniform', 'UCBV', 'MOSS', 'EXP3', 'ExploreThenCommit',
+    'Softmax'
 ]
@@ -2,12 +2,12 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
-from banditpylib.data_pb2 import Context, Actions, Feedback
-from .utils import MABLearner
+from banditpylib.arms import PseudoArmBank
+from banditpylib.learners import PlainActions, PlainFeedback
+from .utils import VectorizedMABLearner
 
 
-class EpsGreedy(MABLearner):
+class EpsGreedy(VectorizedMABLearner):
   r"""Epsilon-Greedy policy
 
   With probability :math:`\frac{\epsilon}{t}` do uniform sampling and with the
@@ -30,30 +30,34 @@ class EpsGreedy(MABLearner):
     return 'epsilon_greedy'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     # Current time step
     self.__time = 1
 
-  def actions(self, context: Context) -> Actions:
-    del context
+  def plain_actions(self) -> PlainActions:
+    if self.__time <= self.arm_num:
+      return [(self.__time - 1, 1)]
+    # With probability eps/t, randomly select an arm to pull
+    if np.random.random() <= self.__eps / self.__time:
+      return [(np.random.randint(0, self.arm_num), 1)]
+    return [(int(np.argmax(self.__pseudo_arms.em_mean)), 1)]
 
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
+  def vectorized_actions(self, time: int, total_pulls: np.ndarray,
+                         total_rewards: np.ndarray,
+                         sum_of_squares: np.ndarray) -> np.ndarray:
+    del sum_of_squares
 
-    if self.__time <= self.arm_num:
-      arm_pull.arm.id = self.__time - 1
+    trials = len(total_pulls)
+    if time <= self.arm_num:
+      return np.full(trials, time - 1)
+
+    arm_ids = np.argmax(total_rewards / total_pulls, axis=1)
     # With probability eps/t, randomly select an arm to pull
-    elif np.random.random() <= self.__eps / self.__time:
-      arm_pull.arm.id = np.random.randint(0, self.arm_num)
-    else:
-      arm_pull.arm.id = int(
-          np.argmax(np.array([arm.em_mean for arm in self.__pseudo_arms])))
-
-    arm_pull.times = 1
-    return actions
-
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+    explore = np.random.random(trials) <= self.__eps / time
+    arm_ids[explore] = np.random.randint(0, self.arm_num, int(np.sum(explore)))
+    return arm_ids
+
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    self.__pseudo_arms.update(arm_id, rewards)
     self.__time += 1
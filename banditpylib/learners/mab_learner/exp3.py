@@ -2,7 +2,7 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.data_pb2 import Context, Actions, Feedback
+from banditpylib.learners import PlainActions, PlainFeedback
 from .utils import MABLearner
 
 
@@ -48,22 +48,15 @@ class EXP3(MABLearner):
     # Current time step
     # self.__time = 1
 
-  def actions(self, context: Context) -> Actions:
-    del context
-
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
+  def plain_actions(self) -> PlainActions:
     self.__probabilities = (1 - self.__gamma) * self.__weights / sum(
         self.__weights) + self.__gamma / self.arm_num
-    arm_pull.arm.id = np.random.choice(self.arm_num, 1,
-                                       p=self.__probabilities)[0]
-    arm_pull.times = 1
-    return actions
+    arm_id = np.random.choice(self.arm_num, 1, p=self.__probabilities)[0]
+    return [(int(arm_id), 1)]
 
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    arm_id = arm_feedback.arm.id
-    reward = arm_feedback.rewards[0]
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    reward = rewards[0]
     estimated_mean = reward / self.__probabilities[arm_id]
     self.__weights[arm_id] *= np.exp(self.__gamma / self.arm_num *
                                      estimated_mean)
@@ -1,10 +1,8 @@
 from typing import Optional
 
-import numpy as np
-
-from banditpylib import argmax_or_min_tuple
-from banditpylib.arms import PseudoArm
-from banditpylib.data_pb2 import Context, Actions, Feedback
+from banditpylib import argmax_or_min
+from banditpylib.arms import PseudoArmBank
+from banditpylib.learners import PlainActions, PlainFeedback
 from .utils import MABLearner
 
 
@@ -31,31 +29,18 @@ class ExploreThenCommit(MABLearner):
     return 'explore_then_commit'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     # Current time step
     self.__time = 1
 
-  def actions(self, context: Context) -> Actions:
-    del context
-
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-
+  def plain_actions(self) -> PlainActions:
     if self.__time <= self.__T_prime:
-      arm_pull.arm.id = (self.__time - 1) % self.arm_num
-    else:
-      arm_pull.arm.id = self.__best_arm
-
-    arm_pull.times = 1
-    return actions
+      return [((self.__time - 1) % self.arm_num, 1)]
+    return [(self.__best_arm, 1)]
 
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    self.__pseudo_arms.update(arm_id, rewards)
     self.__time += 1
     if self.__best_arm < 0 and self.__time > self.__T_prime:
-      self.__best_arm = argmax_or_min_tuple([
-          (self.__pseudo_arms[arm_id].em_mean, arm_id)
-          for arm_id in range(self.arm_num)
-      ])
+      self.__best_arm = argmax_or_min(self.__pseudo_arms.em_mean.tolist())
@@ -2,12 +2,13 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
-from banditpylib.data_pb2 import Context, Actions, Feedback
-from .utils import MABLearner
+from banditpylib import LazyArgmax
+from banditpylib.arms import PseudoArmBank
+from banditpylib.learners import PlainActions, PlainFeedback
+from .utils import VectorizedMABLearner
 
 
-class MOSS(MABLearner):
+class MOSS(VectorizedMABLearner):
   r"""MOSS policy :cite:`audibert2009minimax`
 
   At time :math:`t`, play arm
@@ -18,57 +19,80 @@ class MOSS(MABLearner):
 
   :param int arm_num: number of arms
   :param int horizon: total number of time steps
+  :param bool use_lazy_index: whether to maintain the upper confidence bounds
+    in a heap so that each action only evaluates the bounds of a few arms
   :param Optional[str] name: alias name
 
   .. note::
     MOSS uses time horizon in its confidence interval. Reward has to be bounded
     in [0, 1].
   """
-  def __init__(self, arm_num: int, horizon: int, name: Optional[str] = None):
+  def __init__(self,
+               arm_num: int,
+               horizon: int,
+               use_lazy_index: bool = False,
+               name: Optional[str] = None):
     super().__init__(arm_num=arm_num, name=name)
     if horizon < arm_num:
       raise Exception('Horizon is expected at least %d. Got %d.' %
                       (arm_num, horizon))
     self.__horizon = horizon
+    self.__use_lazy_index = use_lazy_index
 
   def _name(self) -> str:
     return 'moss'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
+    # The bound of an arm only changes when the arm is pulled
+    self.__lazy_index = LazyArgmax(
+        self.__MOSS, self.arm_num,
+        time_dependent=False) if self.__use_lazy_index else None
     # Current time step
     self.__time = 1
 
-  def __MOSS(self) -> np.ndarray:
+  def __MOSS(self,
+             arm_ids: Optional[np.ndarray] = None,
+             time: Optional[int] = None) -> np.ndarray:
     """
+    Args:
+      arm_ids: arms to evaluate. All the arms are evaluated if it is `None`.
+      time: time step which is not used by the bound
+
     Returns:
       optimistic estimate of arms' real means
     """
-    moss = np.array([
-        arm.em_mean + np.sqrt(
-            np.maximum(
-                0, np.log(self.__horizon /
-                          (self.arm_num * arm.total_pulls))) / arm.total_pulls)
-        for arm in self.__pseudo_arms
-    ])
-    return moss
-
-  def actions(self, context: Context) -> Actions:
-    del context
-
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-
+    del time
+    if arm_ids is None:
+      arm_ids = np.arange(self.arm_num)
+    total_pulls = self.__pseudo_arms.total_pulls[arm_ids]
+    return self.__pseudo_arms.total_rewards[arm_ids] / total_pulls + np.sqrt(
+        np.maximum(0, np.log(self.__horizon /
+                             (self.arm_num * total_pulls))) / total_pulls)
+
+  def plain_actions(self) -> PlainActions:
     if self.__time <= self.arm_num:
-      arm_pull.arm.id = self.__time - 1
-    else:
-      arm_pull.arm.id = int(np.argmax(self.__MOSS()))
-
-    arm_pull.times = 1
-    return actions
-
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+      return [(self.__time - 1, 1)]
+    if self.__lazy_index is not None:
+      return [(self.__lazy_index.argmax(self.__time), 1)]
+    return [(int(np.argmax(self.__MOSS())), 1)]
+
+  def vectorized_actions(self, time: int, total_pulls: np.ndarray,
+                         total_rewards: np.ndarray,
+                         sum_of_squares: np.ndarray) -> np.ndarray:
+    del sum_of_squares
+
+    if time <= self.arm_num:
+      return np.full(len(total_pulls), time - 1)
+
+    moss = total_rewards / total_pulls + np.sqrt(
+        np.maximum(0, np.log(self.__horizon /
+                             (self.arm_num * total_pulls))) / total_pulls)
+    return np.argmax(moss, axis=1)
+
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    self.__pseudo_arms.update(arm_id, rewards)
+    if self.__lazy_index is not None:
+      self.__lazy_index.refresh(arm_id)
     self.__time += 1
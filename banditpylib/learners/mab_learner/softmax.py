@@ -1,15 +1,13 @@
 from typing import Optional
 
-import math
-
 import numpy as np
 
-from banditpylib.arms import PseudoArm
-from banditpylib.data_pb2 import Context, Actions, Feedback
-from .utils import MABLearner
+from banditpylib.arms import PseudoArmBank
+from banditpylib.learners import PlainActions, PlainFeedback
+from .utils import VectorizedMABLearner
 
 
-class Softmax(MABLearner):
+class Softmax(VectorizedMABLearner):
   r"""Softmax policy
 
   At time :math:`t`, sample arm :math:`i` to play with sampling weight
@@ -42,31 +40,39 @@ class Softmax(MABLearner):
     return 'softmax'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     # Current time step
     self.__time = 1
 
-  def actions(self, context: Context) -> Actions:
-    del context
-
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-
+  def plain_actions(self) -> PlainActions:
     if self.__time <= self.arm_num:
-      arm_pull.arm.id = self.__time - 1
-    else:
-      weights = np.array([
-          math.exp(self.__pseudo_arms[arm_id].em_mean / self.__gamma)
-          for arm_id in range(self.arm_num)
-      ])
-      arm_pull.arm.id = np.random.choice(
-          self.arm_num, 1, p=[weight / sum(weights) for weight in weights])[0]
-
-    arm_pull.times = 1
-    return actions
-
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+      return [(self.__time - 1, 1)]
+
+    weights = np.exp(self.__pseudo_arms.em_mean / self.__gamma)
+    arm_id = np.random.choice(self.arm_num, 1, p=weights / np.sum(weights))[0]
+    return [(int(arm_id), 1)]
+
+  def vectorized_actions(self, time: int, total_pulls: np.ndarray,
+                         total_rewards: np.ndarray,
+                         sum_of_squares: np.ndarray) -> np.ndarray:
+    del sum_of_squares
+
+    trials = len(total_pulls)
+    if time <= self.arm_num:
+      return np.full(trials, time - 1)
+
+    em_means = total_rewards / total_pulls
+    # Subtract the maximum to avoid overflow, which does not change the
+    # sampling probabilities
+    weights = np.exp(
+        (em_means - np.max(em_means, axis=1, keepdims=True)) / self.__gamma)
+    cumulative_probs = np.cumsum(weights, axis=1) / np.sum(
+        weights, axis=1, keepdims=True)
+    # Inverse transform sampling for each trial
+    arm_ids = np.sum(cumulative_probs < np.random.random((trials, 1)), axis=1)
+    return np.minimum(arm_ids, self.arm_num - 1)
+
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    self.__pseudo_arms.update(arm_id, rewards)
     self.__time += 1
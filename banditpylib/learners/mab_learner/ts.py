@@ -2,12 +2,12 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
-from banditpylib.data_pb2 import Context, Actions, Feedback
-from .utils import MABLearner
+from banditpylib.arms import PseudoArmBank
+from banditpylib.learners import PlainActions, PlainFeedback
+from .utils import VectorizedMABLearner
 
 
-class ThompsonSampling(MABLearner):
+class ThompsonSampling(VectorizedMABLearner):
   r"""Thompson Sampling policy :cite:`agrawal2017near`
 
   Assume a prior distribution for every arm. At time :math:`t`, sample a
@@ -35,7 +35,7 @@ class ThompsonSampling(MABLearner):
     return 'thompson_sampling'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     # Current time step
     # self.__time = 1
 
@@ -45,12 +45,9 @@ class ThompsonSampling(MABLearner):
       arm to pull using beta prior
     """
     # The average reward of each arm has a uniform prior Beta(1, 1)
-    virtual_means = np.zeros(self.arm_num)
-    for arm_id in range(self.arm_num):
-      a = 1 + self.__pseudo_arms[arm_id].total_rewards
-      b = 1 + self.__pseudo_arms[arm_id].total_pulls - self.__pseudo_arms[
-          arm_id].total_rewards
-      virtual_means[arm_id] = np.random.beta(a, b)
+    total_rewards = self.__pseudo_arms.total_rewards
+    virtual_means = np.random.beta(
+        1 + total_rewards, 1 + self.__pseudo_arms.total_pulls - total_rewards)
     return int(np.argmax(virtual_means))
 
   def __sample_from_gaussian_prior(self) -> int:
@@ -59,26 +56,31 @@ class ThompsonSampling(MABLearner):
       arm to pull using gaussian prior
     """
     # The average reward of each arm has a Gaussian prior Normal(0, 1)
-    virtual_means = np.zeros(self.arm_num)
-    for arm_id in range(self.arm_num):
-      mu = self.__pseudo_arms[arm_id].total_rewards / (
-          self.__pseudo_arms[arm_id].total_pulls + 1)
-      sigma = 1.0 / (self.__pseudo_arms[arm_id].total_pulls + 1)
-      virtual_means[arm_id] = np.random.normal(mu, sigma)
+    total_pulls = self.__pseudo_arms.total_pulls
+    virtual_means = np.random.normal(
+        self.__pseudo_arms.total_rewards / (total_pulls + 1),
+        1.0 / (total_pulls + 1))
     return int(np.argmax(virtual_means))
 
-  def actions(self, context: Context) -> Actions:
-    del context
-
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-    arm_pull.arm.id = self.__sample_from_beta_prior(
+  def plain_actions(self) -> PlainActions:
+    arm_id = self.__sample_from_beta_prior(
     ) if self.__prior_dist == 'beta' else self.__sample_from_gaussian_prior()
-    arm_pull.times = 1
-    return actions
+    return [(arm_id, 1)]
+
+  def vectorized_actions(self, time: int, total_pulls: np.ndarray,
+                         total_rewards: np.ndarray,
+                         sum_of_squares: np.ndarray) -> np.ndarray:
+    del time, sum_of_squares
+
+    if self.__prior_dist == 'beta':
+      virtual_means = np.random.beta(1 + total_rewards,
+                                     1 + total_pulls - total_rewards)
+    else:
+      virtual_means = np.random.normal(total_rewards / (total_pulls + 1),
+                                       1.0 / (total_pulls + 1))
+    return np.argmax(virtual_means, axis=1)
 
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    self.__pseudo_arms.update(arm_id, rewards)
     # self.__time += 1
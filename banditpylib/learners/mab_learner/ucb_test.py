@@ -63,3 +63,20 @@ class TestUCB:
           rewards: 0
         >
         """, Feedback()))
+
+  def test_lazy_index(self):
+    arm_num = 20
+    horizon = 1000
+    np.random.seed(0)
+    means = np.random.random(arm_num)
+    learner = UCB(arm_num=arm_num)
+    lazy_learner = UCB(arm_num=arm_num, use_lazy_index=True)
+    learner.reset()
+    lazy_learner.reset()
+    # Both learners are expected to pull the same arms
+    for _ in range(horizon):
+      arm_id, pulls = learner.plain_actions()[0]
+      assert lazy_learner.plain_actions() == [(arm_id, pulls)]
+      rewards = np.random.normal(means[arm_id], 1, pulls)
+      learner.plain_update([(arm_id, rewards)])
+      lazy_learner.plain_update([(arm_id, rewards)])
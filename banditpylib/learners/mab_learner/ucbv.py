@@ -2,12 +2,13 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
-from banditpylib.data_pb2 import Context, Actions, Feedback
-from .utils import MABLearner
+from banditpylib import LazyArgmax
+from banditpylib.arms import PseudoArmBank
+from banditpylib.learners import PlainActions, PlainFeedback
+from .utils import VectorizedMABLearner
 
 
-class UCBV(MABLearner):
+class UCBV(VectorizedMABLearner):
   r"""UCBV policy :cite:`audibert2009exploration`
 
   At time :math:`t`, play arm
@@ -19,54 +20,80 @@ class UCBV(MABLearner):
 
   :param int arm_num: number of arms
   :param float b: upper bound of rewards
+  :param bool use_lazy_index: whether to maintain the upper confidence bounds
+    in a lazily updated heap so that each action only evaluates the bounds of a
+    few arms
   :param Optional[str] name: alias name
 
   .. note::
     Reward has to be bounded within :math:`[0, b]`.
   """
-  def __init__(self, arm_num: int, b: float = 1.0, name: Optional[str] = None):
+  def __init__(self,
+               arm_num: int,
+               b: float = 1.0,
+               use_lazy_index: bool = False,
+               name: Optional[str] = None):
     super().__init__(arm_num=arm_num, name=name)
     if b <= 0:
       raise ValueError('B is expected greater than 0. Got %.2f.' % b)
     self.__b = b
+    self.__use_lazy_index = use_lazy_index
 
   def _name(self) -> str:
     return 'ucbv'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
+    self.__lazy_index = LazyArgmax(
+        self.__UCBV, self.arm_num) if self.__use_lazy_index else None
     # Current time step
     self.__time = 1
 
-  def __UCBV(self) -> np.ndarray:
+  def __UCBV(self,
+             arm_ids: Optional[np.ndarray] = None,
+             time: Optional[int] = None) -> np.ndarray:
     """
+    Args:
+      arm_ids: arms to evaluate. All the arms are evaluated if it is `None`.
+      time: time step. Current time step is used if it is `None`.
+
     Returns:
       optimistic estimate of arms' real means using empirical variance
     """
-    ucbv = np.array([
-        arm.em_mean +
-        np.sqrt(2 * arm.em_var * np.log(self.__time) / arm.total_pulls) +
-        self.__b * np.log(self.__time) / arm.total_pulls
-        for arm in self.__pseudo_arms
-    ])
-    return ucbv
-
-  def actions(self, context: Context) -> Actions:
-    del context
-
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-
+    if arm_ids is None:
+      arm_ids = np.arange(self.arm_num)
+    if time is None:
+      time = self.__time
+    total_pulls = self.__pseudo_arms.total_pulls[arm_ids]
+    em_mean = self.__pseudo_arms.total_rewards[arm_ids] / total_pulls
+    em_var = np.maximum(
+        self.__pseudo_arms.sum_of_squares[arm_ids] / total_pulls - em_mean**2,
+        0)
+    return em_mean + np.sqrt(2 * em_var * np.log(time) / total_pulls) + \
+        self.__b * np.log(time) / total_pulls
+
+  def plain_actions(self) -> PlainActions:
     if self.__time <= self.arm_num:
-      arm_pull.arm.id = self.__time - 1
-    else:
-      arm_pull.arm.id = int(np.argmax(self.__UCBV()))
-
-    arm_pull.times = 1
-    return actions
-
-  def update(self, feedback: Feedback):
-    arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+      return [(self.__time - 1, 1)]
+    if self.__lazy_index is not None:
+      return [(self.__lazy_index.argmax(self.__time), 1)]
+    return [(int(np.argmax(self.__UCBV())), 1)]
+
+  def vectorized_actions(self, time: int, total_pulls: np.ndarray,
+                         total_rewards: np.ndarray,
+                         sum_of_squares: np.ndarray) -> np.ndarray:
+    if time <= self.arm_num:
+      return np.full(len(total_pulls), time - 1)
+
+    em_mean = total_rewards / total_pulls
+    em_var = np.maximum(sum_of_squares / total_pulls - em_mean**2, 0)
+    ucbv = em_mean + np.sqrt(2 * em_var * np.log(time) / total_pulls) + \
+        self.__b * np.log(time) / total_pulls
+    return np.argmax(ucbv, axis=1)
+
+  def plain_update(self, feedback: PlainFeedback):
+    arm_id, rewards = feedback[0]
+    self.__pseudo_arms.update(arm_id, rewards)
+    if self.__lazy_index is not None:
+      self.__lazy_index.refresh(arm_id)
     self.__time += 1
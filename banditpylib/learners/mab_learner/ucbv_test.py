@@ -63,3 +63,19 @@ class TestUCBV:
           rewards: 0
         >
         """, Feedback()))
+
+  def test_vectorized_actions(self):
+    # Empirical variances of arms with constant rewards are 0 but may be
+    # computed slightly negative due to rounding
+    feedback = [(0, np.ones(4)), (1, np.full(5, 0.7)), (2, np.zeros(3))]
+    learner = UCBV(arm_num=3)
+    learner.reset()
+    for arm_feedback in feedback:
+      learner.plain_update([arm_feedback])
+    total_pulls = np.array([[len(rewards) for (_, rewards) in feedback]])
+    total_rewards = np.array([[np.sum(rewards) for (_, rewards) in feedback]])
+    sum_of_squares = np.array(
+        [[np.sum(rewards**2) for (_, rewards) in feedback]])
+    assert learner.vectorized_actions(
+        len(feedback) + 1, total_pulls, total_rewards,
+        sum_of_squares).tolist() == [learner.plain_actions()[0][0]] == [0]
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from banditpylib.data_pb2 import Context, Actions, Feedback
+from banditpylib.learners import PlainActions, PlainFeedback
 from .utils import MABLearner
 
 
@@ -22,14 +22,9 @@ class Uniform(MABLearner):
     # Current time step
     self.__time = 1
 
-  def actions(self, context: Context) -> Actions:
-    del context
+  def plain_actions(self) -> PlainActions:
+    return [((self.__time - 1) % self.arm_num, 1)]
 
-    actions = Actions()
-    arm_pull = actions.arm_pulls.add()
-    arm_pull.arm.id = (self.__time - 1) % self.arm_num
-    arm_pull.times = 1
-    return actions
-
-  def update(self, feedback: Feedback):
+  def plain_update(self, feedback: PlainFeedback):
+    del feedback
     self.__time += 1
@@ -1,13 +1,22 @@
+from abc import abstractmethod
+
 from typing import Optional, List, Union
 
+import numpy as np
+
 from banditpylib.bandits import MultiArmedBandit, LinearBandit
-from banditpylib.learners import SinglePlayerLearner, Goal, MaximizeTotalRewards
+from banditpylib.data_pb2 import Context, Actions, Feedback
+from banditpylib.learners import SinglePlayerLearner, PlainLearner, Goal, \
+    MaximizeTotalRewards
 
 
-class MABLearner(SinglePlayerLearner):
+class MABLearner(SinglePlayerLearner, PlainLearner):
   """Abstract class for learners playing with the ordinary multi-armed bandit
 
-  This type of learners aim to maximize the total collected rewards.
+  This type of learners aim to maximize the total collected rewards. Policies
+  are defined by :func:`plain_actions` and :func:`plain_update`, and
+  :func:`actions` and :func:`update` only translate between protobuf messages
+  and plain tuples.
 
   :param int arm_num: number of arms
   :param Optional[str] name: alias name
@@ -31,3 +40,52 @@ class MABLearner(SinglePlayerLearner):
   @property
   def goal(self) -> Goal:
     return MaximizeTotalRewards()
+
+  def actions(self, context: Context) -> Actions:
+    del context
+
+    actions = Actions()
+    for (arm_id, pulls) in self.plain_actions():
+      arm_pull = actions.arm_pulls.add()
+      arm_pull.arm.id = arm_id
+      arm_pull.times = pulls
+    return actions
+
+  def update(self, feedback: Feedback):
+    self.plain_update([(arm_feedback.arm.id, np.array(arm_feedback.rewards))
+                       for arm_feedback in feedback.arm_feedbacks])
+
+
+class VectorizedMABLearner(MABLearner):
+  """Abstract class for learners which can be simulated for many independent
+  trials at once
+
+  This type of learners pull exactly one arm at each time step and make
+  decisions only based on the current time step and the empirical information
+  of the arms. See :class:`banditpylib.protocols.VectorizedSinglePlayerProtocol`
+  for the details.
+
+  :param int arm_num: number of arms
+  :param Optional[str] name: alias name
+  """
+  def __init__(self, arm_num: int, name: Optional[str]):
+    super().__init__(arm_num=arm_num, name=name)
+
+  @abstractmethod
+  def vectorized_actions(self, time: int, total_pulls: np.ndarray,
+                         total_rewards: np.ndarray,
+                         sum_of_squares: np.ndarray) -> np.ndarray:
+    """Actions of the learner in many independent trials
+
+    Args:
+      time: current time step, which is shared by all the trials
+      total_pulls: total number of pulls of each arm in each trial with shape
+        (trials, arms)
+      total_rewards: total rewards of each arm in each trial with shape (trials,
+        arms)
+      sum_of_squares: sum of squared rewards of each arm in each trial with
+        shape (trials, arms)
+
+    Returns:
+      arm to pull in each trial
+    """
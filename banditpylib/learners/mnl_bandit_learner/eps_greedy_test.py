@@ -5,7 +5,7 @@ import google.protobuf.text_format as text_format
 import numpy as np
 
 from banditpylib.bandits import MeanReward
-from banditpylib.data_pb2 import Actions, Context
+from banditpylib.data_pb2 import Actions, Context, Feedback
 from .eps_greedy import EpsGreedy
 
 
@@ -45,3 +45,32 @@ class TestEpsGreedy:
         times: 1
       }
       """, Actions()).SerializeToString()
+
+  def test_serve_random_assortment_until_non_purchase(self):
+    revenues = np.array([0, 0.45, 0.8, 0.9, 1.0])
+    reward = MeanReward()
+    learner = EpsGreedy(revenues=revenues, reward=reward)
+    learner.reset()
+    mock_random_assortment = {2, 3, 4}
+    # pylint: disable=protected-access
+    learner._EpsGreedy__select_ramdom_assort = MagicMock(
+        return_value=mock_random_assortment)
+    actions = learner.actions(Context())
+    learner.update(
+        text_format.Parse(
+            """
+      arm_feedbacks {
+        arm {
+          set {
+            id: 2
+            id: 3
+            id: 4
+          }
+        }
+        rewards: 0.8
+        customer_feedbacks: 2
+      }
+      """, Feedback()))
+    # The random assortment is served again after a purchase
+    assert learner.actions(
+        Context()).SerializeToString() == actions.SerializeToString()
@@ -1,10 +1,9 @@
-from typing import Optional
+from typing import Optional, Set
 
 from absl import logging
 import numpy as np
 
-from banditpylib.bandits import search_best_assortment, Reward, \
-    local_search_best_assortment
+from banditpylib.bandits import Reward
 from banditpylib.data_pb2 import Context, Actions, Feedback
 from .utils import MNLBanditLearner
 
@@ -20,6 +19,14 @@ class ThompsonSampling(MNLBanditLearner):
     best assortment
   :param int random_neighbors: number of random neighbors to look up if local
     search is enabled
+  :param int local_search_restarts: number of starts of local search if local
+    search is enabled
+  :param float local_search_time_limit: wall-clock time budget in seconds of
+    local search with multiple starts
+  :param int local_search_threads: number of threads running the starts of
+    local search in parallel
+  :param int assortment_cache_size: maximum number of assortments cached when
+    searching the best assortment (0 disables the cache)
   :param Optional[str] name: alias name
   """
   def __init__(
@@ -30,13 +37,21 @@ class ThompsonSampling(MNLBanditLearner):
       card_limit: int = np.inf,  # type: ignore
       use_local_search: bool = False,
       random_neighbors: int = 10,
+      local_search_restarts: int = 1,
+      local_search_time_limit: float = np.inf,
+      local_search_threads: int = 1,
+      assortment_cache_size: int = 0,
       name: Optional[str] = None):
     super().__init__(revenues=revenues,
                      reward=reward,
                      card_limit=card_limit,
                      use_local_search=use_local_search,
                      random_neighbors=random_neighbors,
-                     name=name)
+                     name=name,
+                     local_search_restarts=local_search_restarts,
+                     local_search_time_limit=local_search_time_limit,
+                     local_search_threads=local_search_threads,
+                     assortment_cache_size=assortment_cache_size)
     if horizon < self.product_num:
       logging.warning('Horizon %d is less than number of products %d!' % \
           (horizon, self.product_num))
@@ -137,14 +152,10 @@ class ThompsonSampling(MNLBanditLearner):
           init_assortment = set(self.__last_actions.arm_pulls[0].arm.set.id)
         else:
           init_assortment = None
-        _, best_assortment = local_search_best_assortment(
-            reward=self.reward,
-            random_neighbors=self.random_neighbors,
-            card_limit=self.card_limit,
+        best_assortment = self._local_search_best_assortment(
             init_assortment=init_assortment)
       else:
-        _, best_assortment = search_best_assortment(reward=self.reward,
-                                                    card_limit=self.card_limit)
+        best_assortment = self._search_best_assortment()
 
       arm_pull.arm.set.id.extend(list(best_assortment))
       arm_pull.times = 1
@@ -170,3 +181,15 @@ class ThompsonSampling(MNLBanditLearner):
       # self.__episode += 1
     self.__last_customer_feedback = arm_feedback.customer_feedbacks[0]
     # self.__time += 1
+
+  def update_episode(self, assortment: Set[int], choices: np.ndarray):
+    np.add.at(self.__customer_choices, choices, 1)
+    # No purchase is observed
+    if choices[-1] == 0:
+      self.__serving_episodes[list(assortment)] += 1
+      # Check if it is the end of initial warm start stage
+      if not self.__done_warm_start and \
+          self.__next_product_in_warm_start > self.product_num:
+        self.__done_warm_start = True
+        self.__last_actions = None
+    self.__last_customer_feedback = int(choices[-1])
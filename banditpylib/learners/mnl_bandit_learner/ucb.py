@@ -1,9 +1,8 @@
-from typing import Optional
+from typing import Optional, Set
 
 import numpy as np
 
-from banditpylib.bandits import search_best_assortment, Reward, \
-    local_search_best_assortment
+from banditpylib.bandits import Reward
 from banditpylib.data_pb2 import Context, Actions, Feedback
 from .utils import MNLBanditLearner
 
@@ -18,6 +17,14 @@ class UCB(MNLBanditLearner):
     best assortment
   :param int random_neighbors: number of random neighbors to look up if local
     search is enabled
+  :param int local_search_restarts: number of starts of local search if local
+    search is enabled
+  :param float local_search_time_limit: wall-clock time budget in seconds of
+    local search with multiple starts
+  :param int local_search_threads: number of threads running the starts of
+    local search in parallel
+  :param int assortment_cache_size: maximum number of assortments cached when
+    searching the best assortment (0 disables the cache)
   :param Optional[str] name: alias name
   """
   def __init__(
@@ -27,13 +34,21 @@ class UCB(MNLBanditLearner):
       card_limit: int = np.inf,  # type: ignore
       use_local_search: bool = False,
       random_neighbors: int = 10,
+      local_search_restarts: int = 1,
+      local_search_time_limit: float = np.inf,
+      local_search_threads: int = 1,
+      assortment_cache_size: int = 0,
       name: Optional[str] = None):
     super().__init__(revenues=revenues,
                      reward=reward,
                      card_limit=card_limit,
                      use_local_search=use_local_search,
                      random_neighbors=random_neighbors,
-                     name=name)
+                     name=name,
+                     local_search_restarts=local_search_restarts,
+                     local_search_time_limit=local_search_time_limit,
+                     local_search_threads=local_search_threads,
+                     assortment_cache_size=assortment_cache_size)
 
   def _name(self) -> str:
     """
@@ -86,15 +101,11 @@ class UCB(MNLBanditLearner):
     # Calculate assortment with the maximum reward using optimistic
     # preference parameters
     if self.use_local_search:
-      _, best_assortment = local_search_best_assortment(
-          reward=self.reward,
-          random_neighbors=self.random_neighbors,
-          card_limit=self.card_limit,
-          init_assortment=(set(self.__last_actions.arm_pulls[0].arm.set.id)
-                           if self.__last_actions else None))
+      best_assortment = self._local_search_best_assortment(
+          init_assortment=(set(self.__last_actions.arm_pulls[0].arm.set.id
+                               ) if self.__last_actions else None))
     else:
-      _, best_assortment = search_best_assortment(reward=self.reward,
-                                                  card_limit=self.card_limit)
+      best_assortment = self._search_best_assortment()
 
     arm_pull.arm.set.id.extend(list(best_assortment))
     arm_pull.times = 1
@@ -112,3 +123,10 @@ class UCB(MNLBanditLearner):
       for product_id in self.__last_actions.arm_pulls[0].arm.set.id:
         self.__serving_episodes[product_id] += 1
       self.__episode += 1
+
+  def update_episode(self, assortment: Set[int], choices: np.ndarray):
+    np.add.at(self.__customer_choices, choices, 1)
+    self.__last_customer_feedback = int(choices[-1])
+    if choices[-1] == 0:
+      self.__serving_episodes[list(assortment)] += 1
+      self.__episode += 1
@@ -3,8 +3,9 @@ from unittest.mock import MagicMock
 import google.protobuf.text_format as text_format
 
 import numpy as np
+import pytest
 
-from banditpylib.bandits import CvarReward
+from banditpylib.bandits import CvarReward, MeanReward
 from banditpylib.data_pb2 import Actions, Context
 from .ucb import UCB
 
@@ -34,3 +35,38 @@ class TestUCB:
         times: 1
       }
       """, Actions()).SerializeToString()
+
+  def test_multi_start_local_search(self):
+    revenues = np.array([0, 0.45, 0.8, 0.9, 1.0])
+    learner = UCB(revenues=revenues,
+                  reward=MeanReward(),
+                  card_limit=2,
+                  use_local_search=True,
+                  local_search_restarts=4,
+                  local_search_threads=2)
+
+    learner.reset()
+    mock_preference_params = np.array([1, 1, 1, 1, 1])
+    # pylint: disable=protected-access
+    learner._UCB__UCB = MagicMock(return_value=mock_preference_params)
+    assert set(learner.actions(Context()).arm_pulls[0].arm.set.id) == {3, 4}
+
+    # Time limit only applies to local search with multiple starts
+    with pytest.raises(ValueError):
+      UCB(revenues=revenues,
+          reward=MeanReward(),
+          use_local_search=True,
+          local_search_time_limit=1.0)
+
+  def test_assortment_cache(self):
+    revenues = np.array([0, 0.45, 0.8, 0.9, 1.0])
+    learner = UCB(revenues=revenues,
+                  reward=MeanReward(),
+                  card_limit=2,
+                  assortment_cache_size=16)
+
+    learner.reset()
+    mock_preference_params = np.array([1, 1, 1, 1, 1])
+    # pylint: disable=protected-access
+    learner._UCB__UCB = MagicMock(return_value=mock_preference_params)
+    assert set(learner.actions(Context()).arm_pulls[0].arm.set.id) == {3, 4}
@@ -1,20 +1,29 @@
 import copy
 
-from typing import Optional, List, Union
+from typing import Optional, List, Set, Union
 
 import numpy as np
 
 from banditpylib.bandits import MNLBandit
-from banditpylib.bandits import Reward
-from banditpylib.learners import SinglePlayerLearner, Goal, MaximizeTotalRewards
+from banditpylib.bandits import Reward, AssortmentCache, \
+    search_best_assortment, local_search_best_assortment, \
+    multi_start_local_search_best_assortment
+from banditpylib.data_pb2 import Context, Feedback
+from banditpylib.learners import SinglePlayerLearner, EpisodicLearner, Goal, \
+    MaximizeTotalRewards
 
 
-class MNLBanditLearner(SinglePlayerLearner):
+class MNLBanditLearner(SinglePlayerLearner, EpisodicLearner):
   """Abstract class for learners playing with mnl bandit
 
   Product 0 is reserved for non-purchase. And it is assumed that the preference
   parameter for non-purchase is 1.
 
+  Since an assortment is served until a customer purchases nothing, the learner
+  can also interact with :class:`banditpylib.bandits.MNLBandit` episode by
+  episode. By default, episodes are played via :func:`actions` and
+  :func:`update`, which subclasses may override with faster updates.
+
   :param np.ndarray revenues: product revenues
   :param Reward reward: reward the learner wants to maximize
   :param int card_limit: cardinality constraint
@@ -23,10 +32,28 @@ class MNLBanditLearner(SinglePlayerLearner):
   :param int random_neighbors: number of random neighbors to look up if local
     search is enabled
   :param Optional[str] name: alias name
+  :param int local_search_restarts: number of starts of local search if local
+    search is enabled
+  :param float local_search_time_limit: wall-clock time budget in seconds of
+    local search with multiple starts. It is expected infinite if there is only
+    one start.
+  :param int local_search_threads: number of threads running the starts of
+    local search in parallel
+  :param int assortment_cache_size: maximum number of assortments cached when
+    searching the best assortment (0 disables the cache). See
+    :class:`banditpylib.bandits.AssortmentCache` for details.
   """
-  def __init__(self, revenues: np.ndarray, reward: Reward, card_limit: int,
-               use_local_search: bool, random_neighbors: int,
-               name: Optional[str]):
+  def __init__(self,
+               revenues: np.ndarray,
+               reward: Reward,
+               card_limit: int,
+               use_local_search: bool,
+               random_neighbors: int,
+               name: Optional[str],
+               local_search_restarts: int = 1,
+               local_search_time_limit: float = np.inf,
+               local_search_threads: int = 1,
+               assortment_cache_size: int = 0):
     super().__init__(name)
     self.__product_num = len(revenues) - 1
     if self.__product_num < 2:
@@ -48,6 +75,27 @@ class MNLBanditLearner(SinglePlayerLearner):
           'Number of neighbors for local search is expected 3. Got %d.' %
           random_neighbors)
     self.__random_neighbors = random_neighbors
+    if local_search_restarts < 1:
+      raise ValueError(
+          'Number of restarts of local search is expected at least 1. '
+          'Got %d.' % local_search_restarts)
+    self.__local_search_restarts = local_search_restarts
+    if local_search_restarts == 1 and local_search_time_limit != np.inf:
+      raise ValueError(
+          'Time limit of local search with one start is expected infinite. '
+          'Got %.2f.' % local_search_time_limit)
+    self.__local_search_time_limit = local_search_time_limit
+    if local_search_threads < 1:
+      raise ValueError(
+          'Number of threads of local search is expected at least 1. '
+          'Got %d.' % local_search_threads)
+    self.__local_search_threads = local_search_threads
+    if assortment_cache_size < 0:
+      raise ValueError(
+          'Assortment cache size is expected at least 0. Got %d.' %
+          assortment_cache_size)
+    self.__assortment_cache = AssortmentCache(
+        max_size=assortment_cache_size) if assortment_cache_size > 0 else None
 
   @property
   def running_environment(self) -> Union[type, List[type]]:
@@ -83,6 +131,67 @@ class MNLBanditLearner(SinglePlayerLearner):
     """Number of random neighbors to look up when local search is enabled"""
     return self.__random_neighbors
 
+  @property
+  def local_search_restarts(self) -> int:
+    """Number of starts of local search"""
+    return self.__local_search_restarts
+
+  def _search_best_assortment(self) -> Set[int]:
+    """Search assortment with the maximum reward
+
+    Returns:
+      assortment with the maximum reward
+    """
+    if self.__assortment_cache is not None:
+      _, best_assortment = self.__assortment_cache.search(
+          reward=self.__reward, card_limit=self.__card_limit)
+    else:
+      _, best_assortment = search_best_assortment(reward=self.__reward,
+                                                  card_limit=self.__card_limit)
+    return best_assortment
+
+  def _local_search_best_assortment(
+      self, init_assortment: Optional[Set[int]]) -> Set[int]:
+    """Local search assortment with the maximum reward
+
+    Args:
+      init_assortment: initial assortment to start
+
+    Returns:
+      local best assortment
+    """
+    if self.__local_search_restarts == 1:
+      _, best_assortment = local_search_best_assortment(
+          reward=self.__reward,
+          random_neighbors=self.__random_neighbors,
+          card_limit=self.__card_limit,
+          init_assortment=init_assortment)
+    else:
+      _, best_assortment = multi_start_local_search_best_assortment(
+          reward=self.__reward,
+          random_neighbors=self.__random_neighbors,
+          card_limit=self.__card_limit,
+          restarts=self.__local_search_restarts,
+          init_assortment=init_assortment,
+          time_limit=self.__local_search_time_limit,
+          threads=self.__local_search_threads)
+    return best_assortment
+
+  def episode_assortment(self) -> Set[int]:
+    actions = self.actions(Context())
+    if not actions.arm_pulls:
+      return set()
+    return set(actions.arm_pulls[0].arm.set.id)
+
+  def update_episode(self, assortment: Set[int], choices: np.ndarray):
+    for choice in choices:
+      feedback = Feedback()
+      arm_feedback = feedback.arm_feedbacks.add()
+      arm_feedback.arm.set.id.extend(list(assortment))
+      arm_feedback.rewards.append(self.__revenues[choice])
+      arm_feedback.customer_feedbacks.append(int(choice))
+      self.update(feedback)
+
   @property
   def goal(self) -> Goal:
     return MaximizeTotalRewards()
@@ -2,7 +2,8 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
+from banditpylib import LazyArgmax
+from banditpylib.arms import PseudoArmBank
 from banditpylib.data_pb2 import Context, Actions, Feedback
 from banditpylib.learners import Goal, MakeAllAnswersCorrect
 from .utils import ThresholdingBanditLearner
@@ -15,36 +16,48 @@ class APT(ThresholdingBanditLearner):
   :param int arm_num: number of arms
   :param float theta: threshold
   :param float eps: radius of indifferent zone
+  :param bool use_lazy_index: whether to maintain the metrics in a heap so that
+    each action only evaluates the metrics of a few arms
   :param Optional[str] name: alias name
   """
   def __init__(self,
                arm_num: int,
                theta: float,
                eps: float,
+               use_lazy_index: bool = False,
                name: Optional[str] = None):
     super().__init__(arm_num=arm_num, name=name)
     self.__theta = theta
     self.__eps = eps
+    self.__use_lazy_index = use_lazy_index
 
   def _name(self) -> str:
     return 'apt'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
+    # The arm with the minimum metric is the one with the maximum negated
+    # metric, which only changes when the arm is pulled
+    self.__lazy_index = LazyArgmax(
+        lambda arm_ids, time: -self.__metrics(arm_ids),
+        self.arm_num,
+        time_dependent=False) if self.__use_lazy_index else None
     # Current time step
     self.__time = 1
 
-  def __metrics(self) -> np.ndarray:
+  def __metrics(self, arm_ids: Optional[np.ndarray] = None) -> np.ndarray:
     """
+    Args:
+      arm_ids: arms to evaluate. All the arms are evaluated if it is `None`.
+
     Returns:
       metrics of apt for each arm
     """
-    metrics = np.array([
-        np.sqrt(arm.total_pulls) *
-        (np.abs(arm.em_mean - self.__theta) + self.__eps)
-        for arm in self.__pseudo_arms
-    ])
-    return metrics
+    if arm_ids is None:
+      arm_ids = np.arange(self.arm_num)
+    total_pulls = self.__pseudo_arms.total_pulls[arm_ids]
+    em_mean = self.__pseudo_arms.total_rewards[arm_ids] / total_pulls
+    return np.sqrt(total_pulls) * (np.abs(em_mean - self.__theta) + self.__eps)
 
   def actions(self, context: Context) -> Actions:
     actions = Actions()
@@ -52,6 +65,8 @@ class APT(ThresholdingBanditLearner):
 
     if self.__time <= self.arm_num:
       arm_pull.arm.id = self.__time - 1
+    elif self.__lazy_index is not None:
+      arm_pull.arm.id = self.__lazy_index.argmax(self.__time)
     else:
       arm_pull.arm.id = int(np.argmin(self.__metrics()))
 
@@ -60,13 +75,13 @@ class APT(ThresholdingBanditLearner):
 
   def update(self, feedback: Feedback):
     arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+    arm_id = arm_feedback.arm.id
+    self.__pseudo_arms.update(arm_id, np.array(arm_feedback.rewards))
+    if self.__lazy_index is not None:
+      self.__lazy_index.refresh(arm_id)
     self.__time += 1
 
   @property
   def goal(self) -> Goal:
-    answers = [
-        1 if arm.em_mean >= self.__theta else 0 for arm in self.__pseudo_arms
-    ]
+    answers = (self.__pseudo_arms.em_mean >= self.__theta).astype(int).tolist()
     return MakeAllAnswersCorrect(answers=answers)
@@ -1,5 +1,7 @@
 import google.protobuf.text_format as text_format
 
+import numpy as np
+
 from banditpylib.data_pb2 import Context, Feedback
 from .apt import APT
 
@@ -29,3 +31,26 @@ class TestAPT:
           rewards: 0
         >
         """.format(arm_id=arm_id), Feedback()))
+
+  def test_lazy_index(self):
+    arm_num = 10
+    budget = 200
+    np.random.seed(0)
+    means = np.random.random(arm_num)
+    apt = APT(arm_num=arm_num, theta=0.5, eps=0)
+    lazy_apt = APT(arm_num=arm_num, theta=0.5, eps=0, use_lazy_index=True)
+    apt.reset()
+    lazy_apt.reset()
+    # Both learners are expected to pull the same arms
+    for _ in range(budget):
+      actions = apt.actions(Context())
+      assert lazy_apt.actions(Context()) == actions
+
+      feedback = Feedback()
+      arm_feedback = feedback.arm_feedbacks.add()
+      arm_feedback.arm.id = actions.arm_pulls[0].arm.id
+      arm_feedback.rewards.append(
+          np.random.normal(means[arm_feedback.arm.id], 1))
+      apt.update(feedback)
+      lazy_apt.update(feedback)
+    assert apt.goal.answers == lazy_apt.goal.answers
@@ -2,7 +2,7 @@ from typing import Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
+from banditpylib.arms import PseudoArmBank
 from banditpylib.data_pb2 import Context, Actions, Feedback
 from banditpylib.learners import Goal, MakeAllAnswersCorrect
 from .utils import ThresholdingBanditLearner
@@ -31,7 +31,7 @@ class Uniform(ThresholdingBanditLearner):
     return 'uniform_sampling'
 
   def reset(self):
-    self.__pseudo_arms = [PseudoArm() for arm_id in range(self.arm_num)]
+    self.__pseudo_arms = PseudoArmBank(self.arm_num)
     # Current time step
     self.__time = 1
 
@@ -44,13 +44,11 @@ class Uniform(ThresholdingBanditLearner):
 
   def update(self, feedback: Feedback):
     arm_feedback = feedback.arm_feedbacks[0]
-    self.__pseudo_arms[arm_feedback.arm.id].update(
-        np.array(arm_feedback.rewards))
+    self.__pseudo_arms.update(arm_feedback.arm.id,
+                              np.array(arm_feedback.rewards))
     self.__time += 1
 
   @property
   def goal(self) -> Goal:
-    answers = [
-        1 if arm.em_mean >= self.__theta else 0 for arm in self.__pseudo_arms
-    ]
+    answers = (self.__pseudo_arms.em_mean >= self.__theta).astype(int).tolist()
     return MakeAllAnswersCorrect(answers=answers)
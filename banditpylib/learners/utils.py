@@ -1,9 +1,18 @@
 from abc import ABC, abstractmethod
 from copy import deepcopy as dcopy
-from typing import Optional, List, Union, Dict, Tuple
+from typing import Optional, List, Set, Union, Dict, Tuple
+
+import numpy as np
 
 from banditpylib.data_pb2 import Context, Arm, Actions, Feedback
 
+# Actions exchanged without protobuf messages. Each element is an arm id and the
+# number of times to pull it.
+PlainActions = List[Tuple[int, int]]
+# Feedback exchanged without protobuf messages. Each element is an arm id and
+# the empirical rewards obtained.
+PlainFeedback = List[Tuple[int, np.ndarray]]
+
 
 class Goal(ABC):
   """Abstract class for the goal of a learner"""
@@ -143,6 +152,64 @@ class SinglePlayerLearner(Learner):
     """
 
 
+class PlainLearner(ABC):
+  """Abstract class for learners able to interact with the bandit environment
+  without protobuf messages
+
+  When both the learner and the bandit environment (see
+  :class:`banditpylib.bandits.PlainBandit`) support it,
+  :class:`banditpylib.protocols.SinglePlayerProtocol` exchanges plain tuples
+  between them instead of :class:`Actions` and :class:`Feedback` messages,
+  which removes the per-step overhead of building and parsing messages.
+  """
+  @abstractmethod
+  def plain_actions(self) -> PlainActions:
+    """Actions of the learner
+
+    Returns:
+      arms to pull and their numbers of pulls
+    """
+
+  @abstractmethod
+  def plain_update(self, feedback: PlainFeedback):
+    """Update the learner
+
+    Args:
+      feedback: arms pulled and their empirical rewards returned by the bandit
+        environment after :func:`plain_actions` is executed
+    """
+
+
+class EpisodicLearner(ABC):
+  """Abstract class for learners able to interact with the bandit environment
+  episode by episode
+
+  An episode serves the same assortment until a customer purchases nothing.
+  When both the learner and the bandit environment (see
+  :class:`banditpylib.bandits.EpisodicBandit`) support it,
+  :class:`banditpylib.protocols.SinglePlayerProtocol` plays the game episode by
+  episode instead of customer by customer.
+  """
+  @abstractmethod
+  def episode_assortment(self) -> Set[int]:
+    """Assortment to serve in the next episode
+
+    Returns:
+      assortment to serve until a customer purchases nothing. Empty set means
+      the learner stops.
+    """
+
+  @abstractmethod
+  def update_episode(self, assortment: Set[int], choices: np.ndarray):
+    """Update the learner with the choices of the customers in an episode
+
+    Args:
+      assortment: assortment served
+      choices: choices of the customers. The last one is 0 unless the episode
+        is cut off, in which case the same assortment is served next.
+    """
+
+
 class CollaborativeAgent(ABC):
   r"""Abstract class for collaborative agents
 
@@ -1,5 +1,12 @@
+from .executor import *
+from .result_sink import *
 from .utils import *
 from .single_player_protocol import *
 from .collaborative_learning_protocol import *
+from .vectorized_single_player_protocol import *
 
-__all__ = ['Protocol', 'SinglePlayerProtocol', 'CollaborativeLearningProtocol']
+__all__ = [
+    'Protocol', 'SinglePlayerProtocol', 'CollaborativeLearningProtocol',
+    'VectorizedSinglePlayerProtocol', 'ResultSink', 'ProtobufSink',
+    'ColumnarSink', 'Executor'
+]
@@ -1,13 +1,12 @@
 from typing import List, cast, Dict, Tuple
 from copy import deepcopy as dcopy
 
-import numpy as np
 from absl import logging
 
 from banditpylib.bandits import Bandit
 from banditpylib.data_pb2 import Trial, Actions
 from banditpylib.learners import Learner, CollaborativeLearner
-from .utils import Protocol
+from .utils import Protocol, seed_trial
 
 
 class CollaborativeLearningProtocol(Protocol):
@@ -54,7 +53,7 @@ class CollaborativeLearningProtocol(Protocol):
   def _one_trial(self, random_seed: int) -> bytes:
     if self._debug:
       logging.set_verbosity(logging.DEBUG)
-    np.random.seed(random_seed)
+    seed_trial(random_seed)
 
     # Initialization
     current_learner = cast(CollaborativeLearner, self._current_learner)
@@ -69,6 +68,7 @@ class CollaborativeLearningProtocol(Protocol):
     trial = Trial()
     trial.bandit = self._bandit.name
     trial.learner = current_learner.name
+    trial.seed = random_seed
 
     communication_rounds, total_pulls = 0, 0
     active_agent_ids = list(range(len(agents)))
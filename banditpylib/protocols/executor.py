@@ -0,0 +1,170 @@
+import importlib
+import itertools
+import multiprocessing
+from multiprocessing import Pool
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Job run by the current worker process and its protocol
+_worker_job_id: Optional[int] = None
+_worker_protocol: Any = None
+# Directory storing the pickled protocols of the jobs
+_worker_job_directory: Optional[str] = None
+
+# Identifiers of the jobs submitted by the current process
+_job_ids = itertools.count()
+
+
+def _job_filename(job_directory: str, job_id: int) -> str:
+  """
+  Args:
+    job_directory: directory storing the pickled protocols of the jobs
+    job_id: identifier of the job
+
+  Returns:
+    name of the file storing the pickled protocol of the job
+  """
+  return os.path.join(job_directory, '%d.pickle' % job_id)
+
+
+def _init_worker(job_directory: str):
+  """Initialize a worker process
+
+  Modules are imported in advance so that the first trials of each job do not
+  pay for the imports.
+
+  Args:
+    job_directory: directory storing the pickled protocols of the jobs
+  """
+  # pylint: disable=global-statement
+  global _worker_job_directory
+  _worker_job_directory = job_directory
+  importlib.import_module('banditpylib.protocols')
+
+
+def _run_trials(task: Tuple[int, List[Any]]) -> List[bytes]:
+  """Run a block of trials
+
+  Args:
+    task: identifier of the job and random seed of each trial
+
+  Returns:
+    data of the trials
+  """
+  # pylint: disable=global-statement
+  global _worker_job_id, _worker_protocol
+  job_id, random_seeds = task
+  # The protocol is loaded once for each job by each worker
+  if job_id != _worker_job_id:
+    with open(_job_filename(str(_worker_job_directory), job_id), 'rb') as f:
+      _worker_protocol = pickle.load(f)
+    _worker_job_id = job_id
+  # pylint: disable=protected-access
+  return _worker_protocol._trials(random_seeds)
+
+
+class Executor:
+  """Pool of worker processes running the trials of protocols
+
+  The worker processes are started once and can be reused by several calls of
+  :func:`Protocol.play`, with different learners, protocols and bandits.
+
+  .. code-block:: python
+
+    with Executor(processes=8) as executor:
+      for protocol in protocols:
+        protocol.play(trials, output_filename, executor=executor)
+
+  :param int processes: number of processes. -1 means the number of CPUs.
+  """
+  def __init__(self, processes: int = -1):
+    if processes == 0 or processes < -1:
+      raise ValueError('Number of processes is expected at least 1 or -1. '
+                       'Got %d.' % processes)
+    self.__processes = multiprocessing.cpu_count(
+    ) if processes < 0 else processes
+    self.__pool: Any = None
+    self.__job_directory = ''
+
+  @property
+  def processes(self) -> int:
+    """Number of processes"""
+    return self.__processes
+
+  def start(self):
+    """Start the worker processes"""
+    if self.__pool is None:
+      self.__job_directory = tempfile.mkdtemp(prefix='banditpylib_jobs_')
+      self.__pool = Pool(processes=self.__processes,
+                         initializer=_init_worker,
+                         initargs=(self.__job_directory, ))
+
+  def shutdown(self, wait: bool = True):
+    """Stop the worker processes
+
+    Args:
+      wait: whether to wait for the submitted trials to finish. If it is
+        `False`, the workers are terminated immediately.
+    """
+    if self.__pool is None:
+      return
+    if wait:
+      self.__pool.close()
+    else:
+      self.__pool.terminate()
+    self.__pool.join()
+    self.__pool = None
+    shutil.rmtree(self.__job_directory, ignore_errors=True)
+
+  def __enter__(self) -> 'Executor':
+    self.start()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.shutdown(wait=exc_type is None)
+
+  def run(self, protocol: Any, seed_blocks: Iterator[List[Any]],
+          chunk_size: int) -> Iterator[List[bytes]]:
+    """Run the trials of a protocol
+
+    Args:
+      protocol: protocol to run
+      seed_blocks: random seeds of the trials run by each task
+      chunk_size: number of tasks sent to a worker process at once
+
+    Returns:
+      data of the trials run by each task in the order of completion
+    """
+    if self.__pool is None:
+      raise Exception('Executor is not started.')
+    job_id = next(_job_ids)
+    # The protocol is pickled once into a file which each worker loads once,
+    # so that tasks only carry the job identifier and the random seeds
+    job_filename = _job_filename(self.__job_directory, job_id)
+    with open(job_filename, 'wb') as f:
+      pickle.dump(protocol, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tasks = ((job_id, random_seeds) for random_seeds in seed_blocks)
+    return self.__results(
+        job_filename,
+        self.__pool.imap_unordered(_run_trials, tasks, chunksize=chunk_size))
+
+  @staticmethod
+  def __results(job_filename: str,
+                results: Iterator[List[bytes]]) -> Iterator[List[bytes]]:
+    """Pass through the results of a job and remove its file at the end
+
+    Args:
+      job_filename: name of the file storing the pickled protocol of the job
+      results: data of the trials run by each task
+
+    Returns:
+      data of the trials run by each task
+    """
+    try:
+      yield from results
+    finally:
+      if os.path.exists(job_filename):
+        os.remove(job_filename)
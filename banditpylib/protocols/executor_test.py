@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+from banditpylib import parse_trials_from_bytes
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import MultiArmedBandit
+from banditpylib.learners.mab_learner import EpsGreedy, UCB
+from .executor import Executor
+from .single_player_protocol import SinglePlayerProtocol
+
+
+class TestExecutor:
+  """Test executor"""
+  def test_reuse(self):
+    temp_file = tempfile.NamedTemporaryFile()
+    with Executor(processes=2) as executor:
+      for means in [[0.3, 0.5, 0.7], [0.1, 0.9]]:
+        arms = [BernoulliArm(mean) for mean in means]
+        ordinary_bandit = MultiArmedBandit(arms)
+        learners = [EpsGreedy(arm_num=len(means)), UCB(arm_num=len(means))]
+        single_player = SinglePlayerProtocol(bandit=ordinary_bandit,
+                                             learners=learners)
+        single_player.play(3, temp_file.name, horizon=10, executor=executor)
+
+    with open(temp_file.name, 'rb') as f:
+      trials = parse_trials_from_bytes(f.read())
+      assert len(trials) == 12
+      assert sorted(
+          trial.learner
+          for trial in trials) == ['epsilon_greedy'] * 6 + ['ucb'] * 6
+
+  def test_job_files(self):
+    temp_file = tempfile.NamedTemporaryFile()
+    arms = [BernoulliArm(mean) for mean in [0.3, 0.7]]
+    single_player = SinglePlayerProtocol(bandit=MultiArmedBandit(arms),
+                                         learners=[UCB(arm_num=2)])
+    with Executor(processes=2) as executor:
+      single_player.play(4, temp_file.name, horizon=10, executor=executor)
+      # Protocols are shipped to the workers through files which are removed
+      # when the jobs finish
+      # pylint: disable=protected-access
+      job_directory = executor._Executor__job_directory
+      assert not os.listdir(job_directory)
+    assert not os.path.exists(job_directory)
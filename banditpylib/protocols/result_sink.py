@@ -0,0 +1,235 @@
+import os
+import threading
+from typing import BinaryIO, Dict, List, Optional
+
+from abc import ABC, abstractmethod
+
+from google.protobuf.internal.encoder import _VarintBytes  # type: ignore
+import numpy as np
+
+from banditpylib import RESULT_DTYPE
+from banditpylib.data_pb2 import Trial
+
+
+class ResultSink(ABC):
+  """Abstract class for sinks storing the results of trials
+
+  A sink is opened at the start of :func:`Protocol.play`, receives the
+  serialized trials as soon as they finish and is closed at the end of the
+  play.
+  """
+  def open(self):
+    """Prepare for storing the results of a play"""
+
+  @abstractmethod
+  def write(self, data: List[bytes]):
+    """Store the results of a block of trials
+
+    Args:
+      data: serialized trials
+    """
+
+  def close(self):
+    """Finish storing the results of a play"""
+
+
+class ProtobufSink(ResultSink):
+  """Protobuf sink
+
+  Trials are appended to the file as varint-delimited protobuf messages,
+  which can be read by :func:`banditpylib.trials_to_dataframe`.
+
+  During a play, the file is kept open and the trials are buffered in memory.
+  The buffer is flushed when it holds `max_buffered_bytes` bytes or
+  `max_buffered_trials` trials, every `flush_interval` seconds and when the
+  play finishes, even if it fails.
+
+  :param str filename: name of the file used to dump the results
+  :param int max_buffered_bytes: maximum number of bytes buffered
+  :param int max_buffered_trials: maximum number of trials buffered
+  :param float flush_interval: maximum number of seconds between two flushes
+  """
+  def __init__(self,
+               filename: str,
+               max_buffered_bytes: int = 1 << 20,
+               max_buffered_trials: int = 1000,
+               flush_interval: float = 5.0):
+    if max_buffered_bytes < 0:
+      raise ValueError('Maximum number of buffered bytes is expected at least '
+                       '0. Got %d.' % max_buffered_bytes)
+    if max_buffered_trials < 0:
+      raise ValueError('Maximum number of buffered trials is expected at '
+                       'least 0. Got %d.' % max_buffered_trials)
+    if flush_interval <= 0:
+      raise ValueError('Flush interval is expected greater than 0. Got %.2f.' %
+                       flush_interval)
+    self.__filename = filename
+    self.__max_buffered_bytes = max_buffered_bytes
+    self.__max_buffered_trials = max_buffered_trials
+    self.__flush_interval = flush_interval
+    self.__file: Optional[BinaryIO] = None
+
+  def open(self):
+    if self.__file is not None:
+      raise Exception('Sink of file %s is already open.' % self.__filename)
+    self.__file = open(self.__filename, 'ab')
+    self.__buffer: List[bytes] = []
+    self.__buffered_bytes = 0
+    self.__buffered_trials = 0
+    # Buffer is shared by the writer and the flusher
+    self.__lock = threading.Lock()
+    self.__closing = threading.Event()
+    self.__flusher = threading.Thread(target=self.__flush_periodically,
+                                      daemon=True)
+    self.__flusher.start()
+
+  def __flush(self):
+    """Write the buffered trials to the file
+
+    .. note::
+      The caller is expected to hold the lock.
+    """
+    if self.__file is None:
+      return
+    self.__file.write(b''.join(self.__buffer))
+    self.__file.flush()
+    self.__buffer = []
+    self.__buffered_bytes = 0
+    self.__buffered_trials = 0
+
+  def __flush_periodically(self):
+    """Flush the buffer every `flush_interval` seconds until closing"""
+    while not self.__closing.wait(self.__flush_interval):
+      with self.__lock:
+        self.__flush()
+
+  def write(self, data: List[bytes]):
+    if self.__file is None:
+      raise Exception('Sink of file %s is not open.' % self.__filename)
+    with self.__lock:
+      for trial_data in data:
+        prefix = _VarintBytes(len(trial_data))
+        self.__buffer.append(prefix)
+        self.__buffer.append(trial_data)
+        self.__buffered_bytes += len(prefix) + len(trial_data)
+      self.__buffered_trials += len(data)
+      if (self.__buffered_bytes >= self.__max_buffered_bytes
+          or self.__buffered_trials >= self.__max_buffered_trials):
+        self.__flush()
+
+  def close(self):
+    if self.__file is None:
+      return
+    self.__closing.set()
+    self.__flusher.join()
+    with self.__lock:
+      try:
+        self.__flush()
+      finally:
+        self.__file.close()
+        self.__file = None
+
+
+class ColumnarSink(ResultSink):
+  """Columnar sink
+
+  The results of the trials of a learner with a bandit are stored in directory
+  `<directory>/<bandit>/<learner>`, where each field of
+  :data:`banditpylib.RESULT_DTYPE` is appended to its own file
+  `<field>.column` as fixed-width values, one per result. Results of the same
+  trial share the same value of field `trial`. Each field can be loaded as a
+  contiguous array without copying by :func:`banditpylib.load_columnar_results`.
+
+  :param str directory: directory used to dump the results
+  """
+  def __init__(self, directory: str):
+    self.__directory = directory
+    # Number of trials stored in each directory
+    self.__trial_nums: Dict[str, int] = dict()
+    # Files of the fields kept open during a play
+    self.__files: Dict[str, Dict[str, BinaryIO]] = dict()
+
+  def __path(self, bandit: str, learner: str) -> str:
+    """
+    Args:
+      bandit: bandit name
+      learner: learner name
+
+    Returns:
+      path of the directory storing the results of the learner with the bandit
+    """
+    return os.path.join(self.__directory, bandit, learner)
+
+  def __trial_num(self, path: str) -> int:
+    """
+    Args:
+      path: path of the directory
+
+    Returns:
+      number of trials already stored in the directory
+    """
+    if path not in self.__trial_nums:
+      os.makedirs(path, exist_ok=True)
+      filenames = {
+          field: os.path.join(path, field + '.column')
+          for field in RESULT_DTYPE.names
+      }
+      # Drop the results not stored in all the fields, e.g., when the last
+      # play is interrupted
+      result_num = min(
+          os.path.getsize(filename) //
+          RESULT_DTYPE[field].itemsize if os.path.exists(filename) else 0
+          for (field, filename) in filenames.items())
+      for (field, filename) in filenames.items():
+        if os.path.exists(filename):
+          os.truncate(filename, result_num * RESULT_DTYPE[field].itemsize)
+      if result_num == 0:
+        self.__trial_nums[path] = 0
+      else:
+        last_trial = np.fromfile(filenames['trial'],
+                                 dtype=RESULT_DTYPE['trial'],
+                                 offset=(result_num - 1) *
+                                 RESULT_DTYPE['trial'].itemsize)
+        self.__trial_nums[path] = int(last_trial[0]) + 1
+    return self.__trial_nums[path]
+
+  def open(self):
+    os.makedirs(self.__directory, exist_ok=True)
+    self.__trial_nums = dict()
+    self.__files = dict()
+
+  def write(self, data: List[bytes]):
+    trials_by_path: Dict[str, List[Trial]] = dict()
+    for trial_data in data:
+      trial = Trial.FromString(trial_data)
+      trials_by_path.setdefault(self.__path(trial.bandit, trial.learner),
+                                []).append(trial)
+
+    for (path, trials) in trials_by_path.items():
+      first_trial = self.__trial_num(path)
+      columns: Dict[str, List[float]] = {
+          field: []
+          for field in RESULT_DTYPE.names
+      }
+      for (trial_id, trial) in enumerate(trials, first_trial):
+        for result in trial.results:
+          columns['trial'].append(trial_id)
+          columns['rounds'].append(result.rounds)
+          columns['total_actions'].append(result.total_actions)
+          columns['regret'].append(result.regret)
+          columns['other'].append(result.other)
+      if path not in self.__files:
+        self.__files[path] = {
+            field: open(os.path.join(path, field + '.column'), 'ab')
+            for field in RESULT_DTYPE.names
+        }
+      for (field, values) in columns.items():
+        np.asarray(values,
+                   dtype=RESULT_DTYPE[field]).tofile(self.__files[path][field])
+      self.__trial_nums[path] = first_trial + len(trials)
+
+  def close(self):
+    for files in self.__files.values():
+      for f in files.values():
+        f.close()
+    self.__files = dict()
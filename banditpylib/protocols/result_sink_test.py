@@ -0,0 +1,104 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from banditpylib import RESULT_DTYPE, load_columnar_results, \
+    columnar_results_to_dataframe, parse_trials_from_bytes
+from banditpylib.data_pb2 import Trial
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import MultiArmedBandit
+from banditpylib.learners.mab_learner import EpsGreedy, UCB
+from .result_sink import ProtobufSink, ColumnarSink
+from .single_player_protocol import SinglePlayerProtocol
+
+
+class TestProtobufSink:
+  """Test protobuf sink"""
+  def test_buffered_write(self):
+    temp_file = tempfile.NamedTemporaryFile()
+    sink = ProtobufSink(temp_file.name,
+                        max_buffered_trials=2,
+                        flush_interval=100)
+    trial = Trial()
+    trial.bandit = 'bandit'
+    trial.learner = 'learner'
+    sink.open()
+    sink.write([trial.SerializeToString()])
+    # Trials stay in the buffer until the limit is reached
+    assert os.path.getsize(temp_file.name) == 0
+    sink.write([trial.SerializeToString()] * 2)
+    with open(temp_file.name, 'rb') as f:
+      assert len(parse_trials_from_bytes(f.read())) == 3
+    sink.write([trial.SerializeToString()])
+    sink.close()
+    with open(temp_file.name, 'rb') as f:
+      assert len(parse_trials_from_bytes(f.read())) == 4
+
+  def test_timed_flush(self):
+    temp_file = tempfile.NamedTemporaryFile()
+    sink = ProtobufSink(temp_file.name, flush_interval=0.01)
+    sink.open()
+    sink.write([Trial().SerializeToString()])
+    time.sleep(0.5)
+    assert os.path.getsize(temp_file.name) > 0
+    sink.close()
+
+
+class TestColumnarSink:
+  """Test columnar sink"""
+  def test_simple_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = MultiArmedBandit(arms)
+    learners = [EpsGreedy(arm_num=3), UCB(arm_num=3)]
+    single_player = SinglePlayerProtocol(bandit=ordinary_bandit,
+                                         learners=learners)
+    temp_dir = tempfile.TemporaryDirectory()
+    sink = ColumnarSink(temp_dir.name)
+    single_player.play(3, sink, intermediate_horizons=[5], horizon=10)
+    # Trials of the second play are appended
+    single_player.play(2, sink, intermediate_horizons=[5], horizon=10)
+
+    results = load_columnar_results(temp_dir.name)
+    assert set(results.keys()) == {('multi_armed_bandit', 'epsilon_greedy'),
+                                   ('multi_armed_bandit', 'ucb')}
+    for learner_results in results.values():
+      assert set(learner_results.keys()) == set(RESULT_DTYPE.names)
+      for column in learner_results.values():
+        # Each trial reports two results stored contiguously
+        assert len(column) == 10
+        assert isinstance(column, np.memmap)
+        assert column.flags.c_contiguous
+      assert list(np.unique(learner_results['trial'])) == list(range(5))
+      assert list(learner_results['rounds']) == [5, 10] * 5
+
+    trials_df = columnar_results_to_dataframe(temp_dir.name)
+    assert len(trials_df) == 20
+    assert set(trials_df['learner']) == {'epsilon_greedy', 'ucb'}
+
+  def test_interrupted_write(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    sink = ColumnarSink(temp_dir.name)
+    trial = Trial()
+    trial.bandit = 'bandit'
+    trial.learner = 'learner'
+    trial.results.add().regret = 1.0
+    sink.open()
+    sink.write([trial.SerializeToString()] * 2)
+    sink.close()
+    # Only some of the fields of a result are stored
+    with open(os.path.join(temp_dir.name, 'bandit', 'learner', 'trial.column'),
+              'ab') as f:
+      np.array([2], dtype=RESULT_DTYPE['trial']).tofile(f)
+    assert len(
+        load_columnar_results(temp_dir.name)[('bandit',
+                                              'learner')]['trial']) == 2
+
+    sink.open()
+    sink.write([trial.SerializeToString()])
+    sink.close()
+    results = load_columnar_results(temp_dir.name)[('bandit', 'learner')]
+    assert list(results['trial']) == [0, 1, 2]
+    assert list(results['regret']) == [1.0] * 3
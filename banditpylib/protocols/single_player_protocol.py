@@ -1,13 +1,12 @@
 from typing import List, cast
 
-import numpy as np
-
 from absl import logging
 
-from banditpylib.bandits import Bandit
+from banditpylib.bandits import Bandit, PlainBandit, EpisodicBandit
 from banditpylib.data_pb2 import Trial
-from banditpylib.learners import Learner, SinglePlayerLearner
-from .utils import Protocol
+from banditpylib.learners import Learner, SinglePlayerLearner, PlainLearner, \
+    EpisodicLearner
+from .utils import Protocol, seed_trial
 
 
 class SinglePlayerProtocol(Protocol):
@@ -28,13 +27,32 @@ class SinglePlayerProtocol(Protocol):
 
   :param Bandit bandit: bandit environment
   :param List[SinglePlayerLearner] learners: learners to be compared with
+  :param bool use_episodes: whether to play the game episode by episode when
+    both the bandit environment and the learner support it
 
   .. note::
     During a round, a learner may want to perform multiple actions, which is
     so-called batched learner.
+
+  .. note::
+    When both the bandit environment and the learner support it (see
+    :class:`banditpylib.bandits.PlainBandit` and
+    :class:`banditpylib.learners.PlainLearner`), actions and feedback are
+    exchanged as plain tuples instead of protobuf messages.
+
+  .. note::
+    When both the bandit environment and the learner support it (see
+    :class:`banditpylib.bandits.EpisodicBandit` and
+    :class:`banditpylib.learners.EpisodicLearner`), the game runs episode by
+    episode, i.e., an assortment is served until a customer purchases nothing.
+    Each customer served still counts as one round and one action.
   """
-  def __init__(self, bandit: Bandit, learners: List[SinglePlayerLearner]):
+  def __init__(self,
+               bandit: Bandit,
+               learners: List[SinglePlayerLearner],
+               use_episodes: bool = True):
     super().__init__(bandit=bandit, learners=cast(List[Learner], learners))
+    self.__use_episodes = use_episodes
 
   @property
   def name(self) -> str:
@@ -43,7 +61,7 @@ class SinglePlayerProtocol(Protocol):
   def _one_trial(self, random_seed: int) -> bytes:
     if self._debug:
       logging.set_verbosity(logging.DEBUG)
-    np.random.seed(random_seed)
+    seed_trial(random_seed)
 
     # Reset the bandit environment and the learner
     self._bandit.reset()
@@ -53,6 +71,7 @@ class SinglePlayerProtocol(Protocol):
     trial = Trial()
     trial.bandit = self._bandit.name
     trial.learner = current_learner.name
+    trial.seed = random_seed
     rounds = 0
     # Number of actions the learner has made
     total_actions = 0
@@ -63,22 +82,75 @@ class SinglePlayerProtocol(Protocol):
       result.total_actions = total_actions
       result.regret = self._bandit.regret(current_learner.goal)
 
-    while total_actions < self._horizon:
-      actions = current_learner.actions(self._bandit.context)
-
-      # Stop the game if no actions are returned by the learner
-      if not actions.arm_pulls:
-        break
-
-      # Record intermediate regrets
-      if rounds in self._intermediate_horizons:
-        add_result()
+    intermediate_horizons = set(self._intermediate_horizons)
+    use_episodes = self.__use_episodes and isinstance(
+        self._bandit, EpisodicBandit) and isinstance(current_learner,
+                                                     EpisodicLearner)
+    use_plain_messages = isinstance(self._bandit, PlainBandit) and isinstance(
+        current_learner, PlainLearner)
 
-      feedback = self._bandit.feed(actions)
-      current_learner.update(feedback)
-
-      for arm_pull in actions.arm_pulls:
-        total_actions += arm_pull.times
+    while total_actions < self._horizon:
+      if use_episodes:
+        assortment = cast(EpisodicLearner,
+                          current_learner).episode_assortment()
+
+        # Stop the game if no actions are returned by the learner
+        if not assortment:
+          break
+
+        # Record intermediate regrets
+        if rounds in intermediate_horizons:
+          add_result()
+
+        # Cut off the episode at the next intermediate horizon so that all the
+        # regrets are recorded
+        max_customers = min([self._horizon - total_actions] + [
+            horizon - rounds
+            for horizon in intermediate_horizons if horizon > rounds
+        ])
+        choices = cast(EpisodicBandit,
+                       self._bandit).serve_episode(assortment, max_customers)
+        cast(EpisodicLearner,
+             current_learner).update_episode(assortment, choices)
+
+        # Each customer served is one round
+        total_actions += len(choices)
+        rounds += len(choices)
+        continue
+
+      if use_plain_messages:
+        plain_actions = cast(PlainLearner, current_learner).plain_actions()
+
+        # Stop the game if no actions are returned by the learner
+        if not plain_actions:
+          break
+
+        # Record intermediate regrets
+        if rounds in intermediate_horizons:
+          add_result()
+
+        plain_feedback = cast(PlainBandit,
+                              self._bandit).plain_feed(plain_actions)
+        cast(PlainLearner, current_learner).plain_update(plain_feedback)
+
+        for (_, pulls) in plain_actions:
+          total_actions += pulls
+      else:
+        actions = current_learner.actions(self._bandit.context)
+
+        # Stop the game if no actions are returned by the learner
+        if not actions.arm_pulls:
+          break
+
+        # Record intermediate regrets
+        if rounds in intermediate_horizons:
+          add_result()
+
+        feedback = self._bandit.feed(actions)
+        current_learner.update(feedback)
+
+        for arm_pull in actions.arm_pulls:
+          total_actions += arm_pull.times
       rounds += 1
 
     # Record final regret
@@ -1,12 +1,24 @@
 import tempfile
 
+import numpy as np
+
 from banditpylib import parse_trials_from_bytes
 from banditpylib.arms import BernoulliArm
-from banditpylib.bandits import MultiArmedBandit
+from banditpylib.bandits import MultiArmedBandit, MNLBandit, MeanReward
 from banditpylib.learners.mab_learner import EpsGreedy
+from banditpylib.learners.mnl_bandit_learner import UCB
 from .single_player_protocol import SinglePlayerProtocol
 
 
+class ProtobufUCB(UCB):
+  """UCB learner failing when played episode by episode"""
+  def episode_assortment(self):
+    raise AssertionError('Episodes are expected disabled.')
+
+  def update_episode(self, assortment, choices):
+    raise AssertionError('Episodes are expected disabled.')
+
+
 class TestSinglePlayer:
   """Test single player protocol"""
   def test_simple_run(self):
@@ -23,3 +35,87 @@ class TestSinglePlayer:
       # check number of records is 3
       trials = parse_trials_from_bytes(f.read())
       assert len(trials) == 3
+
+  def test_chunked_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = MultiArmedBandit(arms)
+    eps_greedy_learner = EpsGreedy(arm_num=3)
+    single_player = SinglePlayerProtocol(bandit=ordinary_bandit,
+                                         learners=[eps_greedy_learner])
+    temp_file = tempfile.NamedTemporaryFile()
+    single_player.play(7,
+                       temp_file.name,
+                       processes=2,
+                       horizon=10,
+                       chunk_size=3)
+
+    with open(temp_file.name, 'rb') as f:
+      trials = parse_trials_from_bytes(f.read())
+      assert len(trials) == 7
+
+  def test_seeded_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = MultiArmedBandit(arms)
+    eps_greedy_learner = EpsGreedy(arm_num=3)
+    single_player = SinglePlayerProtocol(bandit=ordinary_bandit,
+                                         learners=[eps_greedy_learner])
+    temp_file = tempfile.NamedTemporaryFile()
+    single_player.play(5, temp_file.name, horizon=20, seed=0)
+    with open(temp_file.name, 'rb') as f:
+      trials = parse_trials_from_bytes(f.read())
+    # Seeds of the trials are distinct
+    assert len(set(trial.seed for trial in trials)) == 5
+
+    # Re-run the trials with the recorded seeds
+    rerun_file = tempfile.NamedTemporaryFile()
+    single_player.play(5,
+                       rerun_file.name,
+                       horizon=20,
+                       trial_seeds=[trial.seed for trial in trials])
+    with open(rerun_file.name, 'rb') as f:
+      rerun_trials = parse_trials_from_bytes(f.read())
+    assert sorted(trial.SerializeToString()
+                  for trial in trials) == sorted(trial.SerializeToString()
+                                                 for trial in rerun_trials)
+
+  def test_protobuf_run(self):
+    # MNL bandit only exchanges protobuf messages with the learner when
+    # episodes are disabled
+    preference_params = np.array([1.0, 0.5, 0.5])
+    revenues = np.array([0.0, 0.5, 1.0])
+    mnl_bandit = MNLBandit(preference_params, revenues)
+    ucb_learner = ProtobufUCB(revenues=revenues, reward=MeanReward())
+    single_player = SinglePlayerProtocol(bandit=mnl_bandit,
+                                         learners=[ucb_learner],
+                                         use_episodes=False)
+    temp_file = tempfile.NamedTemporaryFile()
+    single_player.play(3, temp_file.name, horizon=10)
+
+    with open(temp_file.name, 'rb') as f:
+      # check number of records is 3
+      trials = parse_trials_from_bytes(f.read())
+      assert len(trials) == 3
+      assert trials[0].results[-1].total_actions == 10
+
+  def test_episode_run(self):
+    preference_params = np.array([1.0, 0.9, 0.9])
+    revenues = np.array([0.0, 0.5, 1.0])
+    mnl_bandit = MNLBandit(preference_params, revenues)
+    ucb_learner = UCB(revenues=revenues, reward=MeanReward())
+    single_player = SinglePlayerProtocol(bandit=mnl_bandit,
+                                         learners=[ucb_learner])
+    temp_file = tempfile.NamedTemporaryFile()
+    single_player.play(3,
+                       temp_file.name,
+                       horizon=50,
+                       intermediate_horizons=[3, 7, 20])
+
+    with open(temp_file.name, 'rb') as f:
+      trials = parse_trials_from_bytes(f.read())
+    # Episodes are cut off at the intermediate horizons
+    for trial in trials:
+      assert [result.rounds for result in trial.results] == [3, 7, 20, 50]
+      assert [result.total_actions
+              for result in trial.results] == [3, 7, 20, 50]
@@ -1,26 +1,34 @@
-import multiprocessing
-from multiprocessing import Pool
+import math
 import time
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
 
 from abc import ABC, abstractmethod
 from absl import logging
 
-from google.protobuf.internal.encoder import _VarintBytes  # type: ignore
 import numpy as np
 
 from banditpylib.bandits import Bandit
+from banditpylib.data_pb2 import Trial
 from banditpylib.learners import Learner
+from .executor import Executor
+from .result_sink import ResultSink, ProtobufSink
 
+# Random seed of a trial, or the random seed, index and size of the block of a
+# trial simulated in a block of trials
+TrialKey = Union[int, Tuple[int, int, int]]
 
-def time_seed() -> int:
-  """Generate random seed using current time
 
-  Returns:
-    random seed
+def seed_trial(random_seed: int):
+  """Seed the random numbers used by a trial
+
+  Bandits, arms and learners draw random numbers from the global NumPy random
+  state, which is seeded with the entropy expanded from `random_seed` by
+  :class:`numpy.random.SeedSequence`.
+
+  Args:
+    random_seed: random seed of the trial
   """
-  tem_time = time.time()
-  return int((tem_time - int(tem_time)) * 10000000)
+  np.random.seed(np.random.SeedSequence(random_seed).generate_state(4))
 
 
 class Protocol(ABC):
@@ -80,6 +88,11 @@ class Protocol(ABC):
     """Debug mode"""
     return self.__debug
 
+  @property
+  def _trials_per_task(self) -> int:
+    """Number of trials run by one task submitted to the process pool"""
+    return 1
+
   @abstractmethod
   def _one_trial(self, random_seed: int) -> bytes:
     """One trial of the game
@@ -94,42 +107,75 @@ class Protocol(ABC):
       one trial data
     """
 
-  def __write_to_file(self, data: bytes):
-    """Write the result of one trial to file
+  def _trials(self, random_seeds: List[TrialKey]) -> List[bytes]:
+    """A block of trials of the game
+
+    By default, trials are run one after another by :func:`_one_trial`.
+    Protocols which are able to run several trials at once should override this
+    method together with :attr:`_trials_per_task`.
 
     Args:
-      data: one trial data
+      random_seeds: random seed of each trial. A trial recorded in a block of
+        trials simulated at once is given by the random seed, its index and the
+        size of the block.
+
+    Returns:
+      data of the trials
     """
-    with open(self.__output_filename, 'ab') as f:
-      f.write(_VarintBytes(len(data)))
-      f.write(data)
-      f.flush()
+    data = []
+    for random_seed in random_seeds:
+      if isinstance(random_seed, tuple):
+        raise ValueError('Trial simulated in a block of %d trials can not be '
+                         're-run by %s.' % (random_seed[2], self.name))
+      data.append(self._one_trial(random_seed))
+    return data
 
   def play(
       self,
       trials: int,
-      output_filename: str,
+      output_filename: Union[str, ResultSink],
       processes: int = -1,
       debug: bool = False,
       # pylint: disable=dangerous-default-value
       intermediate_horizons: List[int] = [],
-      horizon: int = np.inf):  # type: ignore
+      horizon: int = np.inf,  # type: ignore
+      chunk_size: Optional[int] = None,
+      executor: Optional[Executor] = None,
+      seed: Optional[int] = None,
+      trial_seeds: Optional[List[Union[int, Trial]]] = None):
     """Start playing the game
 
     Args:
       trials: number of repetitions
-      output_filename: name of the file used to dump the simulation results
-      processes: maximum number of processes to run. -1 means no limit
+      output_filename: name of the file used to dump the simulation results,
+        or the sink used to store them. A file name is equivalent to
+        :class:`ProtobufSink` writing to that file.
+      processes: maximum number of processes to run. -1 means no limit. It is
+        ignored when `executor` is set.
       debug: debug mode. When it is set to `True`, `trials` will be
         automatically set to 1 and debug information of the trial will be
         printed out.
       intermediate_horizons: report intermediate regrets after these horizons
       horizon: horizon of the game. Different protocols may have different
         interpretations.
+      chunk_size: number of tasks sent to a worker process at once, where each
+        task runs at most :attr:`_trials_per_task` trials. If it is `None`, it
+        is chosen according to the number of trials and processes.
+      executor: worker processes used to run the trials. If it is `None`,
+        worker processes are started for this call only.
+      seed: seed of the :class:`numpy.random.SeedSequence` spawning the random
+        seeds of the trials. Every learner is run with the same trial seeds.
+        If it is `None`, fresh entropy is drawn from the operating system.
+      trial_seeds: random seeds of the trials to run, or the trials recorded
+        by a previous play to re-run them. A trial recorded in a block of
+        trials simulated at once is re-run by simulating the whole block
+        again. If it is set, `trials` and `seed` are ignored.
 
     .. warning::
       By default, `output_filename` will be opened with mode `a`.
     """
+    if trial_seeds is not None:
+      trials = len(trial_seeds)
     if debug:
       trials = 1
 
@@ -137,34 +183,101 @@ class Protocol(ABC):
     self.__horizon = horizon
     self.__intermediate_horizons = intermediate_horizons
 
-    for learner in self.__learners:
-      # Set current learner
-      self.__current_learner = learner
-
-      logging.info('start %s\'s play with %s', self.__current_learner.name,
-                   self.__bandit.name)
-
-      start_time = time.time()
-      self.__output_filename = output_filename
-      pool = Pool(processes=(
-          multiprocessing.cpu_count() if processes < 0 else processes))
-
-      trial_results = []
-      for _ in range(trials):
-        result = pool.apply_async(self._one_trial,
-                                  args=[time_seed()],
-                                  callback=self.__write_to_file)
+    sink = output_filename if isinstance(
+        output_filename, ResultSink) else ProtobufSink(output_filename)
+    own_executor = executor is None
+    if executor is None:
+      executor = Executor(processes=processes)
+    if chunk_size is None:
+      # Leave several chunks to each process to balance the load while
+      # streaming results back regularly
+      tasks = math.ceil(trials / self._trials_per_task)
+      chunk_size = min(max(1, math.ceil(tasks / (4 * executor.processes))),
+                       1000)
+    elif chunk_size < 1:
+      raise ValueError('Chunk size is expected at least 1. Got %d.' %
+                       chunk_size)
+
+    trial_keys: List[TrialKey]
+    if trial_seeds is None:
+      # Words generated by the seed sequence are distinct with overwhelming
+      # probability, and are much cheaper than spawning one child per trial
+      trial_keys = np.random.SeedSequence(seed).generate_state(
+          trials, np.uint64).tolist()
+    else:
+      trial_keys = [
+          self.__trial_key(trial_seed) for trial_seed in trial_seeds[:trials]
+      ]
+
+    executor.start()
+    sink.open()
+    try:
+      for learner in self.__learners:
+        self.__play_with_learner(learner, trial_keys, sink, executor,
+                                 chunk_size)
+    except BaseException:
+      if own_executor:
+        # Stop the remaining trials
+        executor.shutdown(wait=False)
+      raise
+    finally:
+      sink.close()
+      if own_executor:
+        executor.shutdown()
+
+  @staticmethod
+  def __trial_key(trial_seed: Union[int, Trial]) -> TrialKey:
+    """
+    Args:
+      trial_seed: random seed of a trial or the trial recorded
 
-        trial_results.append(result)
+    Returns:
+      random seed of the trial, or the random seed, index and size of the block
+      if the trial was simulated in a block
+    """
+    if not isinstance(trial_seed, Trial):
+      return trial_seed
+    if trial_seed.block_size:
+      return (trial_seed.seed, trial_seed.block_index, trial_seed.block_size)
+    return trial_seed.seed
+
+  def __seed_blocks(self,
+                    trial_seeds: List[TrialKey]) -> Iterator[List[TrialKey]]:
+    """
+    Args:
+      trial_seeds: random seeds of the trials
 
-      # Can not apply for processes any more
-      pool.close()
-      pool.join()
+    Returns:
+      random seeds of the trials run by each task
+    """
+    for first_trial in range(0, len(trial_seeds), self._trials_per_task):
+      yield trial_seeds[first_trial:first_trial + self._trials_per_task]
 
-      # Check if there are exceptions during the trials
-      for result in trial_results:
-        result.get()
+  def __play_with_learner(self, learner: Learner, trial_seeds: List[TrialKey],
+                          sink: ResultSink, executor: Executor,
+                          chunk_size: int):
+    """Run the trials of one learner
 
-      logging.info('%s\'s play with %s runs %.2f seconds.',
-                   self.__current_learner.name, self.__bandit.name,
-                   time.time() - start_time)
+    Args:
+      learner: learner to run
+      trial_seeds: random seeds of the trials
+      sink: sink used to store the results
+      executor: worker processes used to run the trials
+      chunk_size: number of tasks sent to a worker process at once
+    """
+    # Set current learner
+    self.__current_learner = learner
+
+    logging.info('start %s\'s play with %s', self.__current_learner.name,
+                 self.__bandit.name)
+
+    start_time = time.time()
+    # Results are streamed back as soon as the tasks finish. Exceptions during
+    # the trials are raised here.
+    for data in executor.run(self, self.__seed_blocks(trial_seeds),
+                             chunk_size):
+      sink.write(data)
+
+    logging.info('%s\'s play with %s runs %.2f seconds.',
+                 self.__current_learner.name, self.__bandit.name,
+                 time.time() - start_time)
@@ -0,0 +1,156 @@
+from typing import Dict, List, Tuple, cast
+
+import numpy as np
+
+from absl import logging
+
+from banditpylib.bandits import MultiArmedBandit
+from banditpylib.data_pb2 import Trial
+from banditpylib.learners import Learner
+from banditpylib.learners.mab_learner import VectorizedMABLearner
+from .utils import Protocol, TrialKey, seed_trial
+
+
+class VectorizedSinglePlayerProtocol(Protocol):
+  """Vectorized single player protocol
+
+  This class simulates many independent trials of the ordinary single-player
+  game with the multi-armed bandit at once. The empirical information of the
+  arms in all the trials is kept in NumPy arrays of shape (trials, arms). During
+  each time step, the protocol runs the following steps in sequence:
+
+  * ask the learner for the arm to pull in every trial;
+  * pull the arms of all the trials in the bandit environment;
+  * update the empirical information of the pulled arms.
+
+  The game runs until the total number of actions achieves `horizon` and the
+  trial records produced are the same as those of
+  :class:`SinglePlayerProtocol`.
+
+  :param MultiArmedBandit bandit: bandit environment
+  :param List[VectorizedMABLearner] learners: learners to be compared with
+  :param int trials_per_task: maximum number of trials simulated at once by one
+    process
+
+  .. note::
+    `horizon` is expected to be finite when playing the game.
+
+  .. note::
+    Trials simulated by one process at once form a block sharing one stream of
+    random numbers, which is seeded by the random seed of the first trial. Each
+    trial records this seed together with its index and the size of the
+    block. Passing the recorded trial to :func:`play` by `trial_seeds`
+    re-runs exactly the same trial by simulating its block again.
+  """
+  def __init__(self,
+               bandit: MultiArmedBandit,
+               learners: List[VectorizedMABLearner],
+               trials_per_task: int = 1000):
+    super().__init__(bandit=bandit, learners=cast(List[Learner], learners))
+    if not isinstance(bandit, MultiArmedBandit):
+      raise Exception('Bandit %s is not supported.' % bandit.name)
+    for learner in learners:
+      if not isinstance(learner, VectorizedMABLearner):
+        raise Exception('Learner %s does not support vectorized simulation.' %
+                        learner.name)
+    if trials_per_task < 1:
+      raise ValueError('Number of trials per task is expected at least 1. '
+                       'Got %d.' % trials_per_task)
+    self.__trials_per_task = trials_per_task
+
+  @property
+  def name(self) -> str:
+    return 'vectorized_single_player_protocol'
+
+  @property
+  def _trials_per_task(self) -> int:
+    return self.__trials_per_task
+
+  def _one_trial(self, random_seed: int) -> bytes:
+    return self._trials([random_seed])[0]
+
+  def _trials(self, random_seeds: List[TrialKey]) -> List[bytes]:
+    if self._debug:
+      logging.set_verbosity(logging.DEBUG)
+    if self._horizon == np.inf:
+      raise Exception('Horizon is expected finite in the vectorized game.')
+    if not any(isinstance(random_seed, tuple) for random_seed in random_seeds):
+      return self.__block(cast(int, random_seeds[0]), len(random_seeds))
+
+    # Re-run trials recorded in blocks by simulating each block once
+    blocks: Dict[Tuple[int, int], List[bytes]] = dict()
+    data = []
+    for random_seed in random_seeds:
+      (seed, block_index, block_size) = random_seed if isinstance(
+          random_seed, tuple) else (random_seed, 0, 1)
+      if (seed, block_size) not in blocks:
+        blocks[(seed, block_size)] = self.__block(seed, block_size)
+      data.append(blocks[(seed, block_size)][block_index])
+    return data
+
+  def __block(self, random_seed: int, trials: int) -> List[bytes]:
+    """Simulate a block of trials at once
+
+    Args:
+      random_seed: random seed of the block
+      trials: number of trials
+
+    Returns:
+      data of the trials
+    """
+    # All the trials share one stream of random numbers
+    seed_trial(random_seed)
+
+    horizon = int(self._horizon)
+    bandit = cast(MultiArmedBandit, self._bandit)
+    current_learner = cast(VectorizedMABLearner, self._current_learner)
+
+    # Reset the bandit environment and the learner
+    bandit.vectorized_reset(trials)
+    current_learner.reset()
+
+    # Empirical information of each arm in each trial
+    total_pulls = np.zeros((trials, current_learner.arm_num))
+    total_rewards = np.zeros((trials, current_learner.arm_num))
+    sum_of_squares = np.zeros((trials, current_learner.arm_num))
+    trial_ids = np.arange(trials)
+
+    intermediate_horizons = set(self._intermediate_horizons)
+    recorded_rounds: List[int] = []
+    recorded_regrets: List[np.ndarray] = []
+
+    for time in range(1, horizon + 1):
+      # Record intermediate regrets
+      if time - 1 in intermediate_horizons:
+        recorded_rounds.append(time - 1)
+        recorded_regrets.append(np.copy(bandit.vectorized_regret))
+
+      arm_ids = current_learner.vectorized_actions(time, total_pulls,
+                                                   total_rewards,
+                                                   sum_of_squares)
+      em_rewards = bandit.vectorized_feed(arm_ids)
+
+      total_pulls[trial_ids, arm_ids] += 1
+      total_rewards[trial_ids, arm_ids] += em_rewards
+      sum_of_squares[trial_ids, arm_ids] += em_rewards**2
+
+    # Record final regrets
+    recorded_rounds.append(horizon)
+    recorded_regrets.append(np.copy(bandit.vectorized_regret))
+
+    data = []
+    for trial_id in range(trials):
+      trial = Trial()
+      trial.bandit = bandit.name
+      trial.learner = current_learner.name
+      trial.seed = random_seed
+      trial.block_index = trial_id
+      trial.block_size = trials
+      for (rounds, regrets) in zip(recorded_rounds, recorded_regrets):
+        result = trial.results.add()
+        # Each round corresponds to exactly one action
+        result.rounds = rounds
+        result.total_actions = rounds
+        result.regret = regrets[trial_id]
+      data.append(trial.SerializeToString())
+    return data
@@ -0,0 +1,73 @@
+import tempfile
+
+from banditpylib import parse_trials_from_bytes
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import MultiArmedBandit
+from banditpylib.learners.mab_learner import EpsGreedy, UCB, UCBV, MOSS, \
+    ThompsonSampling, Softmax
+from .vectorized_single_player_protocol import VectorizedSinglePlayerProtocol
+
+
+class TestVectorizedSinglePlayer:
+  """Test vectorized single player protocol"""
+  def test_simple_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = MultiArmedBandit(arms)
+    learners = [
+        EpsGreedy(arm_num=3),
+        UCB(arm_num=3),
+        UCBV(arm_num=3),
+        MOSS(arm_num=3, horizon=10),
+        ThompsonSampling(arm_num=3),
+        Softmax(arm_num=3)
+    ]
+    vectorized_single_player = VectorizedSinglePlayerProtocol(
+        bandit=ordinary_bandit, learners=learners, trials_per_task=2)
+    temp_file = tempfile.NamedTemporaryFile()
+    vectorized_single_player.play(5,
+                                  temp_file.name,
+                                  intermediate_horizons=[0, 5],
+                                  horizon=10)
+
+    with open(temp_file.name, 'rb') as f:
+      # Check number of records is 5 for each learner
+      trials = parse_trials_from_bytes(f.read())
+      assert len(trials) == 5 * len(learners)
+      for trial in trials:
+        assert [result.rounds for result in trial.results] == [0, 5, 10]
+        assert trial.results[0].regret == 0
+
+  def test_rerun_trial(self):
+    arms = [BernoulliArm(mean) for mean in [0.3, 0.5, 0.7]]
+    vectorized_single_player = VectorizedSinglePlayerProtocol(
+        bandit=MultiArmedBandit(arms),
+        learners=[EpsGreedy(arm_num=3, eps=5)],
+        trials_per_task=3)
+    temp_file = tempfile.NamedTemporaryFile()
+    vectorized_single_player.play(6,
+                                  temp_file.name,
+                                  intermediate_horizons=[5],
+                                  horizon=20,
+                                  processes=2,
+                                  seed=1)
+    with open(temp_file.name, 'rb') as f:
+      trials = parse_trials_from_bytes(f.read())
+    assert sorted((trial.block_index, trial.block_size)
+                  for trial in trials) == [(0, 3), (0, 3), (1, 3), (1, 3),
+                                           (2, 3), (2, 3)]
+
+    # Re-run one trial recorded in each block
+    recorded_trials = [trial for trial in trials if trial.block_index == 1]
+    rerun_file = tempfile.NamedTemporaryFile()
+    vectorized_single_player.play(0,
+                                  rerun_file.name,
+                                  intermediate_horizons=[5],
+                                  horizon=20,
+                                  processes=2,
+                                  trial_seeds=recorded_trials)
+    with open(rerun_file.name, 'rb') as f:
+      rerun_trials = parse_trials_from_bytes(f.read())
+    assert sorted(trial.SerializeToString()
+                  for trial in rerun_trials) == sorted(
+                      trial.SerializeToString() for trial in recorded_trials)
@@ -1,13 +1,22 @@
-from typing import List, Tuple
+import heapq
+import mmap
+import os
+
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple, \
+    Union
 
 import numpy as np
 import pandas as pd
 
-import google.protobuf.json_format as json_format
 from google.protobuf.internal.decoder import _DecodeVarint32  # type: ignore
 
 from banditpylib.data_pb2 import Trial
 
+# Fields of the columnar format and their fixed-width types
+RESULT_DTYPE = np.dtype([('trial', '<i8'), ('rounds', '<i4'),
+                         ('total_actions', '<i4'), ('regret', '<f4'),
+                         ('other', '<f4')])
+
 
 def argmax_or_min(values: List[float], find_min: bool = False) -> int:
   """Find index with the largest or smallest value
@@ -43,6 +52,168 @@ def argmax_or_min_tuple(values: List[Tuple[float, int]],
   return np.random.choice(indexes)
 
 
+class LazyArgmax:
+  r"""Lazily maintained argmax of arm indexes
+
+  Arms are kept in a max-heap keyed by their indexes. Finding the arm with the
+  maximum index only evaluates the indexes of the arms on top of the heap
+  instead of all of them, and after an arm is pulled only its own key needs to
+  be refreshed.
+
+  When indexes are non-decreasing in time, e.g., confidence bounds containing
+  :math:`\ln(t)`, the key of an arm is its index evaluated at the end of the
+  current epoch, which upper bounds its index at any time step within the
+  epoch. An epoch starting at time :math:`t` lasts :math:`\lfloor t / 64
+  \rfloor` time steps and all the keys are rebuilt at its start.
+
+  The heap pays off when the number of arms is large, e.g., tens of thousands.
+
+  :param Callable[[np.ndarray, int], np.ndarray] index_func: function computing
+    the indexes of the given arms at the given time step
+  :param int arm_num: number of arms
+  :param bool time_dependent: whether indexes change with time. If it is
+    `False`, the index of an arm is assumed to change only when the arm is
+    refreshed.
+  """
+  def __init__(self,
+               index_func: Callable[[np.ndarray, int], np.ndarray],
+               arm_num: int,
+               time_dependent: bool = True):
+    self.__index_func = index_func
+    self.__arm_num = arm_num
+    self.__time_dependent = time_dependent
+    # Entries are (minus key, arm id, version of the key)
+    self.__heap: List[Tuple[float, int, int]] = []
+    self.__versions = [0] * arm_num
+    # Time step at which the keys are evaluated
+    self.__key_time = 0
+
+  def __rebuild(self, key_time: int):
+    """Rebuild the heap
+
+    Args:
+      key_time: time step at which the keys are evaluated
+    """
+    self.__key_time = key_time
+    keys = self.__index_func(np.arange(self.__arm_num), key_time)
+    self.__heap = list(
+        zip((-keys).tolist(), range(self.__arm_num), self.__versions))
+    heapq.heapify(self.__heap)
+
+  def argmax(self, time: int) -> int:
+    """
+    Args:
+      time: current time step
+
+    Returns:
+      arm with the maximum index at the current time step
+    """
+    if not self.__heap or (self.__time_dependent and time > self.__key_time):
+      self.__rebuild(time + time // 64 if self.__time_dependent else time)
+
+    # Arms whose keys exceed the current index of the arm on top of the heap,
+    # which lower bounds the maximum index
+    candidates: List[Tuple[float, int, int]] = []
+    lower_bound = -np.inf
+    while self.__heap:
+      minus_key, arm_id, version = self.__heap[0]
+      if version != self.__versions[arm_id]:
+        # Drop outdated keys
+        heapq.heappop(self.__heap)
+        continue
+      if candidates and -minus_key <= lower_bound:
+        break
+      candidates.append(heapq.heappop(self.__heap))
+      if len(candidates) == 1:
+        lower_bound = self.__index_func(np.array([arm_id]), time)[0]
+
+    indexes = self.__index_func(
+        np.array([arm_id for (_, arm_id, _) in candidates]), time)
+    for entry in candidates:
+      heapq.heappush(self.__heap, entry)
+    return candidates[int(np.argmax(indexes))][1]
+
+  def refresh(self, arm_id: int):
+    """Refresh the key of an arm whose index has changed
+
+    Args:
+      arm_id: arm to refresh
+    """
+    self.__versions[arm_id] += 1
+    if not self.__heap:
+      return
+    if len(self.__heap) > 2 * self.__arm_num:
+      # Clean up outdated keys
+      self.__rebuild(self.__key_time)
+      return
+    key = self.__index_func(np.array([arm_id]), self.__key_time)[0]
+    heapq.heappush(self.__heap, (-key, arm_id, self.__versions[arm_id]))
+
+
+class _MappedArray(NamedTuple):
+  """File of a read-only memory-mapped array"""
+  filename: str
+  dtype: str
+  shape: Tuple[int, ...]
+  offset: int
+  order: str
+
+  def map(self) -> np.memmap:
+    """
+    Returns:
+      the array mapped again
+    """
+    return np.memmap(self.filename,
+                     dtype=np.dtype(self.dtype),
+                     mode='r',
+                     shape=self.shape,
+                     offset=self.offset,
+                     order=self.order)  # type: ignore
+
+
+class MemmapPicklable:
+  """Mixin for classes holding read-only memory-mapped arrays
+
+  Attributes which are read-only memory-mapped arrays, e.g., loaded by
+  `np.load(filename, mmap_mode='r')`, are pickled by their files, so that they
+  are mapped again instead of copied when the object is copied or sent to other
+  processes. Other attributes are pickled as usual.
+  """
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    for (key, value) in state.items():
+      if isinstance(value, np.memmap) and isinstance(
+          value.base, mmap.mmap) and value.mode == 'r':
+        order = 'F' if value.flags.f_contiguous and \
+            not value.flags.c_contiguous else 'C'
+        state[key] = _MappedArray(value.filename, value.dtype.str, value.shape,
+                                  value.offset, order)
+    return state
+
+  def __setstate__(self, state):
+    for (key, value) in state.items():
+      if isinstance(value, _MappedArray):
+        state[key] = value.map()
+    self.__dict__.update(state)
+
+
+def _iter_serialized_trials(data: Union[bytes, mmap.mmap]) -> Iterator[bytes]:
+  """Walk varint-delimited trials
+
+  Args:
+    data: bytes data
+
+  Returns:
+    serialized trials
+  """
+  pos = 0
+  while pos < len(data):
+    size, pos = _DecodeVarint32(data, pos)
+    yield data[pos:pos + size]
+    # Proceed to next message
+    pos += size
+
+
 def parse_trials_from_bytes(data: bytes) -> List[Trial]:
   """Parse trials from bytes
 
@@ -52,39 +223,163 @@ def parse_trials_from_bytes(data: bytes) -> List[Trial]:
   Returns:
     trial protobuf messages
   """
-  trials = []
-  next_pos, pos = 0, 0
-  while pos < len(data):
-    trial = Trial()
-    next_pos, pos = _DecodeVarint32(data, pos)
-    trial.ParseFromString(data[pos:pos + next_pos])
+  return [
+      Trial.FromString(serialized_trial)
+      for serialized_trial in _iter_serialized_trials(data)
+  ]
 
-    # Proceed to next message
-    pos += next_pos
+
+def iter_trials(filename: str) -> Iterator[Trial]:
+  """Read trials from a bytes file one by one
+
+  The file is memory-mapped so that only the trial being parsed is loaded into
+  memory.
+
+  Args:
+    filename: file name
+
+  Returns:
+    trial protobuf messages
+  """
+  with open(filename, 'rb') as f:
+    # Empty files can not be memory-mapped
+    if not f.seek(0, 2):
+      return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+      for serialized_trial in _iter_serialized_trials(data):
+        yield Trial.FromString(serialized_trial)
+
+
+def iter_trial_batches(filename: str,
+                       batch_size: int = 10000
+                       ) -> Iterator[Dict[str, np.ndarray]]:
+  """Read results of trials from a bytes file batch by batch
+
+  Args:
+    filename: file name
+    batch_size: maximum number of trials in a batch
+
+  Returns:
+    columns of the results in a batch, i.e., `rounds`, `total_actions`,
+    `regret`, `other`, `bandit` and `learner`, with one row per result
+  """
+  if batch_size < 1:
+    raise ValueError('Batch size is expected at least 1. Got %d.' % batch_size)
+
+  def to_columns(trials: List[Trial]) -> Dict[str, np.ndarray]:
+    results = [result for trial in trials for result in trial.results]
+    result_nums = [len(trial.results) for trial in trials]
+    return {
+        'rounds':
+        np.array([result.rounds for result in results], dtype=np.int64),
+        'total_actions':
+        np.array([result.total_actions for result in results], dtype=np.int64),
+        'regret':
+        np.array([result.regret for result in results], dtype=np.float64),
+        'other':
+        np.array([result.other for result in results], dtype=np.float64),
+        'bandit':
+        np.repeat(np.array([trial.bandit for trial in trials], dtype=object),
+                  result_nums),
+        'learner':
+        np.repeat(np.array([trial.learner for trial in trials], dtype=object),
+                  result_nums),
+    }
+
+  trials = []
+  for trial in iter_trials(filename):
     trials.append(trial)
-  return trials
+    if len(trials) == batch_size:
+      yield to_columns(trials)
+      trials = []
+  if trials:
+    yield to_columns(trials)
 
 
-def trials_to_dataframe(filename: str) -> pd.DataFrame:
+def trials_to_dataframe(filename: str,
+                        batch_size: int = 10000) -> pd.DataFrame:
   """Read bytes file storing trials and transform to pandas DataFrame
 
   Args:
     filename: file name
+    batch_size: maximum number of trials parsed at once
 
   Returns:
     pandas dataframe
   """
-  with open(filename, 'rb') as f:
-    data = []
-    trials = parse_trials_from_bytes(f.read())
-    for trial in trials:
-      for result in trial.results:
-        tmp_dict = json_format.MessageToDict(
-            result,
-            including_default_value_fields=True,
-            preserving_proto_field_name=True)
-        tmp_dict['bandit'] = trial.bandit
-        tmp_dict['learner'] = trial.learner
-        data.append(tmp_dict)
-    data_df = pd.DataFrame.from_dict(data)
-    return data_df
+  columns = ['rounds', 'total_actions', 'regret', 'other', 'bandit', 'learner']
+  batches = list(iter_trial_batches(filename, batch_size))
+  if not batches:
+    return pd.DataFrame(columns=columns)
+  return pd.DataFrame({
+      column:
+      np.concatenate([batch[column] for batch in batches])
+      for column in columns
+  })
+
+
+def load_columnar_results(
+    directory: str) -> Dict[Tuple[str, str], Dict[str, np.ndarray]]:
+  """Load results stored in the columnar format without copying them
+
+  Args:
+    directory: directory storing the results
+
+  Returns:
+    memory-mapped results of each pair of bandit and learner names. Each field
+    of :data:`RESULT_DTYPE` is a contiguous array with one value per result.
+  """
+  results: Dict[Tuple[str, str], Dict[str, np.ndarray]] = dict()
+  for bandit in sorted(os.listdir(directory)):
+    bandit_directory = os.path.join(directory, bandit)
+    if not os.path.isdir(bandit_directory):
+      continue
+    for learner in sorted(os.listdir(bandit_directory)):
+      filenames = {
+          field: os.path.join(bandit_directory, learner, field + '.column')
+          for field in RESULT_DTYPE.names
+      }
+      if not all(os.path.isfile(filename) for filename in filenames.values()):
+        continue
+      # Results not stored in all the fields are ignored
+      result_num = min(
+          os.path.getsize(filename) // RESULT_DTYPE[field].itemsize
+          for (field, filename) in filenames.items())
+      if result_num == 0:
+        continue
+      results[(bandit, learner)] = {
+          field:
+          np.memmap(filename,
+                    dtype=RESULT_DTYPE[field],
+                    mode='r',
+                    shape=(result_num, ))
+          for (field, filename) in filenames.items()
+      }
+  return results
+
+
+def columnar_results_to_dataframe(directory: str) -> pd.DataFrame:
+  """Read results stored in the columnar format and transform to pandas
+  DataFrame
+
+  Args:
+    directory: directory storing the results
+
+  Returns:
+    pandas dataframe
+  """
+  columns = ['rounds', 'total_actions', 'regret', 'other', 'bandit', 'learner']
+  data_frames = [
+      pd.DataFrame({
+          'rounds': results['rounds'],
+          'total_actions': results['total_actions'],
+          'regret': results['regret'].astype(np.float64),
+          'other': results['other'].astype(np.float64),
+          'bandit': bandit,
+          'learner': learner
+      }) for ((bandit, learner),
+              results) in load_columnar_results(directory).items()
+  ]
+  if not data_frames:
+    return pd.DataFrame(columns=columns)
+  return pd.concat(data_frames, ignore_index=True)
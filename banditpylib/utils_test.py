@@ -0,0 +1,116 @@
+import copy
+import pickle
+
+from google.protobuf.internal.encoder import _VarintBytes  # type: ignore
+
+import numpy as np
+
+from banditpylib.data_pb2 import Trial
+from .utils import LazyArgmax, MemmapPicklable, iter_trials, \
+    iter_trial_batches, trials_to_dataframe
+
+
+class TestLazyArgmax:
+  """Test lazily maintained argmax"""
+  def test_time_dependent_index(self):
+    arm_num = 50
+    horizon = 500
+    np.random.seed(0)
+    total_pulls = np.ones(arm_num)
+    total_rewards = np.random.random(arm_num)
+
+    def index_func(arm_ids: np.ndarray, time: int) -> np.ndarray:
+      return total_rewards[arm_ids] / total_pulls[arm_ids] + np.sqrt(
+          2 * np.log(time) / total_pulls[arm_ids])
+
+    lazy_argmax = LazyArgmax(index_func, arm_num)
+    for time in range(arm_num + 1, horizon + 1):
+      arm_id = lazy_argmax.argmax(time)
+      assert arm_id == np.argmax(index_func(np.arange(arm_num), time))
+      total_pulls[arm_id] += 1
+      total_rewards[arm_id] += np.random.random()
+      lazy_argmax.refresh(arm_id)
+
+  def test_time_independent_index(self):
+    arm_num = 20
+    np.random.seed(0)
+    indexes = np.random.random(arm_num)
+    lazy_argmax = LazyArgmax(lambda arm_ids, time: indexes[arm_ids],
+                             arm_num,
+                             time_dependent=False)
+    for time in range(1, 200):
+      arm_id = lazy_argmax.argmax(time)
+      assert arm_id == np.argmax(indexes)
+      indexes[arm_id] = np.random.random()
+      lazy_argmax.refresh(arm_id)
+
+
+class ArrayHolder(MemmapPicklable):
+  """Object holding arrays"""
+  def __init__(self, mapped: np.ndarray, loaded: np.ndarray):
+    self.mapped = mapped
+    self.loaded = loaded
+    self.shape = mapped.shape
+
+
+class TestMemmapPicklable:
+  """Test pickling read-only memory-mapped arrays"""
+  def test_copy(self, tmp_path):
+    array = np.asfortranarray(np.random.random((5, 3)))
+    filename = str(tmp_path / 'array.npy')
+    np.save(filename, array)
+    holder = ArrayHolder(np.load(filename, mmap_mode='r'), array)
+    for copied_holder in [
+        copy.deepcopy(holder),
+        pickle.loads(pickle.dumps(holder))
+    ]:
+      # Read-only memory-mapped arrays are mapped again instead of copied
+      assert isinstance(copied_holder.mapped, np.memmap)
+      assert copied_holder.mapped.filename == holder.mapped.filename
+      np.testing.assert_array_equal(copied_holder.mapped, array)
+      assert not isinstance(copied_holder.loaded, np.memmap)
+      np.testing.assert_array_equal(copied_holder.loaded, array)
+      assert copied_holder.shape == (5, 3)
+
+    # Writable memory-mapped arrays are copied
+    holder = ArrayHolder(np.load(filename, mmap_mode='r+'), array)
+    copied_holder = pickle.loads(pickle.dumps(holder))
+    copied_holder.mapped[0, 0] = -1
+    np.testing.assert_array_equal(holder.mapped, array)
+
+
+class TestTrialsReader:
+  """Test reading trials from a bytes file"""
+  def test_trials_to_dataframe(self, tmp_path):
+    filename = str(tmp_path / 'trials.data')
+    with open(filename, 'wb') as f:
+      for trial_id in range(5):
+        trial = Trial()
+        trial.bandit = 'bandit'
+        trial.learner = 'learner_%d' % (trial_id % 2)
+        for rounds in range(3):
+          result = trial.results.add()
+          result.rounds = rounds
+          result.total_actions = 2 * rounds
+          result.regret = trial_id
+        data = trial.SerializeToString()
+        f.write(_VarintBytes(len(data)))
+        f.write(data)
+
+    assert [trial.learner for trial in iter_trials(filename)
+            ] == ['learner_0', 'learner_1'] * 2 + ['learner_0']
+    batches = list(iter_trial_batches(filename, batch_size=2))
+    assert [len(batch['rounds']) for batch in batches] == [6, 6, 3]
+
+    trials_df = trials_to_dataframe(filename, batch_size=2)
+    assert len(trials_df) == 15
+    assert list(trials_df['total_actions']) == [0, 2, 4] * 5
+    assert list(trials_df['regret']) == [
+        trial_id for trial_id in range(5) for _ in range(3)
+    ]
+    assert set(trials_df['learner']) == {'learner_0', 'learner_1'}
+
+  def test_empty_file(self, tmp_path):
+    filename = str(tmp_path / 'trials.data')
+    open(filename, 'wb').close()
+    assert trials_to_dataframe(filename).empty
@@ -0,0 +1,92 @@
+"""Benchmark of LinUCB with and without the clustered feature index
+
+LinUCB scans the feature vectors of all the arms to select an arm, which is
+compared with searching the arm through :class:`ClusteredFeatureIndex` in the
+exact mode and the approximate mode, where only a few clusters are scanned.
+The latency of the learner per time step and the regret at the end are
+reported.
+
+Usage:
+  python examples/linucb_feature_index_benchmark.py --arm_num 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from banditpylib.bandits import LinearBandit
+from banditpylib.learners import MaximizeTotalRewards
+from banditpylib.learners.linear_bandit_learner import LinUCB, \
+    ClusteredFeatureIndex
+
+
+def run(bandit: LinearBandit, learner: LinUCB, horizon: int, seed: int):
+  """Play the game and measure the latency of the learner
+
+  Args:
+    bandit: bandit environment
+    learner: learner
+    horizon: horizon of the game
+    seed: random seed
+
+  Returns:
+    average time in seconds the learner spends during each time step, i.e.,
+    selecting an arm and updating with the feedback, and the regret at the end
+  """
+  np.random.seed(seed)
+  bandit.reset()
+  learner.reset()
+  elapsed = 0.0
+  for _ in range(horizon):
+    start = time.perf_counter()
+    actions = learner.plain_actions()
+    elapsed += time.perf_counter() - start
+    feedback = bandit.plain_feed(actions)
+    start = time.perf_counter()
+    learner.plain_update(feedback)
+    elapsed += time.perf_counter() - start
+  return elapsed / horizon, bandit.regret(MaximizeTotalRewards())
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description=__doc__.split('\n', maxsplit=1)[0])
+  parser.add_argument('--arm_num', type=int, default=100000)
+  parser.add_argument('--dimension', type=int, default=16)
+  parser.add_argument('--horizon', type=int, default=500)
+  parser.add_argument('--clusters', type=int, default=None)
+  parser.add_argument('--max_probes', type=int, default=32)
+  parser.add_argument('--seed', type=int, default=0)
+  args = parser.parse_args()
+
+  np.random.seed(args.seed)
+  # Features are drawn from a few clusters as in real catalogs of items
+  centers = np.random.normal(size=(64, args.dimension))
+  features = centers[np.random.randint(64, size=args.arm_num)] + \
+      0.3 * np.random.normal(size=(args.arm_num, args.dimension))
+  features /= np.linalg.norm(features, axis=1, keepdims=True)
+  theta = np.random.normal(size=args.dimension)
+  theta /= np.linalg.norm(theta)
+  bandit = LinearBandit(features, theta, std=0.1)
+
+  start = time.perf_counter()
+  exact_index = ClusteredFeatureIndex(features,
+                                      clusters=args.clusters,
+                                      max_probes=None)
+  print('index built in %.2fs with %d clusters' %
+        (time.perf_counter() - start, exact_index.clusters))
+  approximate_index = ClusteredFeatureIndex(features,
+                                            clusters=args.clusters,
+                                            max_probes=args.max_probes)
+
+  print('%-24s %14s %10s' % ('search', 'latency (ms)', 'regret'))
+  for (search, feature_index) in [('scan', None), ('index', exact_index),
+                                  ('index (%d probes)' % args.max_probes,
+                                   approximate_index)]:
+    learner = LinUCB(features, 0.1, 1.0, feature_index=feature_index)
+    (latency, regret) = run(bandit, learner, args.horizon, args.seed)
+    print('%-24s %14.3f %10.2f' % (search, latency * 1000, regret))
+
+
+if __name__ == '__main__':
+  main()